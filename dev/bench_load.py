@@ -0,0 +1,287 @@
+"""
+Benchmark the load paths of MyMaria.load_data_to_mariadb
+
+Generates synthetic csv files (a narrow table and a wide option chain like
+csv2table_chains.py) and loads them across chunk sizes, with and without a
+temp table and a transform, with each insert engine. Every case runs in its
+own process so its peak memory can be measured.
+
+Results are rows/sec, peak RSS, and seconds spent in parse (reading the
+chunks), transform, insert and the temp table merge, summed from the load's
+timed events, written as json to compare releases. The rest of the seconds
+is table creation, type inference and other DDL.
+
+
+$ python bench_load.py --backend fake -r 100000 -o bench.json
+    ^^
+    in-process fake connector on sqlite, needs no server (no load_data engine)
+
+$ python bench_load.py --backend server -n bench
+    ^^
+    a running server, configuration 'bench' of ~/.config/mymaria.ini
+
+$ python bench_load.py --backend mariadbd
+    ^^
+    launches a throwaway mariadbd on a temporary datadir and port
+
+"""
+import sys
+sys.path.insert(0, '../src')
+sys.path.insert(0, './src')
+sys.path.insert(0, '../tests')  # the fake backend, tests/fake_mariadb.py
+sys.path.insert(0, './tests')
+
+import argparse
+import json
+import multiprocessing
+import os
+import platform
+import resource
+import shutil
+import socket
+import subprocess
+import tempfile
+import time
+from datetime import datetime, timezone
+from importlib import metadata
+
+import numpy as np
+import pandas as pd
+
+
+def getopts():
+    parser = argparse.ArgumentParser(
+        prog="bench_load",
+        description="benchmark mariaio load paths",
+    )
+    parser.add_argument("--backend", choices=["fake", "server", "mariadbd"], default="fake",
+                        help="database to load [default fake]")
+    parser.add_argument("-n", "--dbname", default="default",
+                        help="name of database configuration of mymaria.ini for --backend server")
+    parser.add_argument("--dbconfig", default="", help="mymaria.ini for --backend server")
+    parser.add_argument("-r", "--rows", type=int, default=100000, help="rows per generated file [default 100000]")
+    parser.add_argument("-s", "--shapes", default="simple,chains", help="data shapes [default simple,chains]")
+    parser.add_argument("-c", "--chunksizes", default="1000,10000,50000", help="chunk sizes [default 1000,10000,50000]")
+    parser.add_argument("-e", "--engines", default="", help="insert engines [default all available]")
+    parser.add_argument("-o", "--outfile", default="-", help="json results [default stdout]")
+    parser.add_argument("--workdir", default="", help="directory for generated files [default temporary]")
+    return parser.parse_args()
+
+
+# ---------------------------------------------------------------- data
+
+def make_simple(rows: int, rng) -> pd.DataFrame:
+    return pd.DataFrame({
+        "id": np.arange(rows),
+        "name": rng.choice(["Alice", "Bob", "Charlie", "David", "Eve"], rows),
+        "value": rng.random(rows).round(4),
+        "lname": rng.choice(["Brown", "Smith", "Jones"], rows),
+    })
+
+
+def make_chains(rows: int, rng) -> pd.DataFrame:
+    """Wide option chain rows, time in milliseconds like the files of csv2table_chains.py"""
+    start = 1740666600000  # 2025-02-27 14:30 UTC
+    strikes = rng.integers(50, 400, rows) * 2.5
+    return pd.DataFrame({
+        "symbol": rng.choice(["SPY", "QQQ", "IWM", "AAPL", "MSFT", "NVDA"], rows),
+        "time": start + np.sort(rng.integers(0, 6 * 3600 * 1000, rows)),
+        "underlying_price": (rng.random(rows) * 300 + 100).round(2),
+        "expiration": rng.choice(["2025-03-07", "2025-03-14", "2025-03-21", "2025-04-17"], rows),
+        "strike": strikes,
+        "type": rng.choice(["CALL", "PUT"], rows),
+        "bid": (rng.random(rows) * 20).round(2),
+        "ask": (rng.random(rows) * 20 + 0.05).round(2),
+        "last": (rng.random(rows) * 20).round(2),
+        "mark": (rng.random(rows) * 20).round(3),
+        "volume": rng.integers(0, 50000, rows),
+        "open_interest": rng.integers(0, 200000, rows),
+        "iv": rng.random(rows).round(4),
+        "delta": (rng.random(rows) * 2 - 1).round(4),
+        "gamma": (rng.random(rows) / 10).round(5),
+        "theta": (-rng.random(rows)).round(4),
+        "vega": rng.random(rows).round(4),
+        "rho": (rng.random(rows) / 10).round(5),
+        "in_the_money": rng.random(rows) > 0.5,
+        "description": [f"option contract {i}" for i in range(rows)],
+    })
+
+
+def transform_chains(df: pd.DataFrame) -> pd.DataFrame:
+    # same as csv2table_chains.py
+    df['time'] = (df['time'] / 1000).astype(int)
+    df['quote_time'] = pd.to_datetime(df['time'], unit='s')
+    df['quote_date'] = df['quote_time'].dt.date
+    return df
+
+
+def transform_simple(df: pd.DataFrame) -> pd.DataFrame:
+    df['name'] = df['name'].str.upper()
+    return df
+
+
+SHAPES = {
+    "simple": (make_simple, transform_simple),
+    "chains": (make_chains, transform_chains),
+}
+
+
+# ---------------------------------------------------------------- backends
+
+def install_fake_connector():
+    """In-process stand-in for a server on sqlite, see tests/fake_mariadb.py."""
+    from fake_mariadb import install
+    return install(tempfile.mkdtemp(prefix="mariaio_bench_"))
+
+
+def launch_mariadbd(workdir: str):
+    """Start a throwaway server, returns (process, mymaria.ini, config name)."""
+    install_db = shutil.which("mariadb-install-db") or shutil.which("mysql_install_db")
+    mariadbd = shutil.which("mariadbd") or shutil.which("mysqld")
+    if not install_db or not mariadbd:
+        sys.exit("bench_load: mariadbd and mariadb-install-db are needed for --backend mariadbd")
+    datadir = os.path.join(workdir, "datadir")
+    sock = os.path.join(workdir, "mariadbd.sock")
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        port = s.getsockname()[1]
+    subprocess.run([install_db, f"--datadir={datadir}", "--auth-root-authentication-method=normal"],
+                   check=True, stdout=subprocess.DEVNULL)
+    proc = subprocess.Popen([mariadbd, "--no-defaults", f"--datadir={datadir}", f"--socket={sock}",
+                             f"--port={port}", "--bind-address=127.0.0.1", "--local-infile=1",
+                             "--innodb-buffer-pool-size=512M"],
+                            stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    for _ in range(100):
+        try:
+            socket.create_connection(("127.0.0.1", port), timeout=0.2).close()
+            break
+        except OSError:
+            time.sleep(0.2)
+    subprocess.run(["mariadb", f"--socket={sock}", "-uroot", "-e",
+                    "CREATE DATABASE IF NOT EXISTS bench; "
+                    "CREATE USER IF NOT EXISTS 'bench'@'127.0.0.1' IDENTIFIED BY 'bench'; "
+                    "GRANT ALL ON bench.* TO 'bench'@'127.0.0.1';"], check=True)
+    config_file = os.path.join(workdir, "mymaria.ini")
+    with open(config_file, "w") as fh:
+        fh.write(f"[bench]\nhost = 127.0.0.1\nport = {port}\nuser = bench\npassword = bench\ndatabase = bench\n")
+    return proc, config_file, "bench"
+
+
+# ---------------------------------------------------------------- cases
+
+def run_case(case: dict) -> dict:
+    """Load one file in a fresh process, returns the measurements."""
+    if case["backend"] == "fake":
+        config_file, conf = install_fake_connector()
+    else:
+        config_file, conf = case["config_file"], case["conf"]
+    from mariaio import MyMaria
+
+    # seconds per stage, summed from the timed events of the load
+    timing = {"read": 0.0, "transform": 0.0, "insert": 0.0, "merge": 0.0}
+
+    def sink(event):
+        if event["event"] in timing:
+            timing[event["event"]] += event["seconds"]
+
+    transform = SHAPES[case["shape"]][1] if case["transform"] else None
+    db = MyMaria(config_file=config_file, conf=conf, metrics=sink)
+    table = f"bench_{case['shape']}"
+    db.exec(f"DROP TABLE IF EXISTS {table}")
+    if case["temp_table"]:
+        db.exec(f"DROP TABLE IF EXISTS {table}_tmp")
+
+    start = time.perf_counter()
+    db.load_data_to_mariadb(
+        case["file"], table,
+        temp_table=f"{table}_tmp" if case["temp_table"] else None,
+        create_table=True,
+        chunksize=case["chunksize"],
+        transform=transform,
+        insert_engine=case["engine"],
+    )
+    seconds = time.perf_counter() - start
+    db.close()
+
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    peak_mb = peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+    return dict(case,
+                seconds=round(seconds, 4),
+                rows_per_sec=round(case["rows"] / seconds, 1) if seconds else None,
+                peak_rss_mb=round(peak_mb, 1),
+                parse_seconds=round(timing["read"], 4),
+                transform_seconds=round(timing["transform"], 4),
+                insert_seconds=round(timing["insert"], 4),
+                merge_seconds=round(timing["merge"], 4))
+
+
+def run_isolated(case: dict) -> dict:
+    ctx = multiprocessing.get_context("spawn")
+    with ctx.Pool(1) as pool:
+        try:
+            return pool.apply(run_case, (case,))
+        except Exception as e:
+            return dict(case, error=str(e))
+
+
+def main():
+    opts = getopts()
+    workdir = opts.workdir or tempfile.mkdtemp(prefix="mariaio_bench_")
+    os.makedirs(workdir, exist_ok=True)
+    rng = np.random.default_rng(42)
+
+    server = None
+    config_file, conf = opts.dbconfig, opts.dbname
+    if opts.backend == "mariadbd":
+        server, config_file, conf = launch_mariadbd(workdir)
+
+    engines = opts.engines.split(",") if opts.engines else ["to_sql", "executemany", "load_data"]
+    if opts.backend == "fake" and "load_data" in engines:
+        engines.remove("load_data")  # sqlite has no LOAD DATA
+
+    results = []
+    try:
+        for shape in opts.shapes.split(","):
+            csv_file = os.path.join(workdir, f"{shape}_{opts.rows}.csv")
+            if not os.path.exists(csv_file):
+                SHAPES[shape][0](opts.rows, rng).to_csv(csv_file, index=False)
+            for chunksize in [int(c) for c in opts.chunksizes.split(",")]:
+                for temp_table in (False, True):
+                    for transform in (False, True):
+                        for engine in engines:
+                            case = {"backend": opts.backend, "config_file": config_file, "conf": conf,
+                                    "shape": shape, "file": csv_file, "rows": opts.rows,
+                                    "bytes": os.path.getsize(csv_file), "chunksize": chunksize,
+                                    "temp_table": temp_table, "transform": transform, "engine": engine}
+                            result = run_isolated(case)
+                            print(f"{shape:7} chunk {chunksize:6} temp {temp_table!s:5} transform {transform!s:5} "
+                                  f"{engine:12} {result.get('rows_per_sec') or result.get('error')}", file=sys.stderr)
+                            results.append(result)
+    finally:
+        if server is not None:
+            server.terminate()
+            server.wait()
+
+    try:
+        mariaio_version = metadata.version("mariaio")
+    except metadata.PackageNotFoundError:
+        mariaio_version = None
+    report = {
+        "date": datetime.now(timezone.utc).isoformat(),
+        "mariaio": mariaio_version,
+        "python": platform.python_version(),
+        "pandas": pd.__version__,
+        "platform": platform.platform(),
+        "backend": opts.backend,
+        "results": [{k: v for k, v in r.items() if k not in ("config_file", "conf", "file")} for r in results],
+    }
+    if opts.outfile == "-":
+        json.dump(report, sys.stdout, indent=2)
+        print()
+    else:
+        with open(opts.outfile, "w") as fh:
+            json.dump(report, fh, indent=2)
+
+
+if __name__ == "__main__":
+    main()
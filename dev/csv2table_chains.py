@@ -5,6 +5,10 @@ This is example of using transform functionality with csv2table
 
 python csv2table_chains.py -i 20250227_chains.csv -t test_chains -c -v
 
+later files only add the quotes newer than the table's last quote_time:
+
+python csv2table_chains.py -i 20250228_chains.csv -t test_chains --watermark quote_time -v
+
 
 
 """
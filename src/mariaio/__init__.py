@@ -1,9 +1,27 @@
 
-from .mymaria import MyMaria
-from .csv2table_app import csv2table
+# exports are imported on first access, so "import mariaio" and the
+# command line apps do not pay for pandas and sqlalchemy up front
+_EXPORTS = {
+    'MyMaria': 'mymaria',
+    'InsertError': 'mymaria',
+    'AsyncMyMaria': 'aio',
+    'csv2table': 'csv2table_app',
+    'table2csv': 'table2csv_app',
+    }
+
+
+def __getattr__(name):
+    if name in _EXPORTS:
+        import importlib
+        module = importlib.import_module(f".{_EXPORTS[name]}", __name__)
+        return getattr(module, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
 __all__ = [
     'MyMaria',
+    'InsertError',
+    'AsyncMyMaria',
     'csv2table', 
+    'table2csv',
     ]
@@ -0,0 +1,153 @@
+import asyncio
+import functools
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Optional, Union
+
+from .cache import QueryCache
+from .config import read_config
+from .mymaria import MyMaria
+
+
+class _End:
+    """Queue marker for the end of a query, carries the error that stopped it, if any."""
+    def __init__(self, error: Optional[BaseException] = None):
+        self.error = error
+
+
+class AsyncMyMaria:
+    """
+    Asyncio front end of MyMaria, for services running many loads and
+    queries concurrently from one event loop.
+
+    The mariadb connector is blocking, so calls run the sync MyMaria code
+    (same type inference, insert engines and error handling) on a fixed
+    pool of `concurrency` threads. Each thread has its own MyMaria from
+    MyMaria.worker(), sharing one engine pool, schema cache and query cache.
+    Calls beyond `concurrency` wait on an asyncio.Semaphore in the event
+    loop, so dozens of pending loads hold no thread or connection.
+
+    Errors, e.g. InsertError of a load the server refused, are raised in
+    the awaiting task.
+
+    Args:
+        concurrency (int, optional): calls run at once, defaults to the
+        pool_size of the config
+        the others as for MyMaria
+    """
+
+    def __init__(self, verbose: bool = False, config_file: str = "", conf: str = "default",
+                 concurrency: Optional[int] = None, schema_ttl: Optional[float] = None,
+                 metrics: Union[Callable, list, None] = None, config: Optional[dict] = None,
+                 query_cache: Optional[QueryCache] = None):
+        if config is None:
+            config = read_config(config_file, conf)
+        self.concurrency = concurrency or config["pool_size"]
+        # each running call holds its exec connection and one for inserts
+        config = dict(config, pool_size=max(config["pool_size"], 2 * self.concurrency))
+        self.db = MyMaria(verbose=verbose, config_file=config_file, conf=conf, schema_ttl=schema_ttl,
+                          metrics=metrics, config=config, query_cache=query_cache)
+        self.db.engine  # created here, before worker threads race to create it; it connects on first use
+        self._local = threading.local()
+        self._workers: list = []
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=self.concurrency, thread_name_prefix="mariaio-async")
+        self._semaphore = asyncio.Semaphore(self.concurrency)
+
+    def __str__(self) -> str:
+        return "AsyncMyMaria:" + self.db.conf
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await asyncio.get_running_loop().run_in_executor(None, self.close)
+
+    def _worker_db(self) -> MyMaria:
+        db = getattr(self._local, "db", None)
+        if db is None:
+            db = self._local.db = self.db.worker()
+            with self._lock:
+                self._workers.append(db)
+        return db
+
+    def _run(self, method: str, args: tuple, kwargs: dict):
+        return getattr(self._worker_db(), method)(*args, **kwargs)
+
+    async def call(self, method: str, *args, **kwargs):
+        """Run MyMaria.method(*args, **kwargs) on the thread pool and return its result."""
+        async with self._semaphore:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._executor,
+                                              functools.partial(self._run, method, args, kwargs))
+
+    async def exec(self, query):
+        return await self.call("exec", query)
+
+    async def table_info(self, table_name: str) -> dict:
+        return await self.call("table_info", table_name)
+
+    async def create_table_from_df(self, df, table_name: str, **kwargs):
+        return await self.call("create_table_from_df", df, table_name, **kwargs)
+
+    async def load_data_to_mariadb(self, data, table_name: str, **kwargs):
+        """As MyMaria.load_data_to_mariadb, returns the rows loaded, None when the load failed."""
+        return await self.call("load_data_to_mariadb", data, table_name, **kwargs)
+
+    async def load_files(self, paths, table_name: str, **kwargs) -> list:
+        return await self.call("load_files", paths, table_name, **kwargs)
+
+    async def export_query(self, query: str, dest: str, **kwargs) -> int:
+        return await self.call("export_query", query, dest, **kwargs)
+
+    async def query_df(self, sql: str, params=None, use_cache: bool = True):
+        return await self.call("query_df", sql, params, use_cache=use_cache)
+
+    async def query(self, sql: str, params=None, chunksize: int = 10000):
+        """
+        Async iterator of DataFrames of up to chunksize rows, as MyMaria.query.
+        The rows are fetched in one worker thread, which keeps the cursor, and
+        handed over through a queue of two frames; the query holds one slot of
+        the concurrency until iteration ends.
+        """
+        async with self._semaphore:
+            loop = asyncio.get_running_loop()
+            frames: asyncio.Queue = asyncio.Queue(maxsize=2)
+            stop = threading.Event()
+
+            def produce():
+                end = None  # the error that stopped the query, if any
+                try:
+                    for df in self._worker_db().query(sql, params, chunksize):
+                        if stop.is_set():
+                            break
+                        asyncio.run_coroutine_threadsafe(frames.put(df), loop).result()
+                except BaseException as e:
+                    end = e
+                if not stop.is_set():
+                    asyncio.run_coroutine_threadsafe(frames.put(_End(end)), loop).result()
+
+            task = loop.run_in_executor(self._executor, produce)
+            try:
+                while True:
+                    item = await frames.get()
+                    if isinstance(item, _End):
+                        if item.error is not None:
+                            raise item.error
+                        return
+                    yield item
+            finally:
+                stop.set()
+                while not task.done():  # unblock a producer waiting on a full queue
+                    while not frames.empty():
+                        frames.get_nowait()
+                    await asyncio.wait({task}, timeout=0.05)
+
+    def close(self):
+        """Wait for running calls, then close the connections and dispose the engine."""
+        self._executor.shutdown(wait=True)
+        with self._lock:
+            for db in self._workers:
+                db.close()
+            self._workers.clear()
+        self.db.close()
@@ -0,0 +1,73 @@
+import collections
+import threading
+import time
+from typing import Optional
+
+import pandas as pd  # type: ignore
+
+
+class QueryCache:
+    """
+    In-process cache of query results (DataFrames) keyed on sql and params.
+
+    Least recently used results are evicted once the cached frames take
+    more than max_bytes (deep memory usage), and results older than ttl
+    seconds are read again. Writes to the database do not invalidate
+    entries, ttl bounds how stale a result can be; clear() drops them all.
+
+    Args:
+        max_bytes (int): memory of the cached frames, default 256 MB
+        ttl (float, optional): seconds a result is served, None for no expiry
+    """
+
+    def __init__(self, max_bytes: int = 256 * 1024 * 1024, ttl: Optional[float] = None):
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.lock = threading.Lock()
+        self._entries: collections.OrderedDict = collections.OrderedDict()  # key => (df, bytes, loaded)
+
+    @staticmethod
+    def key(sql: str, params=None) -> tuple:
+        return (sql, repr(params))
+
+    def get(self, key: tuple) -> Optional[pd.DataFrame]:
+        """A copy of the cached result, None when missing or expired."""
+        with self.lock:
+            entry = self._entries.get(key)
+            if entry is not None and self.ttl is not None and time.monotonic() - entry[2] > self.ttl:
+                self._drop(key)
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0].copy()  # callers may modify their frame
+
+    def put(self, key: tuple, df: pd.DataFrame):
+        size = int(df.memory_usage(deep=True, index=True).sum())
+        if size > self.max_bytes:
+            return
+        with self.lock:
+            if key in self._entries:
+                self._drop(key)
+            self._entries[key] = (df.copy(), size, time.monotonic())
+            self.bytes += size
+            while self.bytes > self.max_bytes:
+                self._drop(next(iter(self._entries)))
+
+    def _drop(self, key: tuple):
+        _, size, _ = self._entries.pop(key)
+        self.bytes -= size
+
+    def clear(self):
+        with self.lock:
+            self._entries.clear()
+            self.bytes = 0
+
+    def report(self) -> str:
+        return (f"{len(self._entries)} results, {self.bytes / 1e6:.1f} MB, "
+                f"{self.hits} hits, {self.misses} misses")
@@ -0,0 +1,90 @@
+import json
+import os
+
+
+class Checkpoint:
+    """
+    Progress of a CSV load, saved after each committed chunk.
+
+    The file records the next chunk index, the byte offset where it starts
+    and the rows committed so far. Chunks committed out of order by parallel
+    workers only advance the checkpoint once every earlier chunk is committed,
+    so resuming never skips data. Until then their byte ranges are saved as
+    loaded, and a resumed load reads over them instead of inserting them again.
+
+    Args:
+        path (str): checkpoint file (json)
+        data (str): csv file being loaded
+        table_name (str): target table
+        temp_table (str): staging table, if any
+    """
+
+    def __init__(self, path: str, data: str, table_name: str, temp_table: str = None):
+        self.path = path
+        self.data = os.path.abspath(data)
+        self.table_name = table_name
+        self.temp_table = temp_table
+        stat = os.stat(data)
+        self.size = stat.st_size
+        self.mtime = stat.st_mtime
+        self.chunk_index = 0
+        self.offset = 0
+        self.rows = 0
+        self.loaded: list = []  # (start, end, rows) committed past offset by an earlier run
+        self._done: dict = {}  # chunk index => (start, end, rows) committed ahead of chunk_index
+
+    def load(self) -> bool:
+        """
+        Read saved progress. Returns False when there is no checkpoint
+        or it belongs to another file, table or version of the file.
+        """
+        try:
+            with open(self.path) as fh:
+                saved = json.load(fh)
+        except FileNotFoundError:
+            return False
+        same = (saved.get("data") == self.data and saved.get("table") == self.table_name
+                and saved.get("temp_table") == self.temp_table
+                and saved.get("size") == self.size and saved.get("mtime") == self.mtime)
+        if not same:
+            return False
+        self.chunk_index = saved["chunk_index"]
+        self.offset = saved["offset"]
+        self.rows = saved["rows"]
+        self.loaded = sorted(tuple(span) for span in saved.get("loaded", []))
+        return True
+
+    def save(self):
+        state = {
+            "data": self.data,
+            "table": self.table_name,
+            "temp_table": self.temp_table,
+            "size": self.size,
+            "mtime": self.mtime,
+            "chunk_index": self.chunk_index,
+            "offset": self.offset,
+            "rows": self.rows,
+            "loaded": sorted(self.loaded + list(self._done.values())),
+        }
+        tmp = self.path + ".tmp"
+        with open(tmp, "w") as fh:
+            json.dump(state, fh)
+        os.replace(tmp, self.path)  # atomic, a crash leaves the old or the new checkpoint
+
+    def commit(self, index: int, start: int, end: int, rows: int):
+        """Record a committed chunk, the committed prefix grows over it once the chunks before are in."""
+        self._done[index] = (start, end, rows)
+        while True:
+            if self.chunk_index in self._done:
+                _, self.offset, chunk_rows = self._done.pop(self.chunk_index)
+                self.chunk_index += 1
+            elif self.loaded and self.loaded[0][0] == self.offset:
+                _, self.offset, chunk_rows = self.loaded.pop(0)
+            else:
+                break
+            self.rows += chunk_rows
+        self.save()
+
+    def remove(self):
+        if os.path.exists(self.path):
+            os.remove(self.path)
@@ -0,0 +1,38 @@
+import configparser
+import os
+import sys
+
+# light module: the apps read the config before importing pandas and the connector
+DEFAULT_CONFIG_FILE = os.path.join(os.path.expanduser("~"), ".config", "mymaria.ini")
+
+
+def read_config(config_file: str = "", conf: str = "default") -> dict:
+    """
+    Connection parameters of section conf of a mymaria.ini file.
+
+    Returns a dict of host, port, user, password, database, local_infile
+    and pool_size. Exits with status 11 when the file or section is missing.
+    """
+    config_file = config_file or DEFAULT_CONFIG_FILE
+    config = configparser.ConfigParser()
+    try:
+        with open(config_file) as fh:
+            config.read_file(fh)
+        db_config = config[conf]
+        return {
+            "host": db_config.get('host', 'localhost'),  # Default to localhost if not found
+            "port": db_config.getint('port', 3306),  # Default to 3306 if not found
+            "user": db_config.get('user', 'none'),
+            "password": db_config.get('password', 'none'),
+            "database": db_config.get('database', conf),
+            "local_infile": db_config.getboolean('local_infile', True),  # needed for LOAD DATA LOCAL INFILE
+            "pool_size": db_config.getint('pool_size', 5),  # connections kept by the engine pool
+        }
+    except FileNotFoundError as e:
+        print(f"Configuration file '{config_file}' not found: {e}", file=sys.stderr)
+        sys.exit(11)
+    except KeyError as e:
+        print(f"Configuration key '{e}' not found in '{config_file}'", file=sys.stderr)
+        sys.exit(11)
+    except configparser.Error as e:
+        raise ValueError(f"Error loading '{conf}' config from {config_file}: {e}")
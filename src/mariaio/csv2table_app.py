@@ -1,8 +1,35 @@
+from __future__ import annotations
 import sys
 import argparse
-import pandas as pd
-from typing import Callable, Optional  # Import Callable and Union
-from mariaio import MyMaria
+import glob
+import time
+from typing import TYPE_CHECKING, Callable, Optional  # Import Callable and Union
+from mariaio.config import read_config
+from mariaio.instrument import JsonLinesSink, SummaryReporter
+
+if TYPE_CHECKING:  # pandas and the connector are imported once the arguments are parsed
+    import pandas as pd
+
+
+def chunksize_arg(value: str):
+    """--chunksize: a positive number of rows or auto"""
+    if value == "auto":
+        return value
+    try:
+        rows = int(value)
+    except ValueError:
+        rows = 0
+    if rows <= 0:
+        raise argparse.ArgumentTypeError(f"expected a positive number of rows or auto, not '{value}'")
+    return rows
+
+
+def columns_arg(value: str) -> list:
+    """--primary-key, --index: comma separated column names"""
+    columns = [col.strip() for col in value.split(",") if col.strip()]
+    if not columns:
+        raise argparse.ArgumentTypeError(f"expected comma separated columns, not '{value}'")
+    return columns
 
 
 def getopts():
@@ -16,7 +43,7 @@ def getopts():
         "--infile",
         action="store",
         type=str,
-        help="csv file to load",
+        help="csv file to load, - for stdin, or a quoted glob pattern like 'dir/*.csv'",
     )
     parser.add_argument(
         "-t",
@@ -53,6 +80,164 @@ def getopts():
         default=False,
         help="all table create if not existing",
     )
+    parser.add_argument(
+        "--partition",
+        action="store",
+        type=str,
+        help="partitioning of a created table: day:COLUMN, month:COLUMN or hash:COLUMN:N",
+    )
+    parser.add_argument(
+        "--primary-key",
+        action="store",
+        type=columns_arg,
+        help="comma separated primary key columns of a created table",
+    )
+    parser.add_argument(
+        "--index",
+        action="append",
+        type=columns_arg,
+        help="comma separated columns of an index of a created table, may repeat",
+    )
+    parser.add_argument(
+        "--reload-partition",
+        action="store",
+        choices=["truncate", "exchange"],
+        help="replace the days or months loaded: truncate their partitions, or exchange one with the temp table",
+    )
+    parser.add_argument(
+        "--bulk",
+        action="store_true",
+        default=False,
+        help="bulk load with LOAD DATA LOCAL INFILE",
+    )
+    parser.add_argument(
+        "--arrow",
+        action="store_true",
+        default=False,
+        help="parse csv with the multithreaded pyarrow reader into Arrow-backed columns",
+    )
+    parser.add_argument(
+        "--prune",
+        action="store_true",
+        default=False,
+        help="read only the columns of an existing table, with dtypes from its column types",
+    )
+    parser.add_argument(
+        "-s",
+        "--chunksize",
+        action="store",
+        type=chunksize_arg,
+        default=10000,
+        help="rows per chunk, or auto to tune it to the insert rate and max_allowed_packet [default 10000]",
+    )
+    parser.add_argument(
+        "--max-chunk-mb",
+        action="store",
+        type=float,
+        help="target memory per chunk in MB, the rows per chunk adapt to it",
+    )
+    parser.add_argument(
+        "--fast-load",
+        action="store_true",
+        default=False,
+        help="defer unique and foreign key checks while loading",
+    )
+    parser.add_argument(
+        "--no-binlog",
+        action="store_true",
+        default=False,
+        help="do not write the loaded rows to the binary log, replicas will not get them",
+    )
+    parser.add_argument(
+        "--staging-engine",
+        action="store",
+        type=str,
+        help="storage engine of the temp table, e.g. Aria or MEMORY",
+    )
+    parser.add_argument(
+        "--merge",
+        action="store",
+        default="ignore",
+        choices=["ignore", "upsert", "replace", "swap"],
+        help="how temp table rows reach the table [default ignore]",
+    )
+    parser.add_argument(
+        "--merge-batch",
+        action="store",
+        type=int,
+        help="merge the temp table in slices of this many rows by primary key",
+    )
+    parser.add_argument(
+        "--on-error",
+        action="store",
+        choices=["abort", "bisect"],
+        default="abort",
+        help="abort at a refused chunk, or bisect it to reject only the bad rows [default abort]",
+    )
+    parser.add_argument(
+        "--reject-file",
+        action="store",
+        help="csv file receiving rejected rows with their errors",
+    )
+    parser.add_argument(
+        "--max-errors",
+        action="store",
+        type=int,
+        default=1000,
+        help="rejected rows tolerated before the load aborts [default 1000]",
+    )
+    parser.add_argument(
+        "--watermark",
+        action="store",
+        help="load only rows with this column greater than its current maximum in the table",
+    )
+    parser.add_argument(
+        "--watermark-order",
+        action="store",
+        choices=["asc", "desc"],
+        help="input sorted on the watermark column, desc stops reading at the first loaded row",
+    )
+    parser.add_argument(
+        "-w",
+        "--workers",
+        action="store",
+        default=1,
+        type=int,
+        help="number of parallel insert connections [default 1]",
+    )
+    parser.add_argument(
+        "-p",
+        "--processes",
+        action="store",
+        default=1,
+        type=int,
+        help="processes parsing files of a glob pattern [default 1]",
+    )
+    parser.add_argument(
+        "--transform-processes",
+        action="store",
+        default=1,
+        type=int,
+        help="processes running the transform on the chunks of a file [default 1]",
+    )
+    parser.add_argument(
+        "--checkpoint",
+        action="store",
+        type=str,
+        help="checkpoint file recording committed chunks [default INFILE.ckpt with --resume]",
+    )
+    parser.add_argument(
+        "--resume",
+        action="store_true",
+        default=False,
+        help="resume an interrupted load from its checkpoint",
+    )
+    parser.add_argument(
+        "--metrics",
+        action="store",
+        type=str,
+        help="append timed load events as json lines to this file, - for stderr",
+    )
     parser.add_argument(
         "-v",
         "--verbose",
@@ -73,6 +258,7 @@ def transform_sample(df: pd.DataFrame) -> pd.DataFrame:
 
     This function is passed to the load_data_to_mariadb function
     """
+    import pandas as pd
     # Convert milliseconds to seconds *in place*
     df['time'] = (df['time'] / 1000).astype(int)  
     # Create datetime and date objects using the correct column
@@ -80,6 +266,9 @@ def transform_sample(df: pd.DataFrame) -> pd.DataFrame:
     df['quote_date'] = df['quote_time'].dt.date
     return df
 
+# columns the transform reads, also kept when --prune reads only the table's columns
+transform_sample.input_columns = ["time"]  # type: ignore[attr-defined]
+
 def transform(df: pd.DataFrame) -> pd.DataFrame:
     # Returns an empty dataframe as a stub
     # see transform_sample for example usage 
@@ -88,14 +277,62 @@ def transform(df: pd.DataFrame) -> pd.DataFrame:
 def csv2table(transform_func: Optional[Callable[[pd.DataFrame], pd.DataFrame]] = None):  # Correct type hint
 
     opts = getopts()
-    db = MyMaria(verbose=opts.verbose, conf=opts.dbname, config_file=opts.dbconfig)
-    db.load_data_to_mariadb(
-        opts.infile, 
-        opts.table, 
-        temp_table=opts.temptable, 
-        create_table=opts.create, 
+    config = read_config(opts.dbconfig, opts.dbname)
+    from mariaio.mymaria import InsertError, MyMaria
+    metrics: list = []
+    summary = SummaryReporter() if opts.verbose else None
+    if summary:
+        metrics.append(summary)
+    if opts.metrics:
+        metrics.append(JsonLinesSink(opts.metrics))
+    db = MyMaria(verbose=opts.verbose, conf=opts.dbname, config_file=opts.dbconfig, metrics=metrics, config=config)
+    load_options = dict(
+        temp_table=opts.temptable,
+        create_table=opts.create,
         transform=transform_func,
+        method="load_data" if opts.bulk else "to_sql",
+        chunksize=opts.chunksize,
+        csv_parser="arrow" if opts.arrow else "pandas",
+        prune_columns=opts.prune,
+        max_chunk_bytes=int(opts.max_chunk_mb * 1e6) if opts.max_chunk_mb else None,
+        fast_load=opts.fast_load,
+        no_binlog=opts.no_binlog,
+        staging_engine=opts.staging_engine,
+        merge=opts.merge,
+        merge_batch=opts.merge_batch,
+        on_error=opts.on_error,
+        reject_file=opts.reject_file,
+        max_errors=opts.max_errors,
+        watermark=opts.watermark,
+        watermark_order=opts.watermark_order,
+        transform_processes=opts.transform_processes,
+        partition=opts.partition,
+        primary_key=opts.primary_key,
+        indexes=opts.index,
+        reload_partition=opts.reload_partition,
         )
+    if opts.infile is not None and glob.has_magic(opts.infile):
+        start = time.perf_counter()
+        results = db.load_files(opts.infile, opts.table, processes=opts.processes,
+                                max_connections=opts.workers, **load_options)
+        print(db.files_report(results, time.perf_counter() - start), file=sys.stderr)
+        status = 1 if any(result["error"] is not None for result in results) else 0
+    else:
+        try:
+            status = 1 if db.load_data_to_mariadb(
+                opts.infile,
+                opts.table,
+                workers=opts.workers,
+                checkpoint=opts.checkpoint or (f"{opts.infile}.ckpt" if opts.resume else None),
+                resume=opts.resume,
+                **load_options,
+                ) is None else 0
+        except InsertError as e:
+            print(e, file=sys.stderr)
+            status = 11
+    if summary:
+        print(summary.report(), file=sys.stderr)
+    return status
 
 
 
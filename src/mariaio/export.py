@@ -0,0 +1,145 @@
+import csv
+import gzip
+import sys
+from typing import Optional
+
+try:
+    import resource
+except ImportError:  # not available on windows
+    resource = None  # type: ignore
+
+EXPORT_FORMATS = ("csv", "csv.gz", "parquet")
+
+# Arrow types of the field type codes of a cursor description (MySQL protocol),
+# columns of other types (BLOB/TEXT, BIT, GEOMETRY) take the type of their values
+ARROW_FIELD_TYPES = {
+    1: "int64", 2: "int64", 3: "int64", 8: "int64", 9: "int64", 13: "int64",  # TINY..LONGLONG, INT24, YEAR
+    4: "float64", 5: "float64",  # FLOAT, DOUBLE
+    7: "timestamp", 12: "timestamp",  # TIMESTAMP, DATETIME
+    10: "date32",  # DATE
+    11: "duration",  # TIME, returned as timedelta
+    15: "string", 245: "string", 247: "string", 248: "string", 253: "string", 254: "string",  # VARCHAR, JSON, ENUM, SET, VAR_STRING, STRING
+}
+DECIMAL_FIELD_TYPES = (0, 246)  # DECIMAL, NEWDECIMAL
+
+
+def format_for(dest: str, format: Optional[str] = None) -> str:
+    """Export format, given or from the extension of dest."""
+    if format:
+        if format not in EXPORT_FORMATS:
+            raise ValueError(f"Unknown export format '{format}', use one of {EXPORT_FORMATS}")
+        return format
+    if dest.endswith(".parquet"):
+        return "parquet"
+    if dest.endswith(".gz"):
+        return "csv.gz"
+    return "csv"
+
+
+def peak_rss_mb() -> Optional[float]:
+    """Peak resident memory of this process in MB, None where unknown."""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # kilobytes on linux, bytes on macos
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+class CsvWriter:
+    """Write row batches to a csv file, gzip compressed or stdout for '-'."""
+
+    def __init__(self, dest: str, compress: bool = False):
+        if dest == "-":
+            self.fh = sys.stdout
+            self.close_fh = False
+        elif compress:
+            self.fh = gzip.open(dest, "wt", newline="", encoding="utf-8")
+            self.close_fh = True
+        else:
+            self.fh = open(dest, "w", newline="", encoding="utf-8")
+            self.close_fh = True
+        self.writer = csv.writer(self.fh)
+
+    def header(self, names: list, description: Optional[list] = None):
+        self.writer.writerow(names)
+
+    def write(self, rows: list):
+        self.writer.writerows(rows)
+
+    def close(self):
+        if self.close_fh:
+            self.fh.close()
+        else:
+            self.fh.flush()
+
+
+class ParquetWriter:
+    """
+    Write row batches as row groups of a parquet file, needs pyarrow.
+
+    Column types come from the cursor description where it tells them,
+    else from the values of the first batch; columns without a value there
+    are strings. The file is written also when the result has no rows.
+    """
+
+    def __init__(self, dest: str):
+        try:
+            import pyarrow  # type: ignore
+            import pyarrow.parquet  # type: ignore
+        except ImportError:
+            raise ValueError("parquet export needs pyarrow: pip install pyarrow")
+        self.pa = pyarrow
+        self.pq = pyarrow.parquet
+        self.dest = dest
+        self.names: Optional[list] = None
+        self.types: list = []  # Arrow type per column, None until seen in the first batch
+        self.writer = None
+
+    def header(self, names: list, description: Optional[list] = None):
+        self.names = names
+        self.types = [self._arrow_type(col) for col in description] if description else [None] * len(names)
+
+    def _arrow_type(self, col: tuple):
+        code = col[1]
+        if code in DECIMAL_FIELD_TYPES:
+            precision, scale = (col[4], col[5]) if len(col) > 5 else (None, None)
+            if precision and 0 < precision <= 38:
+                return self.pa.decimal128(precision, scale or 0)
+            return None
+        name = ARROW_FIELD_TYPES.get(code)
+        if name in ("timestamp", "duration"):
+            return getattr(self.pa, name)("us")
+        return getattr(self.pa, name)() if name else None
+
+    def _open(self, columns: list):
+        for i, col in enumerate(columns):
+            if self.types[i] is None:
+                inferred = self.pa.array(col).type
+                self.types[i] = self.pa.string() if self.pa.types.is_null(inferred) else inferred
+        schema = self.pa.schema(list(zip(self.names, self.types)))
+        self.writer = self.pq.ParquetWriter(self.dest, schema)
+
+    def _array(self, values, arrow_type):
+        try:
+            return self.pa.array(values, type=arrow_type)
+        except (self.pa.ArrowException, TypeError, ValueError):
+            return self.pa.array(values).cast(arrow_type)
+
+    def write(self, rows: list):
+        columns = list(zip(*rows)) if rows else [() for _ in self.names]
+        if self.writer is None:
+            self._open(columns)
+        arrays = [self._array(col, arrow_type) for col, arrow_type in zip(columns, self.types)]
+        self.writer.write_table(self.pa.Table.from_arrays(arrays, schema=self.writer.schema))
+
+    def close(self):
+        if self.writer is None and self.names is not None:
+            self._open([() for _ in self.names])  # no rows, the file still has the columns
+        if self.writer is not None:
+            self.writer.close()
+
+
+def open_writer(dest: str, format: str):
+    if format == "parquet":
+        return ParquetWriter(dest)
+    return CsvWriter(dest, compress=(format == "csv.gz"))
@@ -0,0 +1,121 @@
+import json
+import sys
+import threading
+import time
+from typing import Callable, Optional, Union
+
+
+class MetricsSink:
+    """
+    Receiver of timed events from MyMaria.
+
+    An event is a dict with at least 'event' (name), 'ts' (epoch seconds at
+    the end) and 'seconds'; load events also carry 'table', 'chunk', 'rows',
+    'bytes' and 'rows_per_sec' where known. Any callable taking the dict
+    works as a sink too; this base class ignores the events.
+    """
+
+    def __call__(self, event: dict):
+        pass
+
+
+class JsonLinesSink(MetricsSink):
+    """Append each event as one json line to a file, "-" for stderr."""
+
+    def __init__(self, path: str = "-"):
+        self.lock = threading.Lock()
+        if path == "-":
+            self.fh = sys.stderr
+            self.close_fh = False
+        else:
+            self.fh = open(path, "a", encoding="utf-8")
+            self.close_fh = True
+
+    def __call__(self, event: dict):
+        line = json.dumps(event, default=str)
+        with self.lock:
+            self.fh.write(line + "\n")
+            self.fh.flush()
+
+    def close(self):
+        if self.close_fh:
+            self.fh.close()
+
+
+class SummaryReporter(MetricsSink):
+    """Totals per event name, report() gives a table of time, rows and throughput."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.totals: dict = {}
+
+    def __call__(self, event: dict):
+        with self.lock:
+            total = self.totals.setdefault(event["event"], {"count": 0, "seconds": 0.0, "rows": 0, "bytes": 0})
+            total["count"] += 1
+            total["seconds"] += event.get("seconds") or 0.0
+            total["rows"] += event.get("rows") or 0
+            total["bytes"] += event.get("bytes") or 0
+
+    def report(self) -> str:
+        lines = [f"{'event':<12} {'count':>6} {'seconds':>9} {'rows':>11} {'MB':>9} {'rows/sec':>11}"]
+        for name, total in self.totals.items():
+            rate = total["rows"] / total["seconds"] if total["seconds"] and total["rows"] else 0
+            lines.append(f"{name:<12} {total['count']:>6} {total['seconds']:>9.3f} {total['rows']:>11} "
+                         f"{total['bytes'] / 1e6:>9.1f} {rate:>11,.0f}")
+        return "\n".join(lines)
+
+
+class Timer:
+    """Context manager timing a block and sending the event to the sinks."""
+
+    __slots__ = ("sinks", "fields", "start")
+
+    def __init__(self, sinks: list, event: str, fields: dict):
+        self.sinks = sinks
+        self.fields = fields
+        self.fields["event"] = event
+
+    def __enter__(self) -> dict:
+        self.start = time.perf_counter()
+        return self.fields
+
+    def __exit__(self, exc_type, exc, tb):
+        fields = self.fields
+        seconds = time.perf_counter() - self.start
+        fields["seconds"] = round(seconds, 6)
+        fields["ts"] = time.time()
+        if fields.get("rows") and seconds > 0:
+            fields["rows_per_sec"] = round(fields["rows"] / seconds, 1)
+        if exc is not None:
+            fields["error"] = str(exc)
+        for sink in self.sinks:
+            sink(fields)
+        return False
+
+
+class _NullTimer:
+    """
+    Stand-in when no sink is set, so disabled instrumentation costs one call.
+    Shared by all threads: each block gets a fresh dict, whose fields are dropped.
+    """
+
+    __slots__ = ()
+
+    def __enter__(self) -> dict:
+        return {}
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+
+NULL_TIMER = _NullTimer()
+
+
+def as_sinks(metrics: Union[Callable, list, None]) -> Optional[list]:
+    """Normalize the metrics argument of MyMaria to a list of sinks, None when disabled."""
+    if metrics is None:
+        return None
+    if isinstance(metrics, (list, tuple)):
+        return list(metrics) or None
+    return [metrics]
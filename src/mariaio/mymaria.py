@@ -2,32 +2,114 @@
 import mariadb  # type: ignore
 import sys
 import sqlalchemy  # type: ignore
-from sqlalchemy.orm import sessionmaker  # type: ignore
-from sqlalchemy.exc import SQLAlchemyError  # type: ignore
-import configparser  # Import the configparser module
+from sqlalchemy.exc import DataError, IntegrityError, SQLAlchemyError  # type: ignore
+from sqlalchemy.dialects import mysql  # type: ignore
 import os  # Import the os module for environment variables
+import collections
+import csv
+import tempfile
+import itertools
+import re
+import threading
+import time
+import types
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, FIRST_COMPLETED, wait
+from contextlib import ExitStack, contextmanager
+import numpy as np
 import pandas as pd  # type: ignore
-from typing import Callable, Optional, Union  # Import Callable and Union
-from datetime import (date, datetime)
+from typing import IO, Callable, Optional, Union  # Import Callable and Union
+from .pipeline import ChunkPipeline
+from .parallel import TransformPool
+from .typeinfer import TypeInferencer, pandas_dtype
+from .sizing import AdaptiveChunkSizer, ChunkSizer
+from .export import format_for, open_writer, peak_rss_mb
+from .readers import ArrowReader, OffsetCsvReader, CHUNK_META, columnar_format, decompressed_fifo, detect_compression, expand_paths, open_input, read_file
+from .cache import QueryCache
+from .checkpoint import Checkpoint
+from .partition import Partitioning
+from .rejects import RejectLog
+from .watermark import Watermark
+from .instrument import NULL_TIMER, Timer, as_sinks
+from .config import read_config
 
 def warn(*a):
     print(*a, file=sys.stderr)
 
 
+class InsertError(Exception):
+    """A chunk the server refused, it stops the load; csv2table exits with status 11."""
+
+
+# statements that change table definitions, they invalidate the schema cache
+DDL_RE = re.compile(r"^\s*(CREATE|ALTER|DROP|RENAME)\b", re.IGNORECASE)
+_NAME = r"(?:`[^`]+`|[\w$]+)(?:\.(?:`[^`]+`|[\w$]+))?"
+# the tables of a DDL statement: the one created, altered or indexed, those dropped or renamed
+DDL_TABLE_RES = [
+    re.compile(r"^\s*(?:CREATE|ALTER)\s+(?:OR\s+REPLACE\s+|TEMPORARY\s+|ONLINE\s+|IGNORE\s+)*TABLE\s+"
+               rf"(?:IF\s+NOT\s+EXISTS\s+)?({_NAME})", re.IGNORECASE),
+    re.compile(r"^\s*(?:CREATE|DROP)\s+(?:OR\s+REPLACE\s+|UNIQUE\s+|FULLTEXT\s+|SPATIAL\s+)*INDEX\s+"
+               rf"(?:IF\s+(?:NOT\s+)?EXISTS\s+)?{_NAME}\s+ON\s+({_NAME})", re.IGNORECASE),
+    re.compile(rf"\bWITH\s+TABLE\s+({_NAME})", re.IGNORECASE),  # EXCHANGE PARTITION
+]
+DDL_TABLE_LIST_RE = re.compile(r"^\s*(?:DROP\s+(?:TEMPORARY\s+)?TABLE\s+(?:IF\s+EXISTS\s+)?|RENAME\s+TABLE\s+)"
+                               r"(.*?)\s*(?:RESTRICT|CASCADE)?\s*;?\s*$", re.IGNORECASE | re.DOTALL)
+
+
+def _bare_name(table_name: str) -> str:
+    """table of `db`.`table`, db.table or table, without backticks"""
+    return re.split(r"\.(?=(?:[^`]*`[^`]*`)*[^`]*$)", table_name)[-1].strip("`")
+
+
+def ddl_tables(query: str) -> Optional[list]:
+    """
+    Bare names (see _bare_name) of the tables a DDL statement changes, None
+    when they cannot be told, e.g. CREATE VIEW.
+    """
+    listed = DDL_TABLE_LIST_RE.match(query)
+    if listed:
+        names = re.findall(_NAME, re.sub(r"\bTO\b", ",", listed.group(1), flags=re.IGNORECASE))
+    else:
+        names = [m.group(1) for regex in DDL_TABLE_RES for m in [regex.search(query)] if m]
+    return [_bare_name(name) for name in names] or None
+
+# session variables set on loading connections by fast_load, reset to DEFAULT on checkin
+FAST_LOAD_SETTINGS = ("unique_checks", "foreign_key_checks")
+# set by no_binlog: the loaded rows are not written to the binary log, replicas do not get them
+NO_BINLOG_SETTINGS = ("sql_log_bin",)
+
+
 class MyMaria:
-    def __init__(self, verbose: bool = False, config_file: str = "", conf: str = "default"):
+    # insert engines by name, each is a method (chunk, insert_table, columns, dtype, chunksize)
+    INSERT_ENGINES = {
+        "to_sql": "_insert_chunk_to_sql",
+        "executemany": "_insert_chunk_executemany",
+        "load_data": "_insert_chunk_load_data",
+    }
+    # how temp_table rows reach the table, see _merge_temp_table
+    MERGE_MODES = ("ignore", "upsert", "replace", "swap")
+
+    def __init__(self, verbose: bool = False, config_file: str = "", conf: str = "default",
+                 schema_ttl: Optional[float] = None, metrics: Union[Callable, list, None] = None,
+                 config: Optional[dict] = None, query_cache: Optional[QueryCache] = None):
         # Use environment variable for default config file location
         self.verbose = verbose
-        self.conn = None
-        self.cursor = None
-        self.engine = None
-        if not config_file:
-            self.config_file = os.path.join(os.path.expanduser("~"), ".config", "mymaria.ini")
-        else:
-            self.config_file = config_file
+        self.metrics = as_sinks(metrics)  # sinks of timed events, see instrument.py
+        self.schema_ttl = schema_ttl  # seconds cached table metadata is trusted, None for no expiry
+        self._schema_cache: dict = {}
+        self._schema_lock = threading.Lock()  # shared with the cache by worker()
+        self.query_cache = query_cache  # results of query_df, see cache.py
+        # connections are opened on first use, see the conn, cursor and engine properties
+        self._conn = None
+        self._cursor = None
+        self._engine = None
+        self._engine_owner: Optional["MyMaria"] = None  # set on worker(), whose engine pool is shared
+        self._fast_load: Optional[tuple] = None  # (settings, refused settings) while a fast_load runs
+        self.pipeline_stats: dict = {}  # per stage busy/idle seconds of the last pipelined load
+        self.type_report: list = []  # column type decisions of the last table created
+        self.config_file = config_file
         self.conf = conf
-        self.load_config()
-        self.connect()
+        with self._timed("config"):
+            self.load_config(config)
 
     def __str__(self) -> str:
         return "MyMaria:" + self.conf
@@ -40,59 +122,180 @@ class MyMaria:
         self.verb("MyMaria object is being destroyed. Attempting to close connections.")
         self.close()
 
-    def load_config(self):
-        """Loads database connection parameters from a config file."""
-        config = configparser.ConfigParser()
-        try:
-            config.read_file(open(self.config_file))
-            db_config = config[self.conf]
-            self.host = db_config.get('host', 'localhost')  # Default to localhost if not found
-            self.port = db_config.getint('port', 3306)  # Default to 3306 if not found
-            self.user = db_config.get('user', 'none')
-            self.password = db_config.get('password', 'none')
-            self.database = db_config.get('database', self.conf)
-        except FileNotFoundError as e:
-            warn(f"Configuration file '{self.config_file}' not found: {e}")
-            sys.exit(11)
-        except KeyError as e:
-            warn(f"Configuration key '{e}' not found in '{self.config_file}'")
-            sys.exit(11)
-        except configparser.Error as e:    
-            raise ValueError(f"Error loading '{self.database}'config from {self.config_file}: {e}")
+    def load_config(self, config: Optional[dict] = None):
+        """
+        Loads database connection parameters from a config file,
+        or from config, a dict as returned by config.read_config.
+        """
+        if config is None:
+            config = read_config(self.config_file, self.conf)
+        self.host = config["host"]
+        self.port = config["port"]
+        self.user = config["user"]
+        self.password = config["password"]
+        self.database = config["database"]
+        self.local_infile = config["local_infile"]
+        self.pool_size = config["pool_size"]
 
     def verb(self, *a):
         if self.verbose:
             warn(*a)
 
+    def _timed(self, event: str, **fields):
+        """
+        Time a block as an event for the metrics sinks. The block may add
+        fields, e.g. rows and bytes, to the dict returned by the context.
+        Without sinks this returns a shared no-op context.
+        """
+        if self.metrics is None:
+            return NULL_TIMER
+        return Timer(self.metrics, event, fields)
+
+    def _emit(self, event: dict):
+        """Send an event that was not timed with _timed to the metrics sinks."""
+        if self.metrics is None:
+            return
+        event.setdefault("ts", time.time())
+        for sink in self.metrics:
+            sink(event)
+
+    def _chunk_fields(self, chunk) -> dict:
+        """rows, bytes and chunk index of a chunk for metrics events"""
+        if self.metrics is None:
+            return {}
+        meta = chunk.attrs.get(CHUNK_META)
+        return {"rows": len(chunk), "bytes": int(chunk.memory_usage(index=False).sum()),
+                "chunk": meta[0] if meta else None}
+
+    @staticmethod
+    def _until(chunks, done: Callable[[], bool]):
+        """Iterate chunks, stopping without reading further once done() is true after a chunk."""
+        for chunk in chunks:
+            yield chunk
+            if done():
+                return
+
+    def _timed_reader(self, reader, table_name):
+        """Iterate a chunk reader, timing each read as a 'read' event."""
+        it = iter(reader)
+        while True:
+            with self._timed("read", table=table_name) as event:
+                chunk = next(it, None)
+                if chunk is not None:
+                    event.update(self._chunk_fields(chunk))
+            if chunk is None:
+                return
+            yield chunk
+
+    @property
+    def engine(self):
+        """SQLAlchemy engine, created on first use."""
+        if self._engine is None:
+            if self._engine_owner is not None:
+                self._engine = self._engine_owner.engine
+            else:
+                self._engine = self._create_engine(self.pool_size)
+        return self._engine
+
+    @property
+    def conn(self):
+        """Connection for exec and queries, checked out of the engine pool on first use."""
+        if self._conn is None:
+            self.connect()
+        return self._conn
+
+    @property
+    def cursor(self):
+        if self._cursor is None:
+            self._cursor = self.conn.cursor()
+        return self._cursor
+
     def connect(self):
         """Establishes a database connection."""
         try:
-            conn = mariadb.connect(
-                host=self.host,
-                port=self.port,
-                user=self.user,
-                password=self.password,
-                database=self.database)
-            self.conn = conn
-            self.cursor = self.conn.cursor()
-            self.engine = sqlalchemy.create_engine(
-                f"mariadb+mariadbconnector://{self.user}:{self.password}@{self.host}/{self.database}")
-
-        except mariadb.Error as e:
+            with self._timed("connect"):
+                self._conn = self.engine.raw_connection()
+        except (SQLAlchemyError, mariadb.Error) as e:
             raise ValueError(f"Error connecting to the database: {e}")
 
+    def _create_engine(self, pool_size: int):
+        """Create the SQLAlchemy engine, its pool is shared by all loader threads."""
+        url = sqlalchemy.engine.URL.create(
+            "mariadb+mariadbconnector",
+            username=self.user,
+            password=self.password,
+            host=self.host,
+            port=self.port,
+            database=self.database)
+        return sqlalchemy.create_engine(
+            url,
+            pool_size=pool_size,
+            connect_args={"local_infile": self.local_infile})
+
+    def _ensure_pool_size(self, workers: int):
+        """Grow the engine pool so each worker thread can hold its own connection."""
+        if workers > self.pool_size:
+            self.verb(f"Resizing connection pool from {self.pool_size} to {workers}")
+            self.pool_size = workers
+            if self._engine is not None:
+                self.close()
+
+    @contextmanager
+    def _raw_connection(self):
+        """
+        Check out a mariadb connection from the engine pool.
+
+        Commits when the block succeeds, rolls back on error,
+        and always returns the connection to the pool.
+        """
+        conn = self.engine.raw_connection()
+        try:
+            with self._load_settings(conn):
+                try:
+                    yield conn
+                    with self._timed("commit"):
+                        conn.commit()
+                except BaseException:
+                    conn.rollback()
+                    raise
+        finally:
+            conn.close()
+
     def close(self):
-        """Closes the database connection."""
-        if self.conn:
-            self.cursor.close()
-            self.conn.close()
+        """Closes the database connection, the next use opens a new one."""
+        if self._conn is not None:
+            if self._cursor is not None:
+                self._cursor.close()
+            self._conn.close()
+            self._conn = None
+            self._cursor = None
             if self.verbose:
                 warn("Database connection closed.")
-        if self.engine:
-            self.engine.dispose()
+        if self._engine is not None and self._engine_owner is not None:
+            self._engine = None  # the owner disposes the shared engine
+        elif self._engine is not None:
+            self._engine.dispose()
+            self._engine = None
             if self.verbose:
                 warn("SQLAlchemy engine disposed")
 
+    def worker(self) -> "MyMaria":
+        """
+        A MyMaria for another thread: it shares this one's config, engine pool,
+        schema cache, metrics and query cache, and opens its own exec connection.
+        Closing it leaves the pool to this object.
+        """
+        config = {"host": self.host, "port": self.port, "user": self.user, "password": self.password,
+                  "database": self.database, "local_infile": self.local_infile, "pool_size": self.pool_size}
+        db = MyMaria(verbose=self.verbose, config_file=self.config_file, conf=self.conf,
+                     schema_ttl=self.schema_ttl, metrics=self.metrics, config=config,
+                     query_cache=self.query_cache)
+        self.engine  # create the shared engine now, not concurrently from the workers
+        db._engine_owner = self
+        db._schema_cache = self._schema_cache
+        db._schema_lock = self._schema_lock
+        return db
+
     def exec(self, query):
         # execute simple direct sql
         if self.verbose:
@@ -100,45 +303,361 @@ class MyMaria:
             warn(query)
         self.cursor.execute(query)
         self.conn.commit()
+        if DDL_RE.match(query):
+            tables = ddl_tables(query)
+            if tables is None:
+                self.refresh_schema()
+            else:
+                for table_name in tables:
+                    self.refresh_schema(table_name)
+
+    def _try_exec(self, query) -> bool:
+        """exec, warning instead of raising when the server refuses the statement"""
+        try:
+            self.exec(query)
+            return True
+        except mariadb.Error as e:
+            warn(f"mymaria: '{query}' failed: {e}")
+            return False
+
+    def _watermark(self, table_name: str, column: str):
+        """MAX(column) of table_name, None when the table is empty"""
+        with self._timed("watermark", table=table_name):
+            self.cursor.execute(f"SELECT MAX(`{column}`) FROM {table_name}")
+            row = self.cursor.fetchone()
+            self.conn.commit()  # end the read, later statements see current data
+        return row[0] if row else None
+
+    def _server_variable(self, name: str):
+        """Value of the server variable @@name, None when it cannot be read"""
+        try:
+            self.cursor.execute(f"SELECT @@{name}")
+            row = self.cursor.fetchone()
+            return row[0] if row else None
+        except mariadb.Error as e:
+            self.verb(f"mymaria: cannot read @@{name}: {e}")
+            return None
+
+    @contextmanager
+    def _fast_load_session(self, settings: tuple = FAST_LOAD_SETTINGS):
+        """
+        Turn off the session variables of settings, e.g. unique and foreign
+        key checks, on the connections this object checks out for inserts
+        while the block runs (see _load_settings), and reset them to the
+        server defaults before each returns to the pool. Other MyMaria objects
+        sharing the engine, e.g. worker() threads of AsyncMyMaria, keep the
+        server settings. A setting the server refuses (sql_log_bin needs the
+        SUPER privilege) is reported once and skipped.
+        The connection of exec, used for DDL and the temp table merge,
+        keeps the server settings.
+        """
+        self._fast_load = (settings, set())
+        try:
+            yield
+        finally:
+            self._fast_load = None
+
+    @contextmanager
+    def _load_settings(self, dbapi_conn):
+        """The fast_load settings on a connection checked out for a load, while the block runs."""
+        if self._fast_load is None:
+            yield
+            return
+        settings, refused = self._fast_load
+        self._set_session(dbapi_conn, settings, "0", refused)
+        try:
+            yield
+        finally:
+            self._set_session(dbapi_conn, settings, "DEFAULT", refused)
+
+    @staticmethod
+    def _set_session(dbapi_conn, settings: tuple, value: str, refused: set):
+        cursor = dbapi_conn.cursor()
+        try:
+            for name in settings:
+                if name in refused:
+                    continue
+                try:
+                    cursor.execute(f"SET SESSION {name} = {value}")
+                except mariadb.Error as e:
+                    refused.add(name)
+                    warn(f"fast_load: cannot set {name}: {e}")
+        finally:
+            cursor.close()
+
+    def _iter_rows(self, query, params=None, batch_size: int = 10000):
+        """
+        Run a query on an unbuffered (server side) cursor and yield rows in batches.
+
+        The first item is the cursor description, one tuple per column starting
+        with its name and type code, then lists of up to batch_size row tuples,
+        so memory use does not grow with the result.
+        """
+        with self._raw_connection() as conn:
+            cursor = conn.cursor(buffered=False)
+            try:
+                cursor.execute(query, params or ())
+                yield list(cursor.description)
+                while True:
+                    rows = cursor.fetchmany(batch_size)
+                    if not rows:
+                        break
+                    yield rows
+            finally:
+                cursor.close()
+
+    def export_query(self, query: str, dest: str, format: Optional[str] = None,
+                     params=None, batch_size: int = 10000) -> int:
+        """
+        Stream the result of a query to a file with constant memory.
+
+        Args:
+            query (str): select statement, or a table name to export the whole table
+            dest (str): output file, "-" for stdout
+            format (str, optional): "csv", "csv.gz" or "parquet" (needs pyarrow),
+            taken from the extension of dest when not given.
+            params: query parameters
+            batch_size (int): rows fetched from the server at a time
+        Returns:
+            number of rows written
+        """
+        format = format_for(dest, format)
+        if re.fullmatch(r"[\w.`]+", query.strip()):
+            query = f"SELECT * FROM {query.strip()}"
+        self.verb(f"Exporting '{query}' to '{dest}' as {format}")
+
+        start = time.perf_counter()
+        count = 0
+        writer = open_writer(dest, format)
+        try:
+            batches = self._iter_rows(query, params, batch_size)
+            description = next(batches)
+            writer.header([col[0] for col in description], description)
+            for rows in batches:
+                writer.write(rows)
+                count += len(rows)
+                self.verb(f"Exported {count} rows")
+        finally:
+            writer.close()
+
+        if self.verbose:
+            seconds = time.perf_counter() - start
+            rate = count / seconds if seconds else 0.0
+            peak = peak_rss_mb()
+            peak_text = f", peak RSS {peak:.1f} MB" if peak is not None else ""
+            warn(f"Exported {count} rows in {seconds:.2f}s ({rate:,.0f} rows/sec){peak_text}")
+        return count
+
+    def query(self, sql: str, params=None, chunksize: int = 10000):
+        """
+        Run a query and yield its result as DataFrames of up to chunksize rows.
+
+        Rows are fetched from an unbuffered (server side) cursor, so memory use
+        does not grow with the result; the pooled connection is held until the
+        generator is exhausted or closed.
+
+        Args:
+            sql (str): select statement, with ? placeholders for params
+            params: query parameters
+            chunksize (int): rows per DataFrame
+        """
+        batches = self._iter_rows(sql, params, chunksize)
+        names = [col[0] for col in next(batches)]
+        for rows in batches:
+            yield self._frame(names, rows)
+
+    def query_df(self, sql: str, params=None, use_cache: bool = True) -> pd.DataFrame:
+        """
+        Run a query and return the whole result as one DataFrame.
+
+        With a query_cache on this object the result is kept, keyed on sql and
+        params, and repeated calls are served without a round trip; use_cache=False
+        reads from the server and refreshes the entry.
+
+        Args:
+            sql (str): select statement, with ? placeholders for params
+            params: query parameters
+            use_cache (bool): serve from query_cache when it holds the result
+        """
+        cache = self.query_cache
+        key = QueryCache.key(sql, params)
+        if cache is not None and use_cache:
+            df = cache.get(key)
+            if df is not None:
+                return df
+        with self._timed("query") as event:
+            batches = self._iter_rows(sql, params)
+            names = [col[0] for col in next(batches)]
+            rows: list = []
+            for batch in batches:
+                rows.extend(batch)
+            df = self._frame(names, rows)
+            event["rows"] = len(df)
+        if cache is not None:
+            cache.put(key, df)
+        return df
+
+    @staticmethod
+    def _frame(names: list, rows: list) -> pd.DataFrame:
+        """DataFrame of row tuples, built column by column without per-row dicts."""
+        if not rows:
+            return pd.DataFrame(columns=names)
+        df = pd.DataFrame({i: pd.Series(values) for i, values in enumerate(zip(*rows))})
+        df.columns = names  # names may repeat, e.g. joined id columns
+        return df
+
+    def table_info(self, table_name: str) -> dict:
+        """
+        Table metadata, cached per table until invalidated or older than schema_ttl.
+
+        Args:
+            table_name (str): table to describe
+        Returns:
+            dict with keys
+              exists (bool), columns (list of names in table order),
+              types ({ colname => sqlalchemy type }), primary_key (list of names),
+              unique (list of column name lists of unique keys)
+        """
+        info = self._schema_cache.get(table_name)
+        if info is not None:
+            if self.schema_ttl is None or time.monotonic() - info['loaded'] < self.schema_ttl:
+                return info
+
+        with self._timed("schema", table=table_name):
+            inspector = sqlalchemy.inspect(self.engine)
+            info = {'exists': inspector.has_table(table_name), 'columns': [], 'types': {},
+                    'primary_key': [], 'unique': [], 'loaded': time.monotonic()}
+            if info['exists']:
+                for column in inspector.get_columns(table_name):
+                    info['columns'].append(column['name'])
+                    info['types'][column['name']] = column['type']
+                info['primary_key'] = inspector.get_pk_constraint(table_name).get('constrained_columns') or []
+                info['unique'] = [uc['column_names'] for uc in inspector.get_unique_constraints(table_name)]
+        with self._schema_lock:
+            self._schema_cache[table_name] = info
+        return info
+
+    def partition_info(self, table_name: str) -> Optional[Partitioning]:
+        """
+        Partitioning of a table, as created by create_table_from_df with a
+        partition spec, None for other or no partitioning. Kept with the
+        cached table metadata.
+        """
+        info = self.table_info(table_name)
+        if not info['exists']:
+            return None
+        if 'partitioning' not in info:
+            try:
+                self.cursor.execute(
+                    "SELECT PARTITION_METHOD, PARTITION_EXPRESSION, PARTITION_NAME "
+                    "FROM INFORMATION_SCHEMA.PARTITIONS WHERE TABLE_SCHEMA = DATABASE() "
+                    "AND TABLE_NAME = ? AND PARTITION_NAME IS NOT NULL ORDER BY PARTITION_ORDINAL_POSITION",
+                    (table_name,))
+                rows = self.cursor.fetchall()
+                self.conn.commit()
+            except mariadb.Error as e:
+                self.verb(f"mymaria: cannot read the partitions of '{table_name}': {e}")
+                rows = []
+            info['partitioning'] = Partitioning.from_server(rows)
+        return info['partitioning']
+
+    def refresh_schema(self, table_name: Optional[str] = None):
+        """
+        Drop cached table metadata, for one table or all tables. A table
+        name may be quoted with backticks or qualified with the database.
+        """
+        with self._schema_lock:  # workers, e.g. AsyncMyMaria's threads, fill the same cache
+            if table_name is None:
+                self._schema_cache.clear()
+                return
+            name = _bare_name(table_name)
+            for cached in list(self._schema_cache):
+                if _bare_name(cached) == name:
+                    self._schema_cache.pop(cached, None)
 
     def create_table_from_csv(
-        self, csv_filepath: str, table_name: str,
+        self, csv_filepath: Union[str, IO], table_name: str,
         transform: Optional[Callable[[pd.DataFrame], pd.DataFrame]] = None,  # Correct type hint
+        infer_rows: int = 10000,
+        use_enum: bool = False,
     ):
         """
         Creates a new table in the database based on the structure of a CSV file.
 
         Args:
-            csv_filepath (str): The path to the CSV file.
+            csv_filepath (str): The path to the CSV file, may be compressed, or a stream.
             table_name (str): The name of the table to create.
+            infer_rows (int): rows read to infer column types.
+            use_enum (bool): create ENUM columns for low-cardinality strings.
         """
-        df = pd.read_csv(csv_filepath, nrows=10)  # Read a few rows to infer types
-        return self.create_table_from_df(df, table_name, transform=transform)
+        with open_input(csv_filepath) as fh:  # compressed files are decompressed as read
+            df = pd.read_csv(fh, nrows=infer_rows)  # Read rows to infer types
+        return self.create_table_from_df(df, table_name, transform=transform, use_enum=use_enum,
+                                         sample=len(df) >= infer_rows)
 
 
     def create_table_from_df(
         self, df: pd.DataFrame, table_name: str,
         transform: Optional[Callable[[pd.DataFrame], pd.DataFrame]] = None,  # Correct type hint
+        use_enum: bool = False,
+        partition: Union[str, Partitioning, None] = None,
+        primary_key: Optional[list] = None,
+        indexes: Optional[list] = None,
+        sample: bool = False,
     ):
         """
         Creates a new table in the database based on the structure of a DataFrame.
 
+        Column types are the narrowest holding every value of df,
+        the decisions are kept in self.type_report. When df is only the
+        start of the data (sample), types leave room for larger values.
+
         Args:
             df (pd.DataFrame): The path to the CSV file.
             table_name (str): The name of the table to create.
+            use_enum (bool): create ENUM columns for low-cardinality strings.
+            partition (str or Partitioning, optional): "day:COLUMN" or "month:COLUMN"
+            partitions by RANGE COLUMNS, one partition per day or month of the date
+            or datetime column, created for the days or months in df plus a pmax
+            partition that later loads split; "hash:COLUMN:N" by KEY into N partitions.
+            primary_key (list, optional): primary key columns, must include the
+            partition column.
+            indexes (list, optional): secondary indexes, each a column or a list of columns.
+            sample (bool): df holds the first rows of a longer input: integers get at
+            least INT, DECIMAL more digits, strings at least VARCHAR(255), no ENUM.
         """
         if transform:
             df = transform(df)
+        if isinstance(partition, str):
+            partition = Partitioning.parse(partition)
+        primary_key = list(primary_key or [])
+        indexes = [[index] if isinstance(index, str) else list(index) for index in indexes or []]
+        for col in primary_key + sum(indexes, []) + ([partition.column] if partition else []):
+            if col not in df.columns:
+                raise ValueError(f"Key column '{col}' is not in the data")
+        if partition and primary_key and partition.column not in primary_key:
+            # MariaDB requires the partition column in every unique key
+            raise ValueError(f"The primary key of a table partitioned on '{partition.column}' must include it")
 
         columns: list = []
-        dtype: dict = self._init_dtype(df, table_name)
+        dtype: dict = self._init_dtype(df, table_name, use_enum=use_enum, sample=sample)
         for col_name, dtype in dtype.items():
-            columns.append(sqlalchemy.Column(col_name, dtype))
-            
+            if col_name in primary_key:
+                columns.append(sqlalchemy.Column(col_name, dtype, primary_key=True, autoincrement=False))
+            else:
+                columns.append(sqlalchemy.Column(col_name, dtype))
+        for index in indexes:
+            columns.append(sqlalchemy.Index(f"ix_{table_name}_{'_'.join(index)}", *index))
+        options: dict = {}
+        if partition:
+            starts = partition.buckets(df[partition.column]).dropna() if partition.ranged else ()
+            options = partition.table_options(starts)
+
         try:
             metadata = sqlalchemy.MetaData()
-            table = sqlalchemy.Table(table_name, metadata, *columns)
+            table = sqlalchemy.Table(table_name, metadata, *columns, **options)
             metadata.create_all(self.engine)
+            self.refresh_schema(table_name)
             self.verb(f"Table '{table_name}' created successfully.")
 
         except Exception as e:
@@ -147,50 +666,312 @@ class MyMaria:
 
     def load_data_to_mariadb(
         self,
-        data: Union[str, pd.DataFrame],  # Accept either a filepath or a DataFrame
+        data: Union[str, IO, pd.DataFrame],  # Accept a filepath, a stream or a DataFrame
         table_name: str,
         temp_table: str = None,
         create_table: bool = False,
-        chunksize: int = 10000,
+        chunksize: Union[int, str] = 10000,
         transform: Optional[Callable[[pd.DataFrame], pd.DataFrame]] = None,  # Correct type hint
+        method: str = "to_sql",
+        insert_engine: Union[str, Callable, None] = None,
+        workers: int = 1,
+        pipeline: bool = False,
+        queue_depth: int = 2,
+        infer_rows: Optional[int] = None,
+        use_enum: bool = False,
+        checkpoint: Optional[str] = None,
+        resume: bool = False,
+        csv_parser: str = "pandas",
+        prune_columns: bool = False,
+        max_chunk_bytes: Optional[int] = None,
+        fast_load: bool = False,
+        no_binlog: bool = False,
+        staging_engine: Optional[str] = None,
+        merge: str = "ignore",
+        merge_batch: Optional[int] = None,
+        merge_key: Optional[str] = None,
+        update_columns: Optional[list] = None,
+        on_error: str = "abort",
+        reject_file: Optional[str] = None,
+        max_errors: Optional[int] = 1000,
+        watermark: Optional[str] = None,
+        watermark_order: Optional[str] = None,
+        transform_processes: int = 1,
+        partition: Union[str, Partitioning, None] = None,
+        primary_key: Optional[list] = None,
+        indexes: Optional[list] = None,
+        reload_partition: Optional[str] = None,
     ):
         """
         Loads data into a MariaDB table, from either a CSV file or a pandas DataFrame.
 
         Args:
-            data: Either a file path (str) to a CSV or a pandas DataFrame
+            data: Either a file path (str) to a CSV, "-" for stdin, a binary or text
+            stream of CSV, or a pandas DataFrame. Files and streams compressed with
+            gzip, bz2, xz or zstd (needs zstandard) are recognized by extension or
+            their first bytes and decompressed while the chunks are read.
+            The first chunk read is used to create the table and infer types, and is
+            then inserted, so the input is only read once and may be a stream.
             table_name (str): The name of the table to load the data into.
             temp_table (str): use temp table to stage insert data.
-            chunksize (int): The number of rows to load at a time (for CSV).
+            chunksize (int or "auto"): The number of rows to load at a time (for CSV).
+            "auto" tunes it while loading: starting at 1000 rows, the size doubles
+            while the measured insert rate (rows/sec) improves and settles on the
+            fastest, never above half the server's max_allowed_packet of encoded rows
+            nor max_chunk_bytes (default 64 MB) of memory. DataFrames are sliced
+            the same way. The chosen sizes are reported in verbose output.
             transform (Callable[[pd.DataFrame], pd.DataFrame], optional): A function to transform
             each DataFrame chunk before loading it into the database.
             Defaults to None.
+            method (str): "to_sql" inserts with DataFrame.to_sql,
+            "load_data" streams the data with LOAD DATA LOCAL INFILE.
+            Without a transform, a CSV file is sent to the server as is.
+            insert_engine (str or Callable, optional): engine inserting each chunk,
+            one of INSERT_ENGINES ("to_sql", "executemany", "load_data") or a callable
+            (db, chunk, insert_table, columns, dtype) that inserts and commits the chunk.
+            Overrides method when given.
+            workers (int): number of threads inserting chunks concurrently,
+            each with its own connection from the engine pool. Chunks commit
+            independently and in no particular order.
+            pipeline (bool): read, transform and insert CSV chunks in overlapping
+            stages, so parsing runs while the previous chunk is written.
+            Busy/idle seconds per stage are kept in self.pipeline_stats.
+            queue_depth (int): chunks buffered between pipeline stages.
+            infer_rows (int, optional): rows scanned to infer types when creating
+            the table, whole chunks are read until this many rows. Defaults to
+            the first two chunks. Unless that is the whole input, the types leave
+            room for larger values: INT or BIGINT, wider DECIMAL, VARCHAR(255) or more.
+            use_enum (bool): create ENUM columns for low-cardinality strings.
+            checkpoint (str, optional): file recording the byte offset, row count and
+            chunk index committed so far, updated after each committed chunk and
+            removed when the load completes. CSV files only.
+            resume (bool): continue from the checkpoint, seeking straight to the first
+            uncommitted chunk. Rows already staged in temp_table are kept, so the
+            finished load still merges in one statement.
+            csv_parser (str): "pandas" parses csv with the pandas C parser into NumPy
+            columns, "arrow" with the multithreaded pyarrow csv reader into Arrow-backed
+            columns, lighter for wide string-heavy files. Parquet (.parquet, .pq) and
+            feather (.feather, .arrow) files are always read with pyarrow, a row group
+            or record batch at a time, without text parsing.
+            prune_columns (bool): when the table exists, read only its columns plus
+            transform.input_columns (a list set on the transform function), with
+            narrow dtypes from the table's SQL types: nullable ints of the column's
+            width, float32, category and (Arrow) strings. Transform inputs keep the
+            inferred dtypes. A transform without input_columns disables pruning.
+            max_chunk_bytes (int, optional): target memory of a chunk; the rows per
+            chunk adapt to the measured bytes per row, at most chunksize.
+            fast_load (bool): turn off unique_checks and foreign_key_checks on the
+            loading connections, and DISABLE KEYS on temp_table until the chunks are
+            in. Everything is restored when the load ends, also on error.
+            Without temp_table the data must be free of duplicate keys; with it the
+            merge runs with the server's checks and INSERT IGNORE drops duplicates.
+            no_binlog (bool): turn off sql_log_bin on the loading connections (needs
+            the SUPER privilege), so the inserted rows are not written to the binary
+            log and never reach replicas. The temp_table merge is still logged; with
+            statement-based replication it then finds an empty staging table on the
+            replicas. Only for servers without replicas, or staging with row-based
+            replication.
+            staging_engine (str, optional): storage engine of a new temp_table, e.g.
+            "Aria" or "MEMORY". Falls back to the server default when refused, e.g.
+            MEMORY with TEXT columns.
+            merge (str): how temp_table rows reach the table: "ignore" keeps existing
+            rows (INSERT IGNORE), "upsert" updates them (ON DUPLICATE KEY UPDATE),
+            "replace" deletes and re-inserts them (REPLACE), "swap" replaces the whole
+            table with temp_table in one atomic RENAME TABLE.
+            merge_batch (int, optional): merge in slices of this many rows by ranges of
+            merge_key, committing each, so locks and undo stay small.
+            merge_key (str, optional): column slicing batched merges, defaults to the
+            first primary key column of the table.
+            update_columns (list, optional): columns updated by "upsert", defaults to
+            all columns outside the primary key.
+            on_error (str): "abort" stops the load at the first chunk the server refuses,
+            "bisect" splits a chunk refused for its data (a data or integrity error) in
+            halves until the bad rows are isolated, inserts the others and rejects the
+            bad rows, so one malformed row costs a few extra inserts instead of the load;
+            other errors still stop it. Applies to chunked loads, not to a
+            csv file sent as is with LOAD DATA.
+            reject_file (str, optional): csv file the rejected rows are appended to, with
+            their error message in a reject_error column.
+            max_errors (int, optional): rejected rows tolerated before the load aborts,
+            None for no limit.
+            watermark (str, optional): incremental load on this column (after the
+            transform), e.g. a timestamp: MAX(watermark) of the table is read once and
+            only rows with a greater value are inserted, filtered per chunk before they
+            are sent. Rows equal to the maximum are taken as loaded.
+            watermark_order (str, optional): "asc" or "desc" when the input is sorted on
+            watermark; with "desc" (newest first) reading stops at the first chunk
+            holding an already loaded row, with "asc" filtering stops once rows are new.
+            transform_processes (int): run the transform on this many processes, for
+            CPU-bound transforms of csv, parquet or feather chunks. Chunks are shipped
+            as Arrow IPC streams in shared memory (pickled without pyarrow) and come back
+            in order; a failing transform stops the load naming the chunk index. The
+            transform must be picklable where processes are spawned rather than forked.
+            partition, primary_key, indexes: partitioning and keys of a table created
+            by the load, see create_table_from_df. Loads into a table partitioned by day
+            or month add the partitions of new days or months by splitting pmax, and
+            sort each chunk by partition so its rows reach one partition after another.
+            reload_partition (str, optional): replace the data of the days or months
+            loaded instead of adding to them, without a DELETE. "truncate" empties each
+            partition (TRUNCATE PARTITION) before its first rows are inserted, or with
+            temp_table right before the merge, once all rows are staged; "exchange"
+            loads one day or month into temp_table, an unpartitioned copy of the table,
+            and swaps it with the partition (EXCHANGE PARTITION), so readers see the old
+            rows until the new ones are complete. Days or months must have partitions
+            of their own.
+
+        Returns:
+            int: rows loaded, rejected rows excluded, None when the load failed (the error is printed).
+        Raises:
+            InsertError: a chunk the server refused stopped the load.
         """
+        insert_engine = insert_engine or method
+        if not callable(insert_engine) and insert_engine not in self.INSERT_ENGINES:
+            warn(f"mymaria.load_data_to_mariadb: Unknown insert engine '{insert_engine}', "
+                 f"use one of {list(self.INSERT_ENGINES)}")
+            return
+        if csv_parser not in ("pandas", "arrow"):
+            warn(f"mymaria.load_data_to_mariadb: Unknown csv_parser '{csv_parser}', use 'pandas' or 'arrow'")
+            return
+        if merge not in self.MERGE_MODES:
+            warn(f"mymaria.load_data_to_mariadb: Unknown merge '{merge}', use one of {list(self.MERGE_MODES)}")
+            return
+        if chunksize != "auto" and not (isinstance(chunksize, int) and chunksize > 0):
+            warn(f"mymaria.load_data_to_mariadb: chunksize must be a positive int or 'auto', not {chunksize!r}")
+            return
+        if on_error not in ("abort", "bisect"):
+            warn(f"mymaria.load_data_to_mariadb: Unknown on_error '{on_error}', use 'abort' or 'bisect'")
+            return
+        if watermark_order not in (None, "asc", "desc"):
+            warn(f"mymaria.load_data_to_mariadb: Unknown watermark_order '{watermark_order}', use 'asc' or 'desc'")
+            return
+        if reload_partition not in (None, "truncate", "exchange"):
+            warn(f"mymaria.load_data_to_mariadb: Unknown reload_partition '{reload_partition}', "
+                 "use 'truncate' or 'exchange'")
+            return
+        if reload_partition == "exchange" and not temp_table:
+            warn("mymaria.load_data_to_mariadb: reload_partition='exchange' needs a temp_table")
+            return
+        if reload_partition and resume:
+            warn("mymaria.load_data_to_mariadb: a partition reload cannot resume, it starts over")
+            return
+        if merge != "ignore" and not temp_table:
+            warn(f"mymaria.load_data_to_mariadb: merge='{merge}' needs a temp_table")
+            return
         if table_name is None:
             warn("mymaria.load_data_to_mariadb: No table name provided")
             return
         if data is None:
             warn("mymaria.load_data_to_mariadb: No data provided")
             return
+        if workers > 1:
+            self._ensure_pool_size(workers)
 
         insert_table = table_name
+        reader = None
+        chunk_source = None
+        progress = None
+        resuming = False
+        load_start = time.perf_counter()
+        loaded_rows = 0
+        fast = ExitStack()  # undoes fast_load and no_binlog, closed before the merge or when the load fails
+        input_fh = None  # decompressed csv stream read by pandas
+        rejects = None
+        since = None  # Watermark filter of an incremental load
+        transform_pool = None
+        parts = None  # range partitioning of the table, managed while loading
+        reloaded: list = []  # partitions the load has put rows in, for reload_partition
+        added: set = set()  # partitions created by the load, nothing to truncate
         try:
-            # Create a session
-            Session = sessionmaker(bind=self.engine)
-            session = Session()
+            def transformed(chunk):
+                meta = chunk.attrs.get(CHUNK_META)
+                if transform:
+                    with self._timed("transform", table=table_name, **self._chunk_fields(chunk)):
+                        chunk = transform(chunk)
+                if meta:
+                    chunk.attrs[CHUNK_META] = meta
+                return chunk
+
+            # Read the first chunk, it drives table creation and type inference
+            # and is then inserted, so the input is read only once.
+            columnar = columnar_format(data)
+            if columnar and checkpoint:
+                warn(f"Checkpoints are for csv files, loading '{data}' without one")
+                checkpoint = None
+            if chunksize == "auto":
+                sizer = AdaptiveChunkSizer(max_packet=self._server_variable("max_allowed_packet"),
+                                           max_bytes=max_chunk_bytes, log=self.verb)
+                chunk_engine = self._measured_engine(insert_engine, sizer)
+            else:
+                sizer = ChunkSizer(chunksize, max_chunk_bytes)
+                chunk_engine = insert_engine
+            if on_error == "bisect":
+                rejects = RejectLog(reject_file, max_errors)
+                chunk_engine = self._bisect_engine(chunk_engine, rejects)
+            read_columns = read_dtype = None  # columns read and their dtypes when pruning, None for all
+            read_kwargs: dict = {}
+            if prune_columns and (isinstance(data, str) or hasattr(data, "read")):
+                if transform is not None and not hasattr(transform, "input_columns"):
+                    warn("prune_columns: the transform has no input_columns, reading all columns")
+                elif self.table_info(table_name)["exists"]:
+                    read_columns, read_dtype = self._schema_read_options(table_name, transform)
+                    read_kwargs = {"usecols": lambda col: col in read_columns, "dtype": read_dtype}
+                    self.verb(f"Reading {len(read_columns)} columns, dtypes {read_dtype}")
+            if isinstance(data, str) or hasattr(data, "read"):
+                if checkpoint and isinstance(data, str) and data != "-":
+                    progress = Checkpoint(checkpoint, data, table_name, temp_table)
+                    resuming = resume and progress.load()
+                    if resume and not resuming:
+                        warn(f"No checkpoint for '{data}' in '{checkpoint}', loading from the start")
+                    if resuming:
+                        self.verb(f"Resuming at chunk {progress.chunk_index}, byte {progress.offset}, "
+                                  f"{progress.rows} rows committed")
+                    if csv_parser == "arrow":
+                        read_kwargs.update(engine="pyarrow", dtype_backend="pyarrow")
+                    reader = OffsetCsvReader(data, sizer.size, offset=progress.offset, index=progress.chunk_index,
+                                             skip=[span[:2] for span in progress.loaded], **read_kwargs)
+                elif columnar or csv_parser == "arrow":
+                    reader = ArrowReader.open(data, sizer.size, columnar, columns=read_columns, dtypes=read_dtype)
+                else:
+                    input_fh = open_input(data)
+                    reader = pd.read_csv(input_fh, chunksize=sizer.size, **read_kwargs)
+                chunk_source = sizer.chunks(reader) if sizer.adapts else reader
+                if watermark:
+                    chunk_source = self._until(chunk_source, lambda: since is not None and since.done)
+                if self.metrics is not None:
+                    chunk_source = self._timed_reader(chunk_source, table_name)
+                first = next(chunk_source, None)
+                if first is None:
+                    if not resuming:
+                        warn(f"No data found in '{data}'")
+                        return
+                    first = reader.empty_frame()  # everything was committed, only the merge is left
+            elif isinstance(data, pd.DataFrame):
+                first = data
+            else:
+                raise ValueError("Invalid data type. Must be a filepath (str) or a DataFrame.")
+            first = transformed(first)
+            head = [first]
 
             # Check if the table exists
-            inspector = sqlalchemy.inspect(self.engine)
-            if not inspector.has_table(table_name):
+            if not self.table_info(table_name)['exists']:
                 if create_table:
                     self.verb(f"Table '{table_name}' does not exist. Attempting to create it from data structure.")
-                    if isinstance(data, str):
-                       self.create_table_from_csv(data, table_name, transform=transform)
-                    elif isinstance(data, pd.DataFrame):
-                        self.create_table_from_df(data, table_name, transform=transform)
+                    # read ahead until infer_rows rows are available for type inference, and
+                    # at least one chunk past the first, to learn whether that is the whole input
+                    rows = len(first)
+                    scanned = reader is None  # a DataFrame is typed from all its rows
+                    while not scanned and (len(head) == 1 or rows < (infer_rows or 0)):
+                        chunk = next(chunk_source, None)
+                        if chunk is None:
+                            scanned = True
+                            break
+                        head.append(transformed(chunk))
+                        rows += len(head[-1])
+                    sample = head[0] if len(head) == 1 else pd.concat(head, ignore_index=True)
+                    self.create_table_from_df(sample, table_name, use_enum=use_enum, partition=partition,
+                                              primary_key=primary_key, indexes=indexes, sample=not scanned)
 
-                    inspector = sqlalchemy.inspect(self.engine)
-                    if not inspector.has_table(table_name):
+                    if not self.table_info(table_name)['exists']:
                         warn(f"Failed to create table '{table_name}'")
                         return
                 else:
@@ -199,134 +980,736 @@ class MyMaria:
 
             self.verb(f"Loading data into table '{table_name}'")
 
+            # Get table columns
+            columns = self.table_info(table_name)['columns']
+            if watermark:
+                if watermark not in columns:
+                    warn(f"Watermark column '{watermark}' is not in table '{table_name}'")
+                    return
+                since = Watermark(watermark, self._watermark(table_name, watermark), watermark_order)
+                self.verb(f"Loading rows with {watermark} > {since.mark}")
+            partitioning = self.partition_info(table_name)
+            if partitioning and partitioning.ranged:
+                parts = partitioning
+                self.verb(f"Table '{table_name}' is {parts}, {len(parts.existing)} partitions")
+            elif reload_partition:
+                warn(f"reload_partition needs a table partitioned by day or month, '{table_name}' is not")
+                return
+
+            def keep_columns(chunk):
+                # filter columns not in table
+                meta = chunk.attrs.get(CHUNK_META)
+                chunk = chunk[[col for col in chunk.columns if col in columns]]
+                if meta:
+                    chunk.attrs[CHUNK_META] = meta
+                return chunk
+
+            def new_rows(chunk):
+                return since.filter(chunk) if since else chunk
+
+            def by_partition(chunk):
+                """Add the partitions of new days or months, note reloaded ones, sort by partition"""
+                if parts is None or chunk.empty or parts.column not in chunk:
+                    return chunk
+                buckets = parts.buckets(chunk[parts.column])
+                starts = list(buckets.dropna().unique())
+                new, covered = parts.missing(starts)
+                if covered and reload_partition:
+                    raise ValueError(f"no partition of its own in '{table_name}' for {parts.name(covered[0])}")
+                if new:
+                    names = [parts.name(start) for start in new]
+                    with self._timed("partition", table=table_name, action="add", partitions=names):
+                        self.exec(parts.reorganize(table_name, new))
+                    parts.existing.update(names)
+                    added.update(names)
+                    self.verb(f"Added partitions {', '.join(names)} to '{table_name}'")
+                for name in sorted({parts.name(start) for start in starts} - set(reloaded)):
+                    reloaded.append(name)
+                    if reload_partition == "exchange" and len(reloaded) > 1:
+                        raise ValueError(f"an exchange reloads one partition, the data spans {reloaded}")
+                    if reload_partition == "truncate" and not temp_table and name not in added:
+                        self._truncate_partitions(table_name, [name])  # staged rows wait for the merge
+                if buckets.is_monotonic_increasing:
+                    return chunk
+                meta = chunk.attrs.get(CHUNK_META)
+                chunk = chunk.iloc[np.argsort(buckets.to_numpy(), kind="stable")]
+                if meta:
+                    chunk.attrs[CHUNK_META] = meta
+                return chunk
+
+            def prepare(chunk):
+                if transform_pool is None:  # else transformed by the pool
+                    chunk = transformed(chunk)
+                return by_partition(keep_columns(new_rows(chunk)))
+
+            def on_commit(chunk):
+                nonlocal loaded_rows
+                loaded_rows += len(chunk)
+                meta = chunk.attrs.get(CHUNK_META)
+                if progress and meta:
+                    progress.commit(*meta)
+
+            head = [by_partition(keep_columns(new_rows(chunk))) for chunk in head]
+            first = head[0]
+            dtype: dict = self._init_dtype(first, table_name)
+            head_chunks = len(head)
+            head = [chunk for chunk in head if not chunk.empty]
+
+            if reload_partition == "exchange":
+                # swapped with a partition, it needs the table's columns and keys, unpartitioned
+                self.exec(f"DROP TABLE IF EXISTS {temp_table}")
+                self.exec(f"CREATE TABLE {temp_table} LIKE {table_name}")
+                self.exec(f"ALTER TABLE {temp_table} REMOVE PARTITIONING")
+            elif temp_table and merge == "swap":
+                # the staging table becomes the table, it needs the same keys and engine: one left
+                # by another load may lack them, only a resumed load keeps its staged rows
+                if not resuming:
+                    self.exec(f"DROP TABLE IF EXISTS {temp_table}")
+                self.exec(f"CREATE TABLE IF NOT EXISTS {temp_table} LIKE {table_name}")
+            elif temp_table:
+                create_temp = f"CREATE TABLE IF NOT EXISTS {temp_table} as select * from {table_name} limit 0"
+                if not (staging_engine and self._try_exec(create_temp.replace(
+                        " as select", f" ENGINE={staging_engine} as select", 1))):
+                    self.exec(create_temp)
             if temp_table:
-                self.exec(f"CREATE TABLE IF NOT EXISTS {temp_table} as select * from {table_name} limit 0")
-                self.exec(f"DELETE FROM {temp_table} where 1=1")
+                if not resuming:
+                    self.exec(f"DELETE FROM {temp_table} where 1=1")
                 insert_table = temp_table
 
-            # Get table columns
-            columns = [col['name'] for col in inspector.get_columns(table_name)]
+            if fast_load or no_binlog:
+                settings = (FAST_LOAD_SETTINGS if fast_load else ()) + (NO_BINLOG_SETTINGS if no_binlog else ())
+                fast.enter_context(self._fast_load_session(settings))
+            if fast_load and temp_table:
+                if self._try_exec(f"ALTER TABLE {temp_table} DISABLE KEYS"):
+                    fast.callback(self._try_exec, f"ALTER TABLE {temp_table} ENABLE KEYS")
 
             # Load and process data
-            if isinstance(data, str):
-                self.verb(f"Loading data from '{data}' into table '{table_name}'")
-
-                # Infer data types from the first few rows of CSV
-                # also read into a small dataframe
-                sample_df = pd.read_csv(data, nrows=10)
-                if transform:
-                    sample_df = transform(sample_df)
-                dtype: dict = self._init_dtype(sample_df, table_name)
+            if (isinstance(data, str) and data != "-" and insert_engine == "load_data" and transform is None
+                    and progress is None and not columnar and since is None and parts is None):
+                # no transform, let the server read the csv file directly
+                reader.close()
+                reader = None
+                self.verb(f"Bulk loading '{data}' into table '{insert_table}'")
+                loaded_rows = self._load_data_infile(data, insert_table, columns)
 
+            elif reader is not None:
+                self.verb(f"Loading data from '{data}' into table '{table_name}'")
+                if transform is not None and transform_processes > 1:
+                    # transformed in worker processes, only the filters run here
+                    transform_pool = TransformPool(transform, transform_processes)
+                    chunk_source = transform_pool.map(chunk_source, start=head_chunks)
                 # Use pandas to read the CSV in chunks and load into the database
-                for chunk in pd.read_csv(data, chunksize=chunksize):
-                    if transform:
-                        chunk = transform(chunk)
-                    # filter columns not in table
-                    chunk = chunk[[col for col in chunk.columns if col in columns]]
-
-                    self._insert_chunk(chunk, insert_table, session, dtype, columns)
+                if pipeline:
+                    pipe = ChunkPipeline(chunk_source, prepare, queue_depth=queue_depth)
+                    stages = iter(pipe)
+                    try:
+                        self._insert_chunks(itertools.chain(head, stages), insert_table, dtype,
+                                            columns, insert_engine=chunk_engine, workers=workers,
+                                            on_commit=on_commit)
+                    finally:
+                        stages.close()  # stops the read and transform threads when an insert failed
+                        self.pipeline_stats = pipe.as_dict()
+                        self._emit({"event": "pipeline", "table": table_name, "stages": self.pipeline_stats})
+                        self.verb(f"Pipeline stages:\n{pipe.report()}")
+                else:
+                    chunks = itertools.chain(head, (prepare(chunk) for chunk in chunk_source))
+                    self._insert_chunks(chunks, insert_table, dtype, columns,
+                                        insert_engine=chunk_engine, workers=workers, on_commit=on_commit)
 
-            elif isinstance(data, pd.DataFrame):
-                self.verb(f"Loading data from DataFrame into table '{table_name}'")
-                if transform:
-                    data = transform(data)
-                # filter columns not in table
-                data = data[[col for col in data.columns if col in columns]]
-                dtype: dict = self._init_dtype(data, table_name) 
-                self._insert_chunk(data, insert_table, session, dtype, columns, chunksize=chunksize)
             else:
-                raise ValueError("Invalid data type. Must be a filepath (str) or a DataFrame.")
+                self.verb(f"Loading data from DataFrame into table '{table_name}'")
+                # committed chunksize rows at a time, as chunks read from a file
+                self._insert_chunks(sizer.frame_chunks(first), insert_table, dtype, columns,
+                                    insert_engine=chunk_engine, workers=workers, on_commit=on_commit)
 
             self.verb(f"Successfully loaded data into table '{insert_table}'")
-            if temp_table:
-                self.exec(f"INSERT IGNORE INTO {table_name} (SELECT * FROM {temp_table})")
+            if transform_pool:
+                self.verb(f"Transform pool: {transform_pool.report()}")
+                self._emit({"event": "transform_pool", "table": table_name, "chunks": transform_pool.chunks,
+                            "seconds": round(transform_pool.seconds, 6), "processes": transform_processes})
+            if since:
+                self.verb(f"Incremental load: {since.report()}")
+            if rejects and rejects.rows:
+                loaded_rows -= rejects.rows
+                warn(f"mymaria: {rejects.report()}")
+            if sizer.adapts and sizer.sizes:
+                self.verb(f"Chunk sizes: {sizer.report()}")
+            fast.close()
+            if reload_partition == "exchange":
+                self._exchange_partition(temp_table, table_name, reloaded)
+            elif temp_table:
+                if reload_partition == "truncate":
+                    # readers saw the old rows until now, and still do if the load failed
+                    self._truncate_partitions(table_name, [name for name in reloaded if name not in added])
+                self._merge_temp_table(temp_table, table_name, merge=merge, merge_batch=merge_batch,
+                                       merge_key=merge_key, update_columns=update_columns)
                 self.verb(f"Successfully loaded data from '{temp_table}' into table '{table_name}'")
+            if progress:
+                progress.remove()
+            if self.metrics is not None:
+                seconds = time.perf_counter() - load_start
+                self._emit({"event": "load", "table": table_name, "rows": loaded_rows,
+                            "seconds": round(seconds, 6),
+                            "rows_per_sec": round(loaded_rows / seconds, 1) if seconds else None})
+            return loaded_rows
+        except InsertError:
+            raise
         except FileNotFoundError:
             warn(f"Error: CSV file not found at '{data}'")
         except ValueError as ve:
             warn(f"Value Error: {ve}")
         except Exception as e:
             warn(f"An unexpected error occurred: {e}")
+        finally:
+            if isinstance(chunk_source, types.GeneratorType):
+                chunk_source.close()  # ends a transform pool's processes
+            fast.close()
+            if rejects is not None:
+                rejects.close()
+            if reader is not None:
+                reader.close()
+            if input_fh is not None:
+                input_fh.close()
+
+    def _schema_read_options(self, table_name: str, transform=None) -> tuple:
+        """
+        Columns to read and narrow pandas dtypes for input of an existing table:
+        its columns plus transform.input_columns, which keep inferred dtypes.
+        """
+        info = self.table_info(table_name)
+        inputs = set(getattr(transform, "input_columns", None) or ())
+        read_dtype = {}
+        for col, sql_type in info["types"].items():
+            dtype = None if col in inputs else pandas_dtype(sql_type)
+            if dtype:
+                read_dtype[col] = dtype
+        return set(info["columns"]) | inputs, read_dtype
+
+    def load_files(
+        self,
+        paths: Union[str, list],
+        table_name: str,
+        temp_table: str = None,
+        create_table: bool = False,
+        chunksize: Union[int, str] = 10000,
+        transform: Optional[Callable[[pd.DataFrame], pd.DataFrame]] = None,
+        processes: int = 1,
+        max_connections: int = 1,
+        **load_kwargs,
+    ) -> list:
+        """
+        Load many csv files into one table in one run, sharing the connection,
+        the schema cache and the table creation.
+
+        Files are parsed and transformed whole by a pool of processes, while
+        this process inserts the parsed files one at a time with load_data_to_mariadb.
+        The first file parsed creates the table when create_table is set; with
+        more files to come its column types leave room for larger values, as
+        for a sample of a csv file (see infer_rows of load_data_to_mariadb).
+
+        Args:
+            paths: a csv file, a glob pattern like "dir/*_chains.csv", or a list of them.
+            table_name, temp_table, create_table, chunksize: as for load_data_to_mariadb.
+            transform: applied to each file's DataFrame in the worker processes,
+            so it must be picklable (a module level function, not a lambda).
+            processes (int): processes parsing files, 1 parses in this process.
+            max_connections (int): connections inserting a file concurrently.
+            load_kwargs: passed on to load_data_to_mariadb, e.g. insert_engine or merge.
+
+        Returns:
+            list: one dict per file: file, rows, parse_seconds, seconds and error,
+            None when the file loaded. See files_report.
+        """
+        files = expand_paths(paths)
+        if not files:
+            warn(f"No files match {paths}")
+            return []
+        results = []
+        sampled = create_table and len(files) > 1  # the first file loaded types the table for all
+        for path, df, error, parse_seconds in self._parse_files(files, transform, processes):
+            start = time.perf_counter()
+            rows = None
+            with self._timed("file", table=table_name, file=path) as fields:
+                if error is None:
+                    self.verb(f"Loading '{path}', {len(df)} rows parsed in {parse_seconds:.3f}s")
+                    if sampled and not self.table_info(table_name)["exists"]:
+                        keys = {key: load_kwargs[key] for key in ("use_enum", "partition", "primary_key", "indexes")
+                                if key in load_kwargs}
+                        self.create_table_from_df(df, table_name, sample=True, **keys)
+                    sampled = False
+                    try:
+                        rows = self.load_data_to_mariadb(df, table_name, temp_table=temp_table,
+                                                         create_table=create_table, chunksize=chunksize,
+                                                         workers=max_connections, **load_kwargs)
+                    except InsertError as e:  # the other files may still load
+                        warn(str(e))
+                        rows = None
+                    if rows is None:
+                        error = "load failed"
+                    fields["rows"] = rows
+                else:
+                    warn(f"Error reading '{path}': {error}")
+            results.append({"file": path, "rows": rows, "parse_seconds": round(parse_seconds, 6),
+                            "seconds": round(parse_seconds + time.perf_counter() - start, 6),
+                            "error": None if error is None else str(error)})
+        return results
+
+    def _parse_files(self, files: list, transform, processes: int):
+        """Yield (path, DataFrame, error, parse seconds) in input order, at most 2 files per process ahead."""
+        if processes <= 1:
+            for path in files:
+                try:
+                    df, seconds = read_file(path, transform)
+                    yield path, df, None, seconds
+                except Exception as e:
+                    yield path, None, e, 0.0
+            return
+        with ProcessPoolExecutor(max_workers=processes) as pool:
+            # in input order, so a later file does not load first, e.g. moving a watermark past an earlier one
+            todo = iter(files)
+            pending = collections.deque((path, pool.submit(read_file, path, transform))
+                                        for path in itertools.islice(todo, 2 * processes))
+            while pending:
+                path, future = pending.popleft()
+                next_path = next(todo, None)
+                if next_path is not None:
+                    pending.append((next_path, pool.submit(read_file, next_path, transform)))
+                try:
+                    df, seconds = future.result()
+                    yield path, df, None, seconds
+                except Exception as e:
+                    yield path, None, e, 0.0
+
+    @staticmethod
+    def files_report(results: list, seconds: Optional[float] = None) -> str:
+        """
+        Table of the per-file results of load_files. The total throughput is
+        over seconds, the wall time of the run, else the sum of the files' times.
+        """
+        lines = [f"{'status':<7} {'rows':>11} {'seconds':>9} {'rows/sec':>11}  file"]
+        total_rows = 0
+        total_seconds = 0.0
+        for result in results:
+            rows = result["rows"] or 0
+            total_rows += rows
+            total_seconds += result["seconds"]
+            rate = rows / result["seconds"] if result["seconds"] else 0
+            status = "ok" if result["error"] is None else "FAILED"
+            line = f"{status:<7} {rows:>11} {result['seconds']:>9.3f} {rate:>11,.0f}  {result['file']}"
+            if result["error"] is not None:
+                line += f"  ({result['error']})"
+            lines.append(line)
+        failed = sum(result["error"] is not None for result in results)
+        if seconds is not None:
+            total_seconds = seconds
+        rate = total_rows / total_seconds if total_seconds else 0
+        lines.append(f"{len(results) - failed} of {len(results)} files loaded, "
+                     f"{total_rows} rows in {total_seconds:.3f}s, {rate:,.0f} rows/sec")
+        return "\n".join(lines)
+
+    def _merge_temp_table(self, temp_table: str, table_name: str, merge: str = "ignore",
+                          merge_batch: Optional[int] = None, merge_key: Optional[str] = None,
+                          update_columns: Optional[list] = None):
+        """
+        Move the rows of temp_table into table_name, see load_data_to_mariadb
+        for the merge modes. Batched merges slice temp_table by ranges of
+        merge_key, bounds found by keyset paging over an index added to
+        temp_table, and commit each slice; rows with a NULL merge_key are
+        merged in a last batch. Every batch is a "merge" event and reported
+        in verbose mode.
+        """
+        if merge == "swap":
+            old_table = f"{table_name}_swap_old"
+            with self._timed("merge", table=table_name, merge=merge):
+                self.exec(f"RENAME TABLE {table_name} TO {old_table}, {temp_table} TO {table_name}")
+            self.exec(f"DROP TABLE {old_table}")
+            self.verb(f"Swapped '{temp_table}' in as '{table_name}'")
+            return
+
+        info = self.table_info(table_name)
+        cols = ", ".join(f"`{col}`" for col in info["columns"])
+        select = f"SELECT {cols} FROM {temp_table}"
+        suffix = ""
+        if merge == "replace":
+            statement = f"REPLACE INTO {table_name} ({cols}) {select}"
+        elif merge == "upsert":
+            statement = f"INSERT INTO {table_name} ({cols}) {select}"
+            if update_columns is None:
+                update_columns = [col for col in info["columns"] if col not in info["primary_key"]]
+            suffix = " ON DUPLICATE KEY UPDATE " + ", ".join(f"`{col}` = VALUES(`{col}`)" for col in update_columns)
+        else:
+            statement = f"INSERT IGNORE INTO {table_name} ({cols}) {select}"
+
+        if merge_batch and not merge_key:
+            merge_key = info["primary_key"][0] if info["primary_key"] else None
+            if merge_key is None:
+                warn(f"No primary key on '{table_name}' to slice the merge by, merging in one statement")
+        if not merge_batch or not merge_key:
+            with self._timed("merge", table=table_name, merge=merge) as fields:
+                self.exec(f"{statement} WHERE 1=1{suffix}")
+                fields["rows"] = self.cursor.rowcount
+            return
+
+        self._try_exec(f"ALTER TABLE {temp_table} ADD INDEX IF NOT EXISTS mariaio_merge_key (`{merge_key}`)")
+        key = f"`{merge_key}`"
+
+        def merge_rows(batch, where, params, bounds):
+            with self._timed("merge", table=table_name, merge=merge, batch=batch) as fields:
+                start = time.perf_counter()
+                self.cursor.execute(f"{statement} WHERE {where}{suffix}", params)
+                rows = self.cursor.rowcount
+                self.conn.commit()
+                fields["rows"] = rows
+            self.verb(f"Merge batch {batch} ({merge_key} {bounds}): "
+                      f"{rows} rows in {time.perf_counter() - start:.3f}s")
+
+        lower = None
+        batch = 0
+        while True:
+            # keyset paging: the upper bound is the key merge_batch rows past the lower one
+            after = f" WHERE {key} IS NOT NULL" if lower is None else f" WHERE {key} > ?"
+            self.cursor.execute(f"SELECT {key} FROM {temp_table}{after} ORDER BY {key} "
+                                f"LIMIT 1 OFFSET {merge_batch - 1}", () if lower is None else (lower,))
+            row = self.cursor.fetchone()
+            upper = row[0] if row else None
+            if lower is None:
+                conditions, params = [f"{key} IS NOT NULL"], []
+            else:
+                conditions, params = [f"{key} > ?"], [lower]
+            if upper is not None:
+                conditions.append(f"{key} <= ?")
+                params.append(upper)
+            merge_rows(batch, " AND ".join(conditions), params, f"{lower} .. {upper}")
+            if upper is None:
+                break
+            lower = upper
+            batch += 1
+        # ranges never hold NULL keys
+        self.cursor.execute(f"SELECT 1 FROM {temp_table} WHERE {key} IS NULL LIMIT 1")
+        nulls = self.cursor.fetchone()
+        self.conn.commit()
+        if nulls:
+            merge_rows(batch + 1, f"{key} IS NULL", [], "IS NULL")
+
+    def _truncate_partitions(self, table_name: str, partitions: list):
+        """Empty partitions of table_name in one statement, a "partition" event."""
+        if not partitions:
+            return
+        with self._timed("partition", table=table_name, action="truncate", partitions=partitions):
+            self.exec(f"ALTER TABLE {table_name} TRUNCATE PARTITION {', '.join(partitions)}")
+        self.verb(f"Truncated partitions {', '.join(partitions)} of '{table_name}'")
 
-    def _insert_chunk(self, chunk, insert_table, session, dtype, columns, chunksize=None):
+    def _exchange_partition(self, temp_table: str, table_name: str, partitions: list):
         """
-        Helper function to insert a chunk of data into the database.
+        Swap the rows of temp_table with those of the one partition loaded,
+        then drop temp_table, which holds the old rows. A "merge" event.
+        """
+        if not partitions:
+            warn(f"No rows loaded, partitions of '{table_name}' left as they are")
+            self.exec(f"DROP TABLE {temp_table}")
+            return
+        name = partitions[0]
+        with self._timed("merge", table=table_name, merge="exchange", partition=name):
+            self.exec(f"ALTER TABLE {table_name} EXCHANGE PARTITION {name} WITH TABLE {temp_table}")
+        self.exec(f"DROP TABLE {temp_table}")
+        self.verb(f"Exchanged '{temp_table}' with partition {name} of '{table_name}'")
+
+    def _insert_chunks(self, chunks, insert_table, dtype, columns, insert_engine="to_sql", workers=1,
+                       on_commit: Optional[Callable] = None):
+        """
+        Insert an iterable of chunks, one after another or on a pool of worker threads.
+
+        With workers > 1 at most 2 * workers chunks are held in memory. The first
+        failing chunk stops the load: pending chunks are cancelled and InsertError
+        is raised, as with a serial load.
+        on_commit(chunk) is called in this thread after each chunk is committed,
+        also for the chunks in flight that commit after another one failed.
+        """
+        if workers <= 1:
+            for chunk in chunks:
+                self._insert_chunk(chunk, insert_table, dtype, columns, insert_engine=insert_engine)
+                if on_commit:
+                    on_commit(chunk)
+            return
+
+        self.verb(f"Inserting chunks with {workers} workers")
+        pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="mariaio")
+        pending: dict = {}  # future => chunk
+
+        def collect(done):
+            """on_commit for each committed chunk of done, then raise the first error"""
+            error = None
+            for future in done:
+                chunk = pending.pop(future)
+                if future.cancelled():
+                    continue
+                if future.exception() is not None:
+                    error = error or future.exception()
+                elif on_commit:
+                    on_commit(chunk)
+            if error is not None:
+                raise error
+
+        try:
+            for chunk in chunks:
+                if len(pending) >= 2 * workers:
+                    done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                    collect(done)
+                future = pool.submit(self._write_chunk, chunk, insert_table, dtype, columns,
+                                     insert_engine=insert_engine)
+                pending[future] = chunk
+            done, _ = wait(pending)
+            collect(done)
+        except BaseException as e:
+            # the chunks in flight finish, those that commit are recorded as well
+            pool.shutdown(wait=True, cancel_futures=True)
+            try:
+                collect(list(pending))
+            except BaseException:
+                pass  # the first error stops the load
+            if isinstance(e, (SQLAlchemyError, mariadb.Error)):
+                raise InsertError(f"Error inserting data: {e}") from e
+            raise
+        pool.shutdown(wait=True)
+
+    def _insert_chunk(self, chunk, insert_table, dtype, columns, insert_engine="to_sql"):
+        """
+        Insert and commit one chunk, a server error is raised as InsertError
+        (the engine has rolled the chunk back).
+        """
+        try:
+            self._write_chunk(chunk, insert_table, dtype, columns, insert_engine=insert_engine)
+        except (SQLAlchemyError, mariadb.Error) as e:
+            raise InsertError(f"Error inserting data: {e}") from e
+
+    def _write_chunk(self, chunk, insert_table, dtype, columns, insert_engine="to_sql"):
+        """
+        Insert and commit one chunk with the insert engine, errors are raised to the caller.
+        Safe to call from worker threads, each call checks out its own pooled connection.
         """
         # check for all columns
         for column in columns:
             if column not in chunk:
                 warn(f"Warning: Column {column} found in db table, but not in data.  This will be ignored")
+        if chunk.empty:
+            return  # e.g. every row filtered out by a watermark
+        with self._timed("insert", table=insert_table, **self._chunk_fields(chunk)):
+            self._run_engine(insert_engine, chunk, insert_table, columns, dtype)
+        self.verb(f"Loaded {len(chunk)} rows into table '{insert_table}'")
+
+    def _measured_engine(self, insert_engine, sizer):
+        """
+        insert_engine as a callable engine reporting the insert time of each
+        chunk to sizer.record_insert, which tunes the following chunk sizes.
+        """
+        def insert(db, chunk, insert_table, columns, dtype):
+            start = time.perf_counter()
+            db._run_engine(insert_engine, chunk, insert_table, columns, dtype)
+            sizer.record_insert(len(chunk), time.perf_counter() - start)
+        return insert
+
+    def _bisect_engine(self, insert_engine, rejects: RejectLog):
+        """
+        insert_engine as a callable engine isolating refused rows. A chunk the
+        server refuses for its data (the engine rolls it back) is split in halves,
+        each retried the same way, until a failing half is a single row: that row
+        goes to rejects with its error and the other rows are inserted. Other
+        errors, e.g. lock wait timeouts, deadlocks or a missing table, are not
+        about rows and stop the load.
+        """
+        row_errors = (DataError, IntegrityError, mariadb.DataError, mariadb.IntegrityError)
+
+        def insert(db, chunk, insert_table, columns, dtype):
+            try:
+                db._run_engine(insert_engine, chunk, insert_table, columns, dtype)
+            except row_errors as e:
+                if len(chunk) > 1:
+                    half = len(chunk) // 2
+                    insert(db, chunk.iloc[:half], insert_table, columns, dtype)
+                    insert(db, chunk.iloc[half:], insert_table, columns, dtype)
+                    return
+                error = getattr(e, "orig", None) or e  # the driver message without the statement
+                db.verb(f"Rejected row {chunk.index[0]}: {error}")
+                db._emit({"event": "reject", "table": insert_table, "rows": len(chunk), "error": str(error)})
+                rejects.add(chunk, error)
+        return insert
+
+    def _run_engine(self, insert_engine, chunk, insert_table, columns, dtype):
+        """Insert and commit chunk with a named or callable insert engine."""
+        if callable(insert_engine):
+            insert_engine(self, chunk, insert_table, columns, dtype)
+        else:
+            insert = getattr(self, self.INSERT_ENGINES[insert_engine])
+            insert(chunk, insert_table, columns, dtype)
+
+    def _insert_chunk_to_sql(self, chunk, insert_table, columns, dtype):
+        """
+        Insert a chunk with DataFrame.to_sql on a pooled SQLAlchemy connection.
+        """
+        with self.engine.connect() as conn, self._load_settings(conn.connection.dbapi_connection):
+            conn.begin()  # to_sql commits its own transaction even when it fails, a chunk must roll back
+            try:
+                chunk.to_sql(name=insert_table, con=conn, if_exists='append',
+                             index=False, dtype=dtype)
+                with self._timed("commit"):
+                    conn.commit()
+            except BaseException:
+                conn.rollback()  # before the session settings are reset
+                raise
+
+    def _insert_chunk_executemany(self, chunk, insert_table, columns, dtype):
+        """
+        Insert a chunk with cursor.executemany on a pooled mariadb connection.
+
+        The chunk is converted column by column to tuples in table column order,
+        the connector binds them as one array of parameters.
+        """
+        insert_columns = [col for col in columns if col in chunk]
+        if not insert_columns or chunk.empty:
+            return
+        names = ", ".join(f"`{col}`" for col in insert_columns)
+        params = ", ".join("?" for _ in insert_columns)
+        query = f"INSERT INTO {insert_table} ({names}) VALUES ({params})"
+        rows = list(zip(*(self._column_values(chunk[col]) for col in insert_columns)))
+        with self._raw_connection() as conn:
+            cursor = conn.cursor()
+            cursor.executemany(query, rows)
+            cursor.close()
+
+    @staticmethod
+    def _column_values(series: pd.Series) -> list:
+        """
+        Python values of a column for parameter binding, missing values as None.
+        """
+        arrow_type = getattr(series.dtype, "pyarrow_dtype", None)  # pd.ArrowDtype columns
+        if pd.api.types.is_datetime64_any_dtype(series.dtype) and not str(arrow_type).startswith("date"):
+            # datetime64[us] converts to datetime.datetime objects, NaT to None
+            values = pd.Series(series.to_numpy(dtype="datetime64[us]").astype(object),
+                               index=series.index, dtype=object)
+        else:
+            values = series.astype(object)
+        if series.hasnans:
+            values = values.where(series.notna(), None)
+        return values.tolist()
+
+    def _insert_chunk_load_data(self, chunk, insert_table, columns, dtype=None):
+        """
+        Write a chunk to a temporary csv file and bulk load it with LOAD DATA LOCAL INFILE.
+        """
+        chunk = chunk.copy()
+        for col in chunk.columns:
+            if pd.api.types.is_bool_dtype(chunk[col].dtype):
+                chunk[col] = chunk[col].astype("Int8")  # True/False are not valid for TINYINT
+        fh = tempfile.NamedTemporaryFile("w", suffix=".csv", delete=False, newline="", encoding="utf-8")
         try:
-            chunk.to_sql(name=insert_table, con=self.engine, if_exists='append', 
-                         index=False, dtype=dtype,
-                         chunksize=chunksize)
-            session.commit()  # Commit each chunk for efficiency
-            self.verb(f"Loaded {len(chunk)} rows into table '{insert_table}'")
-        except SQLAlchemyError as e:
-            warn(f"Error inserting data: {e}")
-            session.rollback()  # Rollback the transaction in case of error
-            sys.exit(11)
+            with fh:
+                chunk.to_csv(fh, index=False, header=False, lineterminator="\n")
+            self._load_data_infile(fh.name, insert_table, columns,
+                                   file_columns=list(chunk.columns), ignore_lines=0)
+        finally:
+            os.remove(fh.name)
+
+    def _load_data_infile(self, filepath, insert_table, columns, file_columns=None, ignore_lines=1):
+        """
+        Load a csv file with LOAD DATA LOCAL INFILE.
+
+        Args:
+            filepath (str): csv file readable by this client
+            insert_table (str): table to load
+            columns (list): columns of the table, from table_info
+            file_columns (list): columns of the csv file, read from the header if None
+            ignore_lines (int): header lines to skip
+
+        Returns:
+            int: rows loaded
+        """
+        line_end = "\\n"  # as sql string literal
+        if file_columns is None:
+            with open_input(filepath) as fh:
+                header = fh.readline().decode("utf-8")
+            if header.endswith("\r\n"):
+                line_end = "\\r\\n"
+            file_columns = next(csv.reader([header]))
+            for column in columns:
+                if column not in file_columns:
+                    warn(f"Warning: Column {column} found in db table, but not in data.  This will be ignored")
+
+        # read every field into a variable, empty fields become NULL as with read_csv
+        types = self.table_info(insert_table)['types']
+        variables = []
+        assignments = []
+        for i, col in enumerate(file_columns):
+            variables.append(f"@c{i}")
+            if col in columns and self._is_bool(types.get(col)):
+                # pandas writes booleans as True/False, strict mode refuses them for BOOL
+                assignments.append(f"`{col}` = CASE LOWER(@c{i}) WHEN 'true' THEN 1 WHEN 'false' THEN 0 "
+                                   f"ELSE NULLIF(@c{i}, '') END")
+            elif col in columns:
+                assignments.append(f"`{col}` = NULLIF(@c{i}, '')")
+        if not assignments:
+            raise ValueError(f"No columns of the data match table '{insert_table}'")
+
+        with ExitStack() as stack:
+            if detect_compression(filepath):
+                # stream the decompressed bytes through a named pipe, no copy on disk
+                filepath = stack.enter_context(decompressed_fifo(filepath))
+            path = filepath.replace("\\", "\\\\").replace("'", "\\'")
+            query = (
+                f"LOAD DATA LOCAL INFILE '{path}' INTO TABLE {insert_table} "
+                "CHARACTER SET utf8mb4 "
+                "FIELDS TERMINATED BY ',' OPTIONALLY ENCLOSED BY '\"' ESCAPED BY '' "
+                f"LINES TERMINATED BY '{line_end}' "
+                f"IGNORE {ignore_lines} LINES "
+                f"({', '.join(variables)}) SET {', '.join(assignments)}"
+            )
+            if self.verbose:
+                warn(query)
+            with self._raw_connection() as conn:
+                cursor = conn.cursor()
+                cursor.execute(query)
+                rows = cursor.rowcount
+                self.verb(f"LOAD DATA loaded {rows} rows into table '{insert_table}'")
+                cursor.close()
+        return rows
 
 
 
-    def _init_dtype(self, df, table_name) -> dict:
+    @staticmethod
+    def _is_bool(sql_type) -> bool:
+        """BOOL columns: Boolean when created here, TINYINT(1) when reflected"""
+        if isinstance(sql_type, type):
+            sql_type = sql_type()
+        return isinstance(sql_type, sqlalchemy.Boolean) or (
+            isinstance(sql_type, mysql.TINYINT) and getattr(sql_type, "display_width", None) == 1)
+
+    def _init_dtype(self, df, table_name, use_enum: bool = False, sample: bool = False) -> dict:
         """
         interpret sql datatypes from columns of dataframe 
         Args: 
-          df (pd.Dataframe)  data frame to type
+          df (pd.Dataframe)  data frame to type, every row is scanned
+          use_enum (bool)  create ENUM columns for low-cardinality strings
+          sample (bool)  df is the start of a longer input, widen the types
         Returns: 
          dict({ colname => sqlalchemy-datatype })
         """
 
-        inspector = sqlalchemy.inspect(self.engine)
+        info = self.table_info(table_name)
         dtype: dict = {}
         
-        if inspector.has_table(table_name):
+        if info['exists']:
             self.verb(f"Table {table_name} exists, inspecting for existing columns and types")
-            for column in inspector.get_columns(table_name):
-                col_name = column['name']
-                col_type = column['type']
+            for col_name, col_type in info['types'].items():
                 dtype[col_name] = col_type
                 if self.verbose:
                    print(f"____ found col {col_name} => {col_type}")
         else:
             self.verb(f"Table {table_name} does not exists, inferring from dataframe.")
-            sample_df = df.head(10).copy()
-
-            # Map pandas dtypes to SQLAlchemy types
-            type_mapping = {
-                "object": sqlalchemy.String(255),
-                "int64": sqlalchemy.Integer,
-                "float64": sqlalchemy.Float,
-                "bool": sqlalchemy.Boolean,
-                "datetime64[ns]": sqlalchemy.DateTime,
-            }
-
-            for col_name, col_dtype in sample_df.dtypes.items():
-                column_type = sqlalchemy.String(255)  # Default to String if type not recognized, ADD LENGTH
-                sample = sample_df[col_name].iloc[0]
-                if col_dtype == "object":
-                    if isinstance(sample, date):
-                        column_type = sqlalchemy.Date
-                    elif isinstance(sample, datetime):
-                        column_type = sqlalchemy.DateTime
-                    elif isinstance(sample, bool):
-                        column_type = sqlalchemy.Boolean
-                    else:
-                        column_type = sqlalchemy.String(255)                        
-                elif str(col_dtype) in type_mapping:
-                    if str(col_dtype) == 'int64':
-                        if sample > 2147483647 or sample < -2147483648:
-                            column_type = sqlalchemy.BigInteger
-                        else:
-                            column_type = sqlalchemy.Integer        
-                    else:
-                        column_type = type_mapping[str(col_dtype)]
-
-                dtype[col_name] = column_type
-                if self.verbose:
-                    typ = str(type(sample))
-                    warn(f"____ set col {col_name} => {str(col_dtype)} => {column_type} [ {sample} [ {typ} ]]")
+            inferencer = TypeInferencer(use_enum=use_enum, sample=sample).update(df)
+            dtype = inferencer.dtype()
+            self.type_report = inferencer.report()
+            if self.verbose:
+                for row in self.type_report:
+                    enum = " [enum candidate]" if row['enum_candidate'] else ""
+                    warn(f"____ set col {row['column']} => {row['type']} ({row['note']}){enum}")
 
         return dtype
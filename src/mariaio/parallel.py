@@ -0,0 +1,163 @@
+import collections
+import time
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+from typing import Callable, Iterable
+
+import pandas as pd  # type: ignore
+from .readers import CHUNK_META
+
+try:
+    import pyarrow  # type: ignore
+    import pyarrow.ipc  # type: ignore
+except ImportError:  # chunks are pickled
+    pyarrow = None
+
+_transform = None  # transform of a worker process, set by _init_worker
+
+
+def _init_worker(transform: Callable):
+    global _transform
+    _transform = transform
+
+
+def pack(df: pd.DataFrame) -> tuple:
+    """
+    A DataFrame as an Arrow IPC stream in a new shared memory block,
+    ("shm", name, size, arrow_backed). The receiver unpacks it and the
+    creator's side unlinks it. Falls back to ("pickle", df) without pyarrow
+    or for columns Arrow cannot represent, e.g. mixed types.
+    """
+    if pyarrow is None:
+        return ("pickle", df)
+    try:
+        table = pyarrow.Table.from_pandas(df)
+    except pyarrow.ArrowException:
+        return ("pickle", df)
+    mock = pyarrow.MockOutputStream()  # sizes the stream without writing it
+    with pyarrow.ipc.new_stream(mock, table.schema) as writer:
+        writer.write_table(table)
+    size = mock.size()
+    shm = shared_memory.SharedMemory(create=True, size=max(size, 1))
+    try:
+        sink = pyarrow.FixedSizeBufferWriter(pyarrow.py_buffer(shm.buf))
+        with pyarrow.ipc.new_stream(sink, table.schema) as writer:
+            writer.write_table(table)
+        sink.close()
+        del sink, writer  # release the exported view of shm.buf before closing it
+    except BaseException:
+        shm.close()
+        shm.unlink()
+        raise
+    shm.close()
+    arrow_backed = any(isinstance(dtype, pd.ArrowDtype) for dtype in df.dtypes)
+    return ("shm", shm.name, size, arrow_backed)
+
+
+def unpack(payload: tuple, unlink: bool = False) -> pd.DataFrame:
+    """
+    The DataFrame of a pack() payload. The stream is copied out of shared
+    memory in one piece, so the block can be closed (and unlinked) at once.
+    """
+    if payload[0] == "pickle":
+        return payload[1]
+    _, name, size, arrow_backed = payload
+    shm = shared_memory.SharedMemory(name=name)
+    try:
+        data = pyarrow.py_buffer(shm.buf[:size].tobytes())
+    finally:
+        shm.close()
+        if unlink:
+            shm.unlink()
+    table = pyarrow.ipc.open_stream(data).read_all()
+    return table.to_pandas(types_mapper=pd.ArrowDtype if arrow_backed else None)
+
+
+def discard(payload: tuple):
+    """Unlink the shared memory of a payload that will not be unpacked."""
+    if payload[0] != "shm":
+        return
+    try:
+        shm = shared_memory.SharedMemory(name=payload[1])
+    except FileNotFoundError:
+        return
+    shm.close()
+    shm.unlink()
+
+
+def _transform_chunk(payload: tuple) -> tuple:
+    """Worker side: unpack, transform and pack a chunk, returns (payload, seconds)."""
+    chunk = unpack(payload)
+    start = time.perf_counter()
+    chunk = _transform(chunk)
+    seconds = time.perf_counter() - start
+    return pack(chunk), seconds
+
+
+class TransformPool:
+    """
+    Apply a transform to chunks on a pool of processes, yielding the results
+    in input order.
+
+    Chunks travel as Arrow IPC streams in shared memory, pickled only when
+    Arrow cannot represent them. At most 2 * processes chunks are in flight.
+    A failing transform raises ValueError naming the chunk index. The
+    transform runs in forked workers, or must be picklable where processes
+    are spawned.
+
+    Args:
+        transform (Callable): function applied to each chunk
+        processes (int): worker processes
+    """
+
+    def __init__(self, transform: Callable, processes: int):
+        self.transform = transform
+        self.processes = processes
+        self.chunks = 0
+        self.seconds = 0.0  # time spent in the transform, summed over workers
+        self.shared = 0  # chunks shipped through shared memory, both ways
+        self.pickled = 0
+
+    def map(self, chunks: Iterable, start: int = 0):
+        """Transformed chunks in order, start is the index of the first chunk."""
+        pool = ProcessPoolExecutor(max_workers=self.processes, initializer=_init_worker,
+                                   initargs=(self.transform,))
+        pending: collections.deque = collections.deque()  # (index, meta, payload, future)
+        try:
+            for index, chunk in enumerate(chunks, start):
+                if len(pending) >= 2 * self.processes:
+                    yield self._result(*pending.popleft())
+                payload = pack(chunk)
+                pending.append((index, chunk.attrs.get(CHUNK_META), payload,
+                                pool.submit(_transform_chunk, payload)))
+            while pending:
+                yield self._result(*pending.popleft())
+        finally:
+            pool.shutdown(wait=True, cancel_futures=True)
+            for _, _, payload, future in pending:
+                discard(payload)
+                if not future.cancelled() and future.exception() is None:
+                    discard(future.result()[0])
+
+    def _result(self, index, meta, payload, future) -> pd.DataFrame:
+        try:
+            result, seconds = future.result()
+        except Exception as e:
+            raise ValueError(f"transform failed on chunk {index}: {e!r}") from e
+        finally:
+            discard(payload)
+        chunk = unpack(result, unlink=True)
+        if meta:
+            chunk.attrs[CHUNK_META] = meta
+        self.chunks += 1
+        self.seconds += seconds
+        for sent in (payload, result):
+            if sent[0] == "shm":
+                self.shared += 1
+            else:
+                self.pickled += 1
+        return chunk
+
+    def report(self) -> str:
+        return (f"{self.chunks} chunks transformed on {self.processes} processes in {self.seconds:.2f}s, "
+                f"{self.shared} transfers through shared memory, {self.pickled} pickled")
@@ -0,0 +1,126 @@
+import re
+from typing import Iterable, Optional
+
+import pandas as pd  # type: ignore
+
+PARTITION_KINDS = ("day", "month", "hash")
+MAX_PARTITION = "pmax"  # catch-all range partition, split as new days or months arrive
+
+
+class Partitioning:
+    """
+    Partitioning of a table: RANGE COLUMNS by day or month of a date or
+    datetime column, one partition per day (p20250227) or month (p202502)
+    plus pmax, or KEY (MariaDB's hash for any column type) in n partitions.
+
+    Specs are strings "day:quote_date", "month:quote_date" or "hash:symbol:8".
+    Range partitions are created for the days or months in the data and
+    added by splitting pmax as later loads bring new ones.
+
+    Args:
+        kind (str): "day", "month" or "hash"
+        column (str): partition column
+        partitions (int): number of hash partitions
+    """
+
+    def __init__(self, kind: str, column: str, partitions: int = 8):
+        if kind not in PARTITION_KINDS:
+            raise ValueError(f"Unknown partitioning '{kind}', use one of {PARTITION_KINDS}")
+        self.kind = kind
+        self.column = column
+        self.partitions = partitions
+        self.existing: set = set()  # partition names on the server
+
+    def __repr__(self) -> str:
+        suffix = f":{self.partitions}" if self.kind == "hash" else ""
+        return f"Partitioning('{self.kind}:{self.column}{suffix}')"
+
+    @classmethod
+    def parse(cls, spec: str) -> "Partitioning":
+        parts = spec.split(":")
+        if len(parts) == 3 and parts[0] == "hash" and parts[2].isdigit():
+            return cls("hash", parts[1], int(parts[2]))
+        if len(parts) == 2:
+            return cls(parts[0], parts[1])
+        raise ValueError(f"Bad partition spec '{spec}', use day:COLUMN, month:COLUMN or hash:COLUMN:N")
+
+    @classmethod
+    def from_server(cls, rows: list) -> Optional["Partitioning"]:
+        """
+        The partitioning of a table from its INFORMATION_SCHEMA.PARTITIONS rows
+        (method, expression, name), None unless it is one made by this class.
+        """
+        if not rows:
+            return None
+        method, expression, _ = rows[0]
+        column = expression.strip().strip("`")
+        names = [row[2] for row in rows]
+        if method == "KEY":
+            found = cls("hash", column, len(names))
+        elif method == "RANGE COLUMNS" and names[-1] == MAX_PARTITION:
+            digits = {len(name) - 1 for name in names[:-1] if re.fullmatch(r"p\d+", name)}
+            if digits - {8, 6} or len(digits) > 1:
+                return None
+            found = cls("month" if digits == {6} else "day", column)
+        else:
+            return None
+        found.existing = set(names)
+        return found
+
+    @property
+    def ranged(self) -> bool:
+        return self.kind != "hash"
+
+    def buckets(self, values: pd.Series) -> pd.Series:
+        """Start of the day or month of each value, NaT where missing."""
+        if str(getattr(values.dtype, "pyarrow_dtype", "")).startswith("date"):
+            values = values.astype("datetime64[ns]")
+        elif not pd.api.types.is_datetime64_any_dtype(values.dtype):
+            values = pd.to_datetime(values)
+        if values.dt.tz is not None:
+            values = values.dt.tz_localize(None)
+        if self.kind == "month":
+            return values.dt.to_period("M").dt.to_timestamp()
+        return values.dt.normalize()
+
+    def name(self, start: pd.Timestamp) -> str:
+        return start.strftime("p%Y%m%d" if self.kind == "day" else "p%Y%m")
+
+    def definition(self, start: pd.Timestamp) -> str:
+        upper = start + (pd.DateOffset(days=1) if self.kind == "day" else pd.DateOffset(months=1))
+        return f"PARTITION {self.name(start)} VALUES LESS THAN ('{upper:%Y-%m-%d}')"
+
+    def _definitions(self, starts: Iterable[pd.Timestamp]) -> str:
+        """Partition definitions for the bucket starts, closed by pmax."""
+        definitions = [self.definition(start) for start in sorted(set(starts))]
+        definitions.append(f"PARTITION {MAX_PARTITION} VALUES LESS THAN (MAXVALUE)")
+        return "(\n  " + ",\n  ".join(definitions) + "\n)"
+
+    def table_options(self, starts: Iterable[pd.Timestamp] = ()) -> dict:
+        """
+        sqlalchemy.Table options adding the PARTITION BY clause to CREATE TABLE,
+        with range partitions for the given bucket starts.
+        """
+        if self.kind == "hash":
+            return {"mysql_partition_by": f"KEY(`{self.column}`)", "mysql_partitions": str(self.partitions)}
+        return {"mysql_partition_by": f"RANGE COLUMNS(`{self.column}`) {self._definitions(starts)}"}
+
+    def missing(self, starts: Iterable[pd.Timestamp]) -> tuple:
+        """
+        Bucket starts without a partition of their own, as (new, covered): new
+        ones come after the last partition and are added by splitting pmax,
+        covered ones fall inside the range of an earlier partition.
+        """
+        fmt = "p%Y%m%d" if self.kind == "day" else "p%Y%m"
+        last = max((pd.to_datetime(name, format=fmt) for name in self.existing if name != MAX_PARTITION),
+                   default=None)
+        new, covered = [], []
+        for start in sorted(set(starts)):
+            if self.name(start) in self.existing:
+                continue
+            (new if last is None or start > last else covered).append(start)
+        return new, covered
+
+    def reorganize(self, table_name: str, starts: Iterable[pd.Timestamp]) -> str:
+        """ALTER TABLE splitting pmax into partitions for the given bucket starts."""
+        return f"ALTER TABLE {table_name} REORGANIZE PARTITION {MAX_PARTITION} INTO {self._definitions(starts)}"
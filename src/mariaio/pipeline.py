@@ -0,0 +1,147 @@
+import threading
+import queue
+import time
+from typing import Callable, Iterable, Optional
+
+
+class _Done:
+    """Queue marker for the end of a stage, carries the error that stopped it, if any."""
+    def __init__(self, error: Optional[BaseException] = None):
+        self.error = error
+
+
+class StageStats:
+    """Busy and idle seconds of one pipeline stage."""
+    def __init__(self, name: str):
+        self.name = name
+        self.busy = 0.0
+        self.idle = 0.0
+        self.chunks = 0
+
+    def as_dict(self) -> dict:
+        return {"busy": round(self.busy, 3), "idle": round(self.idle, 3), "chunks": self.chunks}
+
+    def __str__(self) -> str:
+        total = self.busy + self.idle
+        pct = 100 * self.busy / total if total else 0.0
+        return f"{self.name}: busy {self.busy:.2f}s idle {self.idle:.2f}s ({pct:.0f}% busy) chunks {self.chunks}"
+
+
+class ChunkPipeline:
+    """
+    Run read -> transform -> insert as three overlapping stages.
+
+    The reader and the transform run in their own threads, connected to the
+    consumer by bounded queues of queue_depth chunks, so at most about
+    2 * queue_depth + 2 chunks are held in memory. Iterating the pipeline
+    yields transformed chunks; the time the consumer spends between chunks
+    is counted as the insert stage.
+
+    Args:
+        reader (Iterable): source of raw chunks, e.g. pd.read_csv(..., chunksize=n)
+        transform (Callable, optional): function applied to each chunk
+        queue_depth (int): chunks buffered between two stages
+    """
+
+    POLL = 0.1  # seconds between checks for a stopped pipeline
+
+    def __init__(self, reader: Iterable, transform: Optional[Callable] = None, queue_depth: int = 2):
+        self.reader = reader
+        self.transform = transform
+        self.queue_depth = max(1, queue_depth)
+        self.stats = {name: StageStats(name) for name in ("read", "transform", "insert")}
+        self._stop = threading.Event()
+
+    def _put(self, q: queue.Queue, item, stats: StageStats) -> bool:
+        start = time.perf_counter()
+        while not self._stop.is_set():
+            try:
+                q.put(item, timeout=self.POLL)
+                stats.idle += time.perf_counter() - start
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def _get(self, q: queue.Queue, stats: StageStats):
+        start = time.perf_counter()
+        while True:
+            try:
+                item = q.get(timeout=self.POLL)
+                stats.idle += time.perf_counter() - start
+                return item
+            except queue.Empty:
+                if self._stop.is_set():
+                    return _Done()
+
+    def _read(self, out: queue.Queue):
+        stats = self.stats["read"]
+        try:
+            it = iter(self.reader)
+            while not self._stop.is_set():
+                start = time.perf_counter()
+                try:
+                    chunk = next(it)
+                except StopIteration:
+                    break
+                stats.busy += time.perf_counter() - start
+                stats.chunks += 1
+                if not self._put(out, chunk, stats):
+                    return
+            self._put(out, _Done(), stats)
+        except BaseException as e:
+            self._put(out, _Done(e), stats)
+
+    def _transform(self, inq: queue.Queue, out: queue.Queue):
+        stats = self.stats["transform"]
+        while True:
+            chunk = self._get(inq, stats)
+            if isinstance(chunk, _Done):
+                self._put(out, chunk, stats)
+                return
+            start = time.perf_counter()
+            try:
+                if self.transform:
+                    chunk = self.transform(chunk)
+            except BaseException as e:
+                self._put(out, _Done(e), stats)
+                return
+            stats.busy += time.perf_counter() - start
+            stats.chunks += 1
+            if not self._put(out, chunk, stats):
+                return
+
+    def __iter__(self):
+        read_q: queue.Queue = queue.Queue(maxsize=self.queue_depth)
+        transform_q: queue.Queue = queue.Queue(maxsize=self.queue_depth)
+        threads = [
+            threading.Thread(target=self._read, args=(read_q,), name="mariaio-read", daemon=True),
+            threading.Thread(target=self._transform, args=(read_q, transform_q), name="mariaio-transform",
+                             daemon=True),
+        ]
+        for thread in threads:
+            thread.start()
+
+        stats = self.stats["insert"]
+        try:
+            while True:
+                chunk = self._get(transform_q, stats)
+                if isinstance(chunk, _Done):
+                    if chunk.error is not None:
+                        raise chunk.error
+                    return
+                start = time.perf_counter()
+                yield chunk
+                stats.busy += time.perf_counter() - start
+                stats.chunks += 1
+        finally:
+            self._stop.set()
+            for thread in threads:
+                thread.join()
+
+    def report(self) -> str:
+        """One line per stage with busy/idle time, the busiest stage is the bottleneck."""
+        return "\n".join(str(stage) for stage in self.stats.values())
+
+    def as_dict(self) -> dict:
+        return {name: stage.as_dict() for name, stage in self.stats.items()}
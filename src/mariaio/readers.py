@@ -0,0 +1,404 @@
+import bz2
+import csv
+import glob
+import gzip
+import io
+import lzma
+import os
+import shutil
+import sys
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+import pandas as pd  # type: ignore
+from typing import Callable, Optional, Union
+
+# DataFrame.attrs key of (chunk index, start and end byte offset, rows read) set by OffsetCsvReader
+CHUNK_META = "mariaio_chunk"
+
+COMPRESSION_EXTENSIONS = {".gz": "gzip", ".bz2": "bz2", ".xz": "xz", ".zst": "zstd"}
+COMPRESSION_MAGIC = (
+    (b"\x1f\x8b", "gzip"),
+    (b"BZh", "bz2"),
+    (b"\xfd7zXZ\x00", "xz"),
+    (b"\x28\xb5\x2f\xfd", "zstd"),
+)
+
+
+class _StreamReader(io.RawIOBase):
+    """Raw view of a binary stream that leaves the stream open when closed."""
+
+    def __init__(self, stream):
+        self.stream = stream
+
+    def readable(self):
+        return True
+
+    def readinto(self, buffer) -> int:
+        data = self.stream.read(len(buffer))
+        buffer[:len(data)] = data
+        return len(data)
+
+
+def detect_compression(source) -> Optional[str]:
+    """
+    Compression of a path, by extension and else its first bytes, or of a
+    peekable binary stream. None for plain data.
+    """
+    if isinstance(source, str):
+        compression = COMPRESSION_EXTENSIONS.get(os.path.splitext(source)[1].lower())
+        if compression:
+            return compression
+        with open(source, "rb") as fh:
+            head = fh.read(6)
+    else:
+        head = source.peek(6)[:6]
+    for magic, compression in COMPRESSION_MAGIC:
+        if head.startswith(magic):
+            return compression
+    return None
+
+
+def _zstd_reader(fileobj, closefd: bool):
+    try:
+        import zstandard  # type: ignore
+    except ImportError:
+        raise ValueError("zstd input needs zstandard: pip install zstandard")
+    return io.BufferedReader(zstandard.ZstdDecompressor().stream_reader(fileobj, closefd=closefd))
+
+
+def open_input(source):
+    """
+    Binary file object of the decompressed bytes of a path or stream,
+    "-" for stdin. gzip, bz2, xz and zstd (needs zstandard) are decompressed
+    incrementally while reading. Closing it never closes a stream that was given.
+    """
+    if isinstance(source, str) and source != "-":
+        compression = detect_compression(source)
+        if compression == "gzip":
+            return gzip.open(source, "rb")
+        if compression == "bz2":
+            return bz2.open(source, "rb")
+        if compression == "xz":
+            return lzma.open(source, "rb")
+        if compression == "zstd":
+            return _zstd_reader(open(source, "rb"), closefd=True)
+        return open(source, "rb")
+    stream = sys.stdin if source == "-" else source
+    stream = getattr(stream, "buffer", stream)  # binary stream of text streams like stdin
+    if isinstance(stream, io.TextIOBase):
+        return stream  # text without a binary buffer, e.g. io.StringIO, is not compressed
+    stream = io.BufferedReader(_StreamReader(stream))
+    compression = detect_compression(stream)
+    if compression == "gzip":
+        return gzip.GzipFile(fileobj=stream)
+    if compression == "bz2":
+        return bz2.BZ2File(stream)
+    if compression == "xz":
+        return lzma.LZMAFile(stream)
+    if compression == "zstd":
+        return _zstd_reader(stream, closefd=False)
+    return stream
+
+
+@contextmanager
+def decompressed_fifo(filepath: str):
+    """
+    Path of a named pipe fed with the decompressed bytes of filepath by a
+    thread, so a compressed file can be sent with LOAD DATA LOCAL INFILE
+    without a decompressed copy on disk. Where named pipes are not
+    available the copy is a temporary file.
+    """
+    workdir = tempfile.mkdtemp(prefix="mariaio_")
+    path = os.path.join(workdir, "data.csv")
+    try:
+        if not hasattr(os, "mkfifo"):
+            with open_input(filepath) as src, open(path, "wb") as dst:
+                shutil.copyfileobj(src, dst, 1 << 20)
+            yield path
+            return
+        os.mkfifo(path)
+        stop = threading.Event()
+        errors: list = []
+
+        def feed():
+            try:
+                # open without blocking, so an aborted load that never opens the pipe stops the writer
+                while True:
+                    try:
+                        fd = os.open(path, os.O_WRONLY | os.O_NONBLOCK)
+                        break
+                    except OSError:  # ENXIO, no reader yet
+                        if stop.wait(0.01):
+                            return
+                os.set_blocking(fd, True)
+                with open_input(filepath) as src, os.fdopen(fd, "wb") as dst:
+                    shutil.copyfileobj(src, dst, 1 << 20)
+            except BrokenPipeError:
+                pass  # the reader went away, its error is reported by the load
+            except Exception as e:
+                errors.append(e)
+
+        writer = threading.Thread(target=feed, name="mariaio-fifo", daemon=True)
+        writer.start()
+        try:
+            yield path
+        finally:
+            stop.set()
+            writer.join()
+        if errors:
+            raise errors[0]
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+COLUMNAR_EXTENSIONS = {".parquet": "parquet", ".pq": "parquet", ".feather": "feather", ".arrow": "feather"}
+
+
+def columnar_format(source) -> Optional[str]:
+    """"parquet" or "feather" for paths of columnar files, by extension, else None."""
+    if not isinstance(source, str):
+        return None
+    return COLUMNAR_EXTENSIONS.get(os.path.splitext(source)[1].lower())
+
+
+def _import_pyarrow():
+    try:
+        import pyarrow  # type: ignore
+        import pyarrow.csv  # type: ignore
+        import pyarrow.ipc  # type: ignore
+        import pyarrow.parquet  # type: ignore
+    except ImportError:
+        raise ValueError("the arrow reader, parquet and feather input need pyarrow: pip install pyarrow")
+    return pyarrow
+
+
+def _read_record(fh) -> bytes:
+    """One csv record, several lines when a quoted field holds line ends."""
+    record = fh.readline()
+    while record.count(b'"') % 2:
+        line = fh.readline()
+        if not line:
+            break
+        record += line
+    return record
+
+
+def _arrow_type(pa, dtype):
+    """Arrow type of a pandas dtype name; strings for string and category."""
+    dtype = pd.api.types.pandas_dtype(dtype)
+    if isinstance(dtype, (pd.StringDtype, pd.CategoricalDtype)):
+        return pa.string()
+    return pa.from_numpy_dtype(getattr(dtype, "numpy_dtype", dtype))
+
+
+class ArrowReader:
+    """
+    DataFrame chunks of chunksize rows from a stream of Arrow record batches,
+    with Arrow-backed (pd.ArrowDtype) columns.
+
+    Sources are opened with open(): csv (also compressed or a stream) is parsed
+    by the multithreaded pyarrow.csv streaming reader, parquet is read row
+    group by row group and feather (Arrow IPC files) batch by batch from a
+    memory map, so columnar files are never parsed as text. Batches are
+    regrouped to chunksize rows.
+    """
+
+    def __init__(self, batches, chunksize: int, closing=None, columns: Optional[set] = None):
+        self.pa = _import_pyarrow()
+        self.batches = iter(batches)
+        self.chunksize = chunksize
+        self.closing = closing  # file or memory map closed with the reader
+        self.columns = columns  # columns kept, None for all
+        self.pending: list = []  # batches read ahead of the next chunk
+        self.pending_rows = 0
+
+    @classmethod
+    def open(cls, source, chunksize: int, format: Optional[str] = None, columns: Optional[set] = None,
+             dtypes: Optional[dict] = None):
+        """
+        Reader of a csv, parquet or feather path, or a csv stream; format from the extension.
+        With columns, only those columns are kept; parquet and csv do not convert the others
+        at all. csv columns in dtypes (pandas dtypes) are parsed as the matching Arrow types.
+        """
+        pa = _import_pyarrow()
+        format = format or columnar_format(source) or "csv"
+        if format == "parquet":
+            parquet = pa.parquet.ParquetFile(source)
+            read_columns = None if columns is None else [
+                name for name in parquet.schema_arrow.names if name in columns]
+            return cls(parquet.iter_batches(batch_size=chunksize, columns=read_columns), chunksize,
+                       closing=parquet)
+        if format == "feather":
+            source_map = pa.memory_map(source)
+            ipc = pa.ipc.open_file(source_map)
+            return cls((ipc.get_batch(i) for i in range(ipc.num_record_batches)), chunksize,
+                       closing=source_map, columns=columns)
+        fh = open_input(source)
+        read_options = pa.csv.ReadOptions(use_threads=True, block_size=1 << 22)
+        convert_options = pa.csv.ConvertOptions(strings_can_be_null=True)  # empty fields are NULL, as with pandas
+        if columns is not None or dtypes:
+            # options may only name columns of the file: read its header first
+            names = next(csv.reader(io.StringIO(_read_record(fh).decode("utf-8-sig"))), [])
+            read_options.column_names = names
+            if columns is not None:
+                convert_options.include_columns = [name for name in names if name in columns]
+            convert_options.column_types = {
+                name: _arrow_type(pa, dtype) for name, dtype in (dtypes or {}).items() if name in names}
+        return cls(pa.csv.open_csv(fh, read_options=read_options, convert_options=convert_options),
+                   chunksize, closing=fh)
+
+    def __iter__(self):
+        return self
+
+    def __next__(self) -> pd.DataFrame:
+        while self.pending_rows < self.chunksize:
+            batch = next(self.batches, None)
+            if batch is None:
+                break
+            self.pending.append(batch)
+            self.pending_rows += batch.num_rows
+        if not self.pending_rows:
+            raise StopIteration
+        table = self.pa.Table.from_batches(self.pending)
+        chunk = table.slice(0, self.chunksize)
+        self.pending = table.slice(self.chunksize).to_batches()
+        self.pending_rows = table.num_rows - chunk.num_rows
+        if self.columns is not None:
+            chunk = chunk.select([name for name in chunk.column_names if name in self.columns])
+        return chunk.to_pandas(types_mapper=pd.ArrowDtype)
+
+    def get_chunk(self, size: int) -> pd.DataFrame:
+        """Next chunk of size rows, later chunks keep this size."""
+        self.chunksize = size
+        return next(self)
+
+    def close(self):
+        if self.closing is not None:
+            self.closing.close()
+            self.closing = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class OffsetCsvReader:
+    """
+    Read a CSV file in chunks of rows, tracking the byte offset where each chunk ends.
+    Compressed files are decompressed while reading, offsets count decompressed bytes.
+
+    Records are split on line ends outside of double quotes, so quoted fields
+    may contain newlines. Each chunk is parsed with pd.read_csv together with
+    the header line, and carries (chunk index, start offset, end offset, rows)
+    in chunk.attrs[CHUNK_META]. Reading can start at any offset returned before,
+    which lets a load resume without parsing the rows already committed.
+
+    Args:
+        filepath (str): csv file
+        chunksize (int): rows per chunk
+        offset (int): byte offset to start reading, 0 for the start of the data
+        index (int): index of the first chunk read
+        skip (list): (start, end) byte offsets of chunks past offset that are
+        already loaded; they are read over, chunks end where one starts
+        read_csv_kwargs: passed on to pd.read_csv
+    """
+
+    def __init__(self, filepath: str, chunksize: int, offset: int = 0, index: int = 0, skip=(),
+                 **read_csv_kwargs):
+        self.filepath = filepath
+        self.chunksize = chunksize
+        self.index = index
+        self.skip = sorted(tuple(span) for span in skip)
+        self.read_csv_kwargs = read_csv_kwargs
+        self.fh = open_input(filepath)
+        self.header = _read_record(self.fh)
+        usecols = read_csv_kwargs.get("usecols")
+        if callable(usecols):  # resolved once from the header, the pyarrow engine needs a list
+            names = pd.read_csv(io.BytesIO(self.header), nrows=0).columns
+            read_csv_kwargs["usecols"] = [name for name in names if usecols(name)]
+        self.offset = max(offset, self.fh.tell())
+        self.fh.seek(self.offset)
+
+    def empty_frame(self) -> pd.DataFrame:
+        """DataFrame with the header columns and no rows."""
+        return pd.read_csv(io.BytesIO(self.header), **self.read_csv_kwargs)
+
+    def __iter__(self):
+        return self
+
+    def __next__(self) -> pd.DataFrame:
+        if self.fh.closed:
+            raise StopIteration
+        self._skip_loaded()
+        start = self.fh.tell()
+        lines = []
+        while len(lines) < self.chunksize:
+            if self.skip and self.fh.tell() == self.skip[0][0]:
+                break  # loaded rows follow
+            record = _read_record(self.fh)
+            if not record:
+                break
+            if record.strip():
+                lines.append(record if record.endswith(b"\n") else record + b"\n")
+        if not lines:
+            raise StopIteration
+        chunk = pd.read_csv(io.BytesIO(self.header + b"".join(lines)), **self.read_csv_kwargs)
+        self.offset = self.fh.tell()
+        chunk.attrs[CHUNK_META] = (self.index, start, self.offset, len(chunk))
+        self.index += 1
+        return chunk
+
+    def _skip_loaded(self):
+        """Seek over the loaded chunks starting here."""
+        while self.skip and self.skip[0][0] <= self.fh.tell():
+            start, end = self.skip.pop(0)
+            if start == self.fh.tell():
+                self.fh.seek(end)
+
+    def get_chunk(self, size: int) -> pd.DataFrame:
+        """Next chunk of size rows, later chunks keep this size."""
+        self.chunksize = size
+        return next(self)
+
+    def close(self):
+        self.fh.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def expand_paths(paths: Union[str, list]) -> list:
+    """Files of a path, a glob pattern, or a list of them, sorted and without duplicates."""
+    if isinstance(paths, str):
+        paths = [paths]
+    files: list = []
+    for path in paths:
+        matches = sorted(glob.glob(path)) if glob.has_magic(path) else [path]
+        files.extend(match for match in matches if match not in files)
+    return files
+
+
+def read_file(filepath: str, transform: Optional[Callable] = None) -> tuple:
+    """
+    Parse and transform a whole csv, parquet or feather file, returns (DataFrame, seconds).
+    Module level so a process pool can run it, transform must be picklable too.
+    """
+    start = time.perf_counter()
+    format = columnar_format(filepath)
+    if format == "parquet":
+        df = pd.read_parquet(filepath)
+    elif format == "feather":
+        df = pd.read_feather(filepath)
+    else:
+        with open_input(filepath) as fh:
+            df = pd.read_csv(fh)
+    if transform:
+        df = transform(df)
+    return df, time.perf_counter() - start
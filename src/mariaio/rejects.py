@@ -0,0 +1,47 @@
+import os
+import threading
+from typing import Optional
+
+
+class RejectLog:
+    """
+    Rows refused by the server during a load, with their error messages.
+
+    Rows are appended to a csv file, when path is given, with an extra
+    reject_error column.
+    Adding rows beyond the max_errors budget raises ValueError, which
+    aborts the load.
+
+    Args:
+        path (str, optional): reject csv file, appended to
+        max_errors (int, optional): rejected rows tolerated, None for no limit
+    """
+
+    def __init__(self, path: Optional[str] = None, max_errors: Optional[int] = 1000):
+        self.path = path
+        self.max_errors = max_errors
+        self.rows = 0
+        self.lock = threading.Lock()  # worker threads reject concurrently
+        self.fh = None
+
+    def add(self, chunk, error):
+        with self.lock:
+            self.rows += len(chunk)
+            if self.path:
+                if self.fh is None:
+                    self.fh = open(self.path, "a", encoding="utf-8", newline="")
+                rejected = chunk.assign(reject_error=str(error))
+                rejected.to_csv(self.fh, index=False, header=self.fh.tell() == 0)
+                self.fh.flush()
+            if self.max_errors is not None and self.rows > self.max_errors:
+                raise ValueError(f"{self.rows} rows rejected, more than max_errors {self.max_errors}"
+                                 + (f", see '{self.path}'" if self.path else ""))
+
+    def report(self) -> str:
+        where = f" written to '{os.path.abspath(self.path)}'" if self.path else ""
+        return f"{self.rows} rows rejected{where}"
+
+    def close(self):
+        if self.fh is not None:
+            self.fh.close()
+            self.fh = None
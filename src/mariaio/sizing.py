@@ -0,0 +1,160 @@
+import threading
+from typing import Callable, Optional
+
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024  # memory ceiling of a chunk with chunksize="auto"
+
+
+class ChunkSizer:
+    """
+    Rows per chunk, adapted to the rows read so far.
+
+    With max_bytes, each chunk read updates the average memory per row,
+    and the size becomes the rows fitting max_bytes, never more than
+    chunksize. The first chunk probes with at most probe_rows rows.
+
+    Args:
+        chunksize (int): rows per chunk, the upper bound
+        max_bytes (int, optional): target memory of a chunk's DataFrame
+        probe_rows (int): rows of the first chunk when max_bytes is set
+    """
+
+    def __init__(self, chunksize: int, max_bytes: Optional[int] = None, probe_rows: int = 1000):
+        self.chunksize = chunksize
+        self.max_bytes = max_bytes
+        self.size = min(chunksize, probe_rows) if max_bytes else chunksize
+        self.row_bytes = 0.0
+        self.sizes: list = []  # sizes used, for the verbose report
+
+    def observe(self, chunk):
+        """Update the size from a chunk just read."""
+        self.sizes.append(self.size)
+        if not self.max_bytes or not len(chunk):
+            return
+        self.row_bytes = chunk.memory_usage(deep=True, index=False).sum() / len(chunk)
+        self.size = max(1, min(self.chunksize, int(self.max_bytes / self.row_bytes)))
+
+    def chunks(self, reader):
+        """Chunks of reader, a pandas TextFileReader or a mariaio reader, read with get_chunk(size)."""
+        while True:
+            try:
+                chunk = reader.get_chunk(self.size)
+            except StopIteration:
+                return
+            self.observe(chunk)
+            yield chunk
+
+    def frame_chunks(self, df):
+        """Slices of a DataFrame, sized as chunks read from a file."""
+        start = 0
+        while start < len(df):
+            chunk = df.iloc[start:start + self.size]
+            self.observe(chunk)
+            start += len(chunk)
+            yield chunk
+
+    def record_insert(self, rows: int, seconds: float):
+        """Insert time of a chunk, only used by AdaptiveChunkSizer."""
+
+    @property
+    def adapts(self) -> bool:
+        """Whether chunks must be read with chunks() rather than at a fixed size."""
+        return bool(self.max_bytes)
+
+    def report(self) -> str:
+        if not self.sizes:
+            return "no chunks read"
+        return (f"{len(self.sizes)} chunks of {min(self.sizes)}..{max(self.sizes)} rows, "
+                f"{self.row_bytes:,.0f} bytes per row")
+
+
+class AdaptiveChunkSizer(ChunkSizer):
+    """
+    Rows per chunk tuned while loading, for chunksize="auto".
+
+    The size starts at start_rows and doubles while the insert rate
+    (rows/sec, the mean of `samples` chunks of a size) improves by more
+    than 5%, then settles on the best size seen. It never passes the
+    ceiling: max_bytes of DataFrame memory, and half the server's
+    max_allowed_packet of encoded row bytes (csv text of a sample of rows).
+
+    Args:
+        max_packet (int, optional): the server's max_allowed_packet
+        max_bytes (int, optional): memory ceiling of a chunk, default 64 MB
+        start_rows (int): rows of the first chunks
+        min_rows, max_rows (int): bounds of the size
+        samples (int): chunks timed at each size before deciding
+        log (Callable, optional): receives a line for each size change
+    """
+
+    def __init__(self, max_packet: Optional[int] = None, max_bytes: Optional[int] = None,
+                 start_rows: int = 1000, min_rows: int = 100, max_rows: int = 1_000_000,
+                 samples: int = 2, log: Optional[Callable] = None):
+        super().__init__(max_rows, max_bytes or DEFAULT_MAX_BYTES, probe_rows=start_rows)
+        self.max_packet = max_packet
+        self.min_rows = min_rows
+        self.samples = samples
+        self.log = log or (lambda *a: None)
+        self.lock = threading.Lock()
+        self.target = start_rows  # size the rate search asks for, before the ceiling
+        self.ceiling = max_rows
+        self.encoded_row_bytes = 0.0
+        self.rates: dict = {}  # chunk rows => insert rows/sec of each chunk of that size
+        self.best: Optional[tuple] = None  # (rows, rows/sec)
+        self.growing = True
+
+    @property
+    def adapts(self) -> bool:
+        return True
+
+    def observe(self, chunk):
+        self.sizes.append(self.size)
+        if not len(chunk):
+            return
+        row_bytes = chunk.memory_usage(deep=True, index=False).sum() / len(chunk)
+        sample = chunk.iloc[:100]
+        encoded_row_bytes = len(sample.to_csv(index=False, header=False).encode()) / len(sample)
+        ceiling = min(self.chunksize, self.max_bytes / row_bytes)
+        if self.max_packet:
+            ceiling = min(ceiling, self.max_packet / 2 / encoded_row_bytes)
+        with self.lock:
+            self.row_bytes = row_bytes
+            self.encoded_row_bytes = encoded_row_bytes
+            self.ceiling = max(self.min_rows, int(ceiling))
+            self._resize()
+
+    def record_insert(self, rows: int, seconds: float):
+        if seconds <= 0:
+            return
+        with self.lock:
+            rates = self.rates.setdefault(rows, [])
+            rates.append(rows / seconds)
+            if not self.growing or rows != self.size or len(rates) < self.samples:
+                return
+            rate = sum(rates) / len(rates)
+            if self.best is None or rate > self.best[1] * 1.05:
+                self.best = (rows, rate)
+                if self.size >= self.ceiling:
+                    self.growing = False
+                else:
+                    self.target = rows * 2
+            else:
+                self.growing = False
+                self.target = self.best[0]
+            self.log(f"chunksize auto: {rate:,.0f} rows/sec at {rows} rows"
+                     + ("" if self.growing else f", settled on {self.target} rows"))
+            self._resize()
+
+    def _resize(self):
+        size = max(self.min_rows, min(self.target, self.ceiling))
+        if size != self.size:
+            self.log(f"chunksize auto: {self.size} => {size} rows (ceiling {self.ceiling})")
+        self.size = size
+
+    def report(self) -> str:
+        if not self.sizes:
+            return "no chunks read"
+        best = f", best {self.best[1]:,.0f} rows/sec at {self.best[0]} rows" if self.best else ""
+        packet = f", max_allowed_packet {self.max_packet}" if self.max_packet else ""
+        return (f"{len(self.sizes)} chunks of {min(self.sizes)}..{max(self.sizes)} rows{best}, "
+                f"ceiling {self.ceiling} rows ({self.row_bytes:,.0f} bytes per row in memory, "
+                f"{self.encoded_row_bytes:,.0f} encoded{packet})")
@@ -0,0 +1,87 @@
+import sys
+import argparse
+from mariaio.config import read_config
+
+
+def getopts():
+    parser = argparse.ArgumentParser(
+        prog="table2csv",
+        description="export mariadb table or query to csv file",
+        epilog="table2csv is app module (mariaio.table2csv_app)",
+    )
+    parser.add_argument(
+        "-t",
+        "--table",
+        action="store",
+        type=str,
+        help="mariadb table to export",
+    )
+    parser.add_argument(
+        "-q",
+        "--query",
+        action="store",
+        type=str,
+        help="select query to export, instead of a table",
+    )
+    parser.add_argument(
+        "-o",
+        "--outfile",
+        action="store",
+        default="-",
+        type=str,
+        help="output file, - for stdout [default -]",
+    )
+    parser.add_argument(
+        "-f",
+        "--format",
+        action="store",
+        choices=["csv", "csv.gz", "parquet"],
+        type=str,
+        help="output format [default from outfile extension, else csv]",
+    )
+    parser.add_argument(
+        "-b",
+        "--batch",
+        action="store",
+        default=10000,
+        type=int,
+        help="rows fetched at a time [default 10000]",
+    )
+    parser.add_argument(
+        "--dbconfig",
+        action="store",
+        type=str,
+        help="name of database configuration of mymaria.ini [default default]",
+    )
+    parser.add_argument(
+        "-n",
+        "--dbname",
+        action="store",
+        default="default",
+        type=str,
+        help="name of database configuration of mymaria.ini [default default]",
+    )
+    parser.add_argument(
+        "-v",
+        "--verbose",
+        action="store_true",
+        default=False,
+        help="be verbose, report throughput and peak memory",
+    )
+    return parser.parse_args()
+
+
+def table2csv():
+    opts = getopts()
+    query = opts.query or opts.table
+    if not query:
+        print("table2csv: give a table (-t) or a query (-q)", file=sys.stderr)
+        return 2
+    config = read_config(opts.dbconfig, opts.dbname)
+    from mariaio.mymaria import MyMaria  # heavy, imported once the arguments are valid
+    db = MyMaria(verbose=opts.verbose, conf=opts.dbname, config_file=opts.dbconfig, config=config)
+    db.export_query(query, opts.outfile, format=opts.format, batch_size=opts.batch)
+
+
+if __name__ == "__main__":
+    sys.exit(table2csv())
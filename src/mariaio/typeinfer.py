@@ -0,0 +1,305 @@
+import numpy as np
+import pandas as pd  # type: ignore
+import sqlalchemy  # type: ignore
+from sqlalchemy.dialects import mysql  # type: ignore
+from typing import Optional
+
+# integer types from narrowest to widest: (type, signed min, signed max, unsigned max)
+INT_TYPES = [
+    (mysql.TINYINT, -2**7, 2**7 - 1, 2**8 - 1),
+    (mysql.SMALLINT, -2**15, 2**15 - 1, 2**16 - 1),
+    (mysql.MEDIUMINT, -2**23, 2**23 - 1, 2**24 - 1),
+    (mysql.INTEGER, -2**31, 2**31 - 1, 2**32 - 1),
+    (mysql.BIGINT, -2**63, 2**63 - 1, 2**64 - 1),
+]
+VARCHAR_MAX = 16383  # longest VARCHAR in utf8mb4, longer strings become TEXT
+SAMPLE_SCALE = 4  # least decimal places of DECIMAL columns typed from a sample
+SAMPLE_VARCHAR = 255  # least VARCHAR length of string columns typed from a sample
+
+
+class ColumnStats:
+    """Running statistics of one column, updated a chunk at a time."""
+
+    def __init__(self, name: str, enum_max: int):
+        self.name = name
+        self.enum_max = enum_max
+        self.kind = None  # int, float, bool, date, datetime, string
+        self.rows = 0
+        self.nulls = 0
+        self.min = None
+        self.max = None
+        self.scale = 0  # decimal places needed by floats, None if not decimal
+        self.whole = True  # every float seen is a whole number, see sql_type
+        self.int_source = False  # floats came mixed with integers, not from a float column
+        self.max_len = 0
+        self.fraction = False  # datetimes with fractional seconds
+        self.values: set = set()  # distinct strings, dropped once over enum_max
+        self.mixed = False
+
+    def _set_kind(self, kind: str):
+        if self.kind is None or self.kind == kind:
+            self.kind = kind
+        elif {self.kind, kind} == {"int", "float"}:
+            self.kind = "float"
+        elif {self.kind, kind} == {"date", "datetime"}:
+            self.kind = "datetime"
+        else:
+            self.mixed = True
+            self.kind = "string"
+
+    def update(self, series: pd.Series, max_scale: int):
+        self.rows += len(series)
+        values = series.dropna()
+        self.nulls += len(series) - len(values)
+        if values.empty:
+            return
+
+        arrow_type = getattr(values.dtype, "pyarrow_dtype", None)  # pd.ArrowDtype columns
+        if arrow_type is not None and str(arrow_type).startswith("date"):
+            self._set_kind("date")
+        elif pd.api.types.is_bool_dtype(values.dtype):
+            self._set_kind("bool")
+        elif pd.api.types.is_integer_dtype(values.dtype):
+            self._set_kind("int")
+            self._update_range(values.min(), values.max())
+        elif pd.api.types.is_float_dtype(values.dtype):
+            self._update_float(values.to_numpy(dtype="float64"), max_scale)
+        elif pd.api.types.is_datetime64_any_dtype(values.dtype):
+            self._update_datetime(values)
+        else:
+            inferred = pd.api.types.infer_dtype(values, skipna=True)
+            if inferred == "boolean":
+                self._set_kind("bool")
+            elif inferred == "integer":
+                self._set_kind("int")
+                numbers = pd.to_numeric(values)
+                self._update_range(numbers.min(), numbers.max())
+            elif inferred in ("floating", "mixed-integer-float", "decimal"):
+                self.int_source |= inferred == "mixed-integer-float"
+                self._update_float(pd.to_numeric(values).to_numpy(dtype="float64"), max_scale)
+            elif inferred == "date":
+                self._set_kind("date")
+            elif inferred in ("datetime", "datetime64"):
+                self._update_datetime(pd.to_datetime(values))
+            else:
+                self._update_string(values.astype(str))
+
+    def _update_range(self, lo, hi):
+        lo, hi = int(lo), int(hi)
+        self.min = lo if self.min is None else min(self.min, lo)
+        self.max = hi if self.max is None else max(self.max, hi)
+
+    def _update_float(self, values: np.ndarray, max_scale: int):
+        if not np.isfinite(values).all():
+            self._set_kind("float")
+            self.scale = None
+            self.whole = False
+            return
+        self._set_kind("float")
+        if not ((values == np.round(values)).all() and np.abs(values).max() < 2**53):
+            self.whole = False
+        self._update_range(np.floor(values.min()), np.ceil(values.max()))
+        if self.scale is None:
+            return
+        scale = None
+        tolerance = 1e-9 * np.maximum(1.0, np.abs(values))
+        for places in range(self.scale, max_scale + 1):
+            scaled = values * 10**places
+            if (np.abs(scaled - np.round(scaled)) <= tolerance * 10**places).all():
+                scale = places
+                break
+        self.scale = scale
+
+    def _update_datetime(self, values: pd.Series):
+        times = values.dt.tz_localize(None) if values.dt.tz is not None else values
+        if (times != times.dt.normalize()).any():
+            self._set_kind("datetime")
+        else:
+            self._set_kind("date")
+        if (times.dt.microsecond != 0).any():
+            self.fraction = True
+
+    def _update_string(self, values: pd.Series):
+        self._set_kind("string")
+        self.max_len = max(self.max_len, int(values.str.len().max()))
+        if self.values is not None:
+            self.values.update(values.unique())
+            if len(self.values) > self.enum_max:
+                self.values = None
+
+    def sql_type(self, use_enum: bool = False, sample: bool = False):
+        """
+        Narrowest SQL type holding every value seen, and a note on the decision.
+        With sample, the values seen are only the start of the input: integers
+        get at least INT, decimals more digits and strings at least VARCHAR(255),
+        and no ENUM is made, so later values still fit.
+
+        Whole floats are integers read as float because of missing values when
+        the column has nulls or mixed them with integers; otherwise, and always
+        with sample, they stay DECIMAL as later rows may have decimal places.
+        """
+        if self.kind is None:
+            return sqlalchemy.String(255), "no values seen, default VARCHAR(255)"
+        if self.kind == "bool":
+            return sqlalchemy.Boolean, "booleans"
+        if self.kind == "int":
+            return self._int_type(sample)
+        if self.kind == "float" and self.whole and (self.nulls or self.int_source) and not sample:
+            return self._int_type()
+        if self.kind == "float":
+            if self.scale is None:
+                return mysql.DOUBLE, "floats without short decimal representation"
+            digits = max(len(str(abs(v))) for v in (self.min, self.max))
+            scale = self.scale
+            note = f"decimals {self.min}..{self.max} scale {self.scale}"
+            if sample:
+                digits = max(digits + 3, 10)
+                scale = max(scale, SAMPLE_SCALE)
+                note += ", widened for unscanned rows"
+            precision = min(digits + scale, 65)
+            return mysql.DECIMAL(precision, scale), note
+        if self.kind == "date":
+            return sqlalchemy.Date, "dates"
+        if self.kind == "datetime":
+            if self.fraction:
+                return mysql.DATETIME(fsp=6), "datetimes with fractional seconds"
+            return sqlalchemy.DateTime, "datetimes"
+
+        note = f"strings max length {self.max_len}" + (", mixed types" if self.mixed else "")
+        if use_enum and self.enum_candidate() and not self.mixed and not sample:
+            return mysql.ENUM(*sorted(self.values)), note + f", {len(self.values)} distinct values"
+        if self.max_len > VARCHAR_MAX:
+            return mysql.MEDIUMTEXT, note
+        # round up to a power of two, leaving room for longer values later in the data
+        length = 1 << max(self.max_len - 1, 0).bit_length()
+        if self.mixed:
+            length = max(length, 255)  # lengths of the non-string values were not tracked
+        if sample:
+            length = max(2 * length, SAMPLE_VARCHAR)
+            note += ", widened for unscanned rows"
+        return sqlalchemy.String(min(max(length, 8), VARCHAR_MAX)), note
+
+    def _int_type(self, sample: bool = False):
+        note = f"integers {self.min}..{self.max}"
+        low, high = self.min, self.max
+        int_types = INT_TYPES
+        if sample:
+            # growing ids and counters: signed, at least INT, room for values twice as large
+            bound = 2 * max(abs(low), abs(high))
+            low, high = -bound, bound
+            int_types = [t for t in INT_TYPES if t[0] in (mysql.INTEGER, mysql.BIGINT)]
+            note += ", widened for unscanned rows"
+        unsigned = low >= 0
+        for sql_type, lo, hi, uhi in int_types:
+            if unsigned and high <= uhi:
+                return sql_type(unsigned=True), note
+            if not unsigned and lo <= low and high <= hi:
+                return sql_type(), note
+        digits = len(str(max(abs(self.min), abs(self.max))))
+        return mysql.DECIMAL(min(digits + 3 if sample else digits, 65), 0), "integers beyond BIGINT"
+
+    def enum_candidate(self) -> bool:
+        """Few distinct strings repeated over many rows."""
+        return (self.kind == "string" and self.values is not None
+                and len(self.values) * 2 <= self.rows - self.nulls)
+
+
+class TypeInferencer:
+    """
+    Infer tight SQL column types from whole DataFrame chunks.
+
+    Feed it chunks with update(), it keeps running statistics per column
+    (value ranges, decimal places, string lengths and distinct values) using
+    vectorized pandas/numpy operations, then dtype() picks the narrowest type
+    for each column and report() explains the decisions.
+
+    Args:
+        enum_max (int): most distinct strings tracked for ENUM candidates
+        max_scale (int): most decimal places for DECIMAL, else DOUBLE
+        use_enum (bool): create ENUM columns for candidates instead of VARCHAR
+        sample (bool): the chunks are the start of a longer input, leave room
+        for larger values, see ColumnStats.sql_type
+    """
+
+    def __init__(self, enum_max: int = 32, max_scale: int = 8, use_enum: bool = False, sample: bool = False):
+        self.enum_max = enum_max
+        self.max_scale = max_scale
+        self.use_enum = use_enum
+        self.sample = sample
+        self.columns: dict = {}
+
+    def update(self, df: pd.DataFrame):
+        for col_name in df.columns:
+            stats = self.columns.get(col_name)
+            if stats is None:
+                stats = self.columns[col_name] = ColumnStats(col_name, self.enum_max)
+            stats.update(df[col_name], self.max_scale)
+        return self
+
+    def dtype(self) -> dict:
+        """dict({ colname => sqlalchemy-datatype })"""
+        return {name: stats.sql_type(self.use_enum, self.sample)[0] for name, stats in self.columns.items()}
+
+    def report(self) -> list:
+        """One dict per column with the chosen type and why."""
+        rows = []
+        for name, stats in self.columns.items():
+            sql_type, note = stats.sql_type(self.use_enum, self.sample)
+            rows.append({
+                "column": name,
+                "type": (sql_type() if isinstance(sql_type, type) else sql_type).compile(dialect=mysql.dialect()),
+                "rows": stats.rows,
+                "nulls": stats.nulls,
+                "note": note,
+                "enum_candidate": stats.enum_candidate(),
+            })
+        return rows
+
+
+def infer_sql_types(df: pd.DataFrame, **kwargs) -> dict:
+    """Shortcut: dict({ colname => sqlalchemy-datatype }) for one DataFrame."""
+    return TypeInferencer(**kwargs).update(df).dtype()
+
+
+# integer column types and the bits of their values, checked in order
+INT_BITS = [
+    (mysql.TINYINT, 8),
+    (mysql.SMALLINT, 16),
+    (mysql.MEDIUMINT, 32),
+    (mysql.INTEGER, 32),
+]
+
+
+def _string_dtype() -> str:
+    try:
+        import pyarrow  # type: ignore  # noqa: F401
+        return "string[pyarrow]"  # one buffer per column instead of a python object per value
+    except ImportError:
+        return "string"
+
+
+def pandas_dtype(sql_type) -> Optional[str]:
+    """
+    Narrow pandas dtype for reading csv values of a SQL column: nullable
+    integers of the column's width, float32 for FLOAT, category for ENUM
+    and strings. None where pandas should infer, e.g. dates and TINYINT(1)
+    booleans that may be written as True/False.
+    """
+    if isinstance(sql_type, type):
+        sql_type = sql_type()
+    if isinstance(sql_type, sqlalchemy.Boolean):
+        return "boolean"
+    if isinstance(sql_type, sqlalchemy.Integer):
+        if isinstance(sql_type, mysql.TINYINT) and getattr(sql_type, "display_width", None) == 1:
+            return None
+        bits = next((bits for int_type, bits in INT_BITS if isinstance(sql_type, int_type)), 64)
+        return f"{'UInt' if getattr(sql_type, 'unsigned', False) else 'Int'}{bits}"
+    if isinstance(sql_type, mysql.FLOAT):
+        return "float32"
+    if isinstance(sql_type, sqlalchemy.Numeric):
+        return "float64"
+    if isinstance(sql_type, mysql.ENUM):
+        return "category"
+    if isinstance(sql_type, sqlalchemy.String):
+        return _string_dtype()
+    return None
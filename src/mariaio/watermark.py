@@ -0,0 +1,72 @@
+import datetime
+import decimal
+from typing import Optional
+
+import pandas as pd  # type: ignore
+from .readers import CHUNK_META
+
+
+class Watermark:
+    """
+    Incremental load filter: keeps the rows whose column is newer than the
+    table's current maximum (the mark), read once before the load.
+
+    The comparison is one vectorized mask per chunk. For input sorted on the
+    column the reading stops early: with order "desc" (newest rows first) the
+    first chunk holding an old row is the last one needed, and with order
+    "asc" masks are no longer computed once a chunk ends with a new row.
+
+    Args:
+        column (str): watermark column, after the transform
+        mark: MAX(column) of the table, None when the table is empty
+        order (str, optional): "asc" or "desc" when the input is sorted on column
+    """
+
+    def __init__(self, column: str, mark, order: Optional[str] = None):
+        self.column = column
+        self.mark = float(mark) if isinstance(mark, decimal.Decimal) else mark
+        self.order = order
+        self.done = False  # no row after the current chunk is new, stop reading
+        self.passing = mark is None  # every row from here on is new
+        self.rows = 0
+        self.skipped = 0
+
+    def filter(self, chunk: pd.DataFrame) -> pd.DataFrame:
+        """Rows of chunk newer than the mark."""
+        self.rows += len(chunk)
+        if self.passing or chunk.empty:
+            return chunk
+        if self.column not in chunk:
+            raise ValueError(f"watermark column '{self.column}' is not in the data")
+        new = self.newer(chunk[self.column])
+        kept = int(new.sum())
+        if self.order == "asc" and new.iloc[-1]:
+            self.passing = True
+        if kept == len(chunk):
+            return chunk
+        if self.order == "desc":
+            self.done = True
+        self.skipped += len(chunk) - kept
+        meta = chunk.attrs.get(CHUNK_META)
+        chunk = chunk[new.to_numpy()]
+        if meta:
+            chunk.attrs[CHUNK_META] = meta
+        return chunk
+
+    def newer(self, values: pd.Series) -> pd.Series:
+        """Boolean mask of values greater than the mark, missing values are old."""
+        mark = self.mark
+        if isinstance(mark, (datetime.date, datetime.datetime)) or pd.api.types.is_datetime64_any_dtype(values.dtype):
+            if str(getattr(values.dtype, "pyarrow_dtype", "")).startswith("date"):
+                values = values.astype("datetime64[ns]")  # Arrow dates have no datetime accessor
+            elif not pd.api.types.is_datetime64_any_dtype(values.dtype):
+                values = pd.to_datetime(values)
+            mark = pd.Timestamp(mark)
+            if values.dt.tz is not None and mark.tzinfo is None:
+                mark = mark.tz_localize(values.dt.tz)
+        return (values > mark).fillna(False).astype(bool)
+
+    def report(self) -> str:
+        stop = ", stopped reading early" if self.done else ""
+        return (f"watermark {self.column} > {self.mark}: {self.skipped} of {self.rows} rows "
+                f"read were already loaded{stop}")
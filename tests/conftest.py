@@ -0,0 +1,17 @@
+import sys
+
+import pytest
+
+import fake_mariadb
+
+
+@pytest.fixture
+def fake_server(tmp_path, monkeypatch):
+    """(config_file, conf) of a sqlite stand-in server for MyMaria, undone after the test."""
+    dbfile = str(tmp_path / "fake.sqlite")
+    fake = fake_mariadb.module(dbfile)
+    monkeypatch.setitem(sys.modules, "mariadb", fake)
+    from mariaio import mymaria
+    monkeypatch.setattr(mymaria, "mariadb", fake)  # mymaria may have been imported with the connector
+    monkeypatch.setattr(mymaria.MyMaria, "_create_engine", fake_mariadb.engine_factory(dbfile))
+    return fake_mariadb.write_config(str(tmp_path))
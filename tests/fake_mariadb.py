@@ -0,0 +1,83 @@
+"""
+In-process stand-in for a server: a mariadb module and a MyMaria engine
+backed by one sqlite file, with the MariaDB column types rendered as
+sqlite types and INSERT IGNORE rewritten. No load_data engine.
+
+Used by the fake_server fixture of conftest.py and by
+dev/bench_load.py --backend fake.
+"""
+import os
+import re
+import sqlite3
+import sys
+import types
+
+import sqlalchemy  # type: ignore
+from sqlalchemy.ext.compiler import compiles  # type: ignore
+from sqlalchemy.dialects import mysql  # type: ignore
+
+for sql_type in (mysql.TINYINT, mysql.SMALLINT, mysql.MEDIUMINT, mysql.INTEGER, mysql.BIGINT):
+    compiles(sql_type, "sqlite")(lambda element, compiler, **kw: "INTEGER")
+for sql_type in (mysql.DECIMAL, mysql.DOUBLE):
+    compiles(sql_type, "sqlite")(lambda element, compiler, **kw: "REAL")
+for sql_type in (mysql.MEDIUMTEXT, mysql.ENUM):
+    compiles(sql_type, "sqlite")(lambda element, compiler, **kw: "TEXT")
+compiles(mysql.DATETIME, "sqlite")(lambda element, compiler, **kw: "DATETIME")
+
+
+class Cursor:
+    def __init__(self, cursor):
+        self.cursor = cursor
+
+    def execute(self, query, params=()):
+        query = re.sub(r"^INSERT IGNORE ", "INSERT OR IGNORE ", query)
+        return self.cursor.execute(query, params)
+
+    def __getattr__(self, name):
+        return getattr(self.cursor, name)
+
+
+class Connection:
+    def __init__(self, dbfile: str):
+        self.conn = sqlite3.connect(dbfile, check_same_thread=False, timeout=60)
+
+    def cursor(self, **kwargs):
+        return Cursor(self.conn.cursor())
+
+    def __getattr__(self, name):
+        return getattr(self.conn, name)
+
+
+def module(dbfile: str) -> types.ModuleType:
+    """A mariadb module connecting to dbfile."""
+    fake = types.ModuleType("mariadb")
+    fake.Error = sqlite3.Error
+    fake.DataError = sqlite3.DataError
+    fake.IntegrityError = sqlite3.IntegrityError
+    fake.connect = lambda **kwargs: Connection(dbfile)
+    return fake
+
+
+def engine_factory(dbfile: str):
+    """Replacement of MyMaria._create_engine for dbfile."""
+    def create_engine(self, pool_size):
+        # all connections come from the pool, so exec gets the INSERT IGNORE rewrite too
+        return sqlalchemy.create_engine("sqlite://", creator=lambda: Connection(dbfile))
+    return create_engine
+
+
+def write_config(workdir: str) -> tuple:
+    """mymaria.ini for the stand-in, returns (config_file, config name)."""
+    config_file = os.path.join(workdir, "mymaria.ini")
+    with open(config_file, "w") as fh:
+        fh.write("[default]\nhost = localhost\n")
+    return config_file, "default"
+
+
+def install(workdir: str) -> tuple:
+    """Replace the mariadb module and patch MyMaria for the rest of the process, returns (config_file, conf)."""
+    dbfile = os.path.join(workdir, "fake.sqlite")
+    sys.modules["mariadb"] = module(dbfile)
+    from mariaio import MyMaria
+    MyMaria._create_engine = engine_factory(dbfile)
+    return write_config(workdir)
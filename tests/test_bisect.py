@@ -0,0 +1,37 @@
+import sqlite3
+
+import pandas as pd  # type: ignore
+import pytest
+
+
+def test_bisect_rejects_duplicate_key_rows(fake_server, tmp_path):
+    from mariaio import MyMaria  # after fake_server provides the connector
+    db = MyMaria(config_file=fake_server[0], conf=fake_server[1])
+    df = pd.DataFrame({"id": [1, 2, 3, 2, 5, 6, 7, 8], "v": list("abcdefgh")})
+    db.create_table_from_df(df, "items", primary_key=["id"])
+    reject_file = tmp_path / "rejects.csv"
+    rows = db.load_data_to_mariadb(df, "items", chunksize=4, on_error="bisect", reject_file=str(reject_file))
+
+    assert rows == 7
+    assert pd.read_csv(reject_file)["v"].tolist() == ["d"]
+    assert db.query_df("SELECT id FROM items ORDER BY id")["id"].tolist() == [1, 2, 3, 5, 6, 7, 8]
+    db.close()
+
+
+def test_bisect_stops_on_other_errors(fake_server, tmp_path):
+    from mariaio import InsertError, MyMaria
+    calls = []
+
+    def locked(db, chunk, table, columns, dtype):
+        calls.append(len(chunk))
+        raise sqlite3.OperationalError("database is locked")
+
+    db = MyMaria(config_file=fake_server[0], conf=fake_server[1])
+    df = pd.DataFrame({"id": range(8)})
+    reject_file = tmp_path / "rejects.csv"
+    with pytest.raises(InsertError, match="locked"):
+        db.load_data_to_mariadb(df, "items", create_table=True, chunksize=4, insert_engine=locked,
+                                on_error="bisect", reject_file=str(reject_file), max_errors=None)
+    assert calls == [4]  # not split into single rows
+    assert not reject_file.exists()
+    db.close()
@@ -0,0 +1,55 @@
+import types
+
+import pandas as pd  # type: ignore
+
+from mariaio import cache
+from mariaio.cache import QueryCache
+
+
+def frame(rows: int) -> pd.DataFrame:
+    return pd.DataFrame({"id": range(rows)})
+
+
+def size(df: pd.DataFrame) -> int:
+    return int(df.memory_usage(deep=True, index=True).sum())
+
+
+def test_least_recently_used_evicted():
+    results = QueryCache(max_bytes=size(frame(10)) * 2)
+    a, b, c = (QueryCache.key("SELECT ?", (n,)) for n in (1, 2, 3))
+    results.put(a, frame(10))
+    results.put(b, frame(10))
+    assert results.get(a) is not None  # a is now the most recent
+    results.put(c, frame(10))
+    assert results.get(b) is None
+    assert results.get(a) is not None and results.get(c) is not None
+    assert results.bytes == size(frame(10)) * 2
+    results.put(QueryCache.key("big"), frame(1000))  # larger than the cache, not kept
+    assert results.get(QueryCache.key("big")) is None and results.get(a) is not None
+    assert (results.hits, results.misses) == (4, 2)
+
+
+def test_ttl_expiry(monkeypatch):
+    now = [100.0]
+    monkeypatch.setattr(cache, "time", types.SimpleNamespace(monotonic=lambda: now[0]))
+    results = QueryCache(ttl=5)
+    key = QueryCache.key("SELECT 1")
+    results.put(key, frame(3))
+    now[0] += 5
+    assert results.get(key) is not None
+    now[0] += 0.1
+    assert results.get(key) is None
+    assert results.bytes == 0 and "0 results" in results.report()
+
+
+def test_results_are_copies():
+    results = QueryCache()
+    key = QueryCache.key("SELECT id")
+    df = frame(3)
+    results.put(key, df)
+    df.loc[0, "id"] = 99
+    got = results.get(key)
+    got.loc[1, "id"] = 99
+    assert results.get(key)["id"].tolist() == [0, 1, 2]
+    results.clear()
+    assert results.get(key) is None and results.bytes == 0
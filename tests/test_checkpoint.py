@@ -0,0 +1,69 @@
+import json
+
+from mariaio.checkpoint import Checkpoint
+
+
+def make(tmp_path, temp_table=None) -> Checkpoint:
+    data = tmp_path / "data.csv"
+    if not data.exists():
+        data.write_text("id\n1\n2\n3\n")
+    return Checkpoint(str(tmp_path / "load.ckpt"), str(data), "t", temp_table)
+
+
+def saved(tmp_path) -> dict:
+    return json.loads((tmp_path / "load.ckpt").read_text())
+
+
+def test_commit_in_order_saves(tmp_path):
+    progress = make(tmp_path)
+    progress.commit(0, 0, 100, 10)
+    progress.commit(1, 100, 200, 10)
+    state = saved(tmp_path)
+    assert (state["chunk_index"], state["offset"], state["rows"], state["loaded"]) == (2, 200, 20, [])
+
+
+def test_commit_out_of_order_waits_for_earlier_chunks(tmp_path):
+    progress = make(tmp_path)
+    progress.commit(1, 100, 200, 10)
+    progress.commit(2, 200, 300, 5)
+    assert (progress.chunk_index, progress.offset, progress.rows) == (0, 0, 0)  # chunk 0 is not committed yet
+    assert saved(tmp_path)["loaded"] == [[100, 200, 10], [200, 300, 5]]
+    progress.commit(0, 0, 100, 10)
+    assert (progress.chunk_index, progress.offset, progress.rows) == (3, 300, 25)
+    assert saved(tmp_path)["loaded"] == []
+
+
+def test_resume_after_partial_commit(tmp_path):
+    progress = make(tmp_path)
+    progress.commit(0, 0, 100, 10)
+    progress.commit(2, 200, 300, 10)  # chunk 1 was in flight when the load stopped
+    resumed = make(tmp_path)
+    assert resumed.load()
+    assert (resumed.chunk_index, resumed.offset, resumed.rows) == (1, 100, 10)
+    assert resumed.loaded == [(200, 300, 10)]
+    # chunk sizes may differ after a resume, loaded ranges are taken in once the prefix reaches them
+    resumed.commit(1, 100, 150, 5)
+    assert (resumed.offset, resumed.rows) == (150, 15)
+    resumed.commit(2, 150, 200, 5)
+    assert (resumed.chunk_index, resumed.offset, resumed.rows, resumed.loaded) == (3, 300, 30, [])
+    resumed.commit(3, 300, 400, 10)
+    assert (resumed.chunk_index, resumed.offset, resumed.rows) == (4, 400, 40)
+
+
+def test_load_rejects_other_loads(tmp_path):
+    make(tmp_path).commit(0, 0, 100, 10)
+    assert not make(tmp_path, temp_table="t_tmp").load()
+    (tmp_path / "data.csv").write_text("id\n1\n2\n3\n4\n")  # the file changed
+    assert not make(tmp_path).load()
+
+
+def test_no_checkpoint(tmp_path):
+    assert not make(tmp_path).load()
+
+
+def test_remove(tmp_path):
+    progress = make(tmp_path)
+    progress.commit(0, 0, 100, 10)
+    progress.remove()
+    progress.remove()
+    assert not (tmp_path / "load.ckpt").exists()
@@ -0,0 +1,33 @@
+import pytest
+
+
+@pytest.mark.parametrize("query, tables", [
+    ("CREATE TABLE t2 AS SELECT * FROM t1", ["t2"]),
+    ("CREATE OR REPLACE TABLE `db`.`t2` AS SELECT id FROM t1", ["t2"]),
+    ("CREATE TABLE IF NOT EXISTS s.t2 LIKE t1", ["t2"]),
+    ("ALTER TABLE `items` ADD COLUMN c INT", ["items"]),
+    ("ALTER TABLE shop.items DROP COLUMN c", ["items"]),
+    ("ALTER ONLINE IGNORE TABLE `shop`.`my.items` ADD INDEX (c)", ["my.items"]),
+    ("DROP TABLE a, `b`, shop.c", ["a", "b", "c"]),
+    ("DROP TEMPORARY TABLE IF EXISTS a CASCADE;", ["a"]),
+    ("RENAME TABLE a TO a_old, a_new TO a", ["a", "a_old", "a_new", "a"]),
+    ("rename table `s`.`a` to `s`.`b`, b TO c", ["a", "b", "b", "c"]),
+    ("CREATE UNIQUE INDEX ix ON `shop`.items (c)", ["items"]),
+    ("DROP INDEX IF EXISTS ix ON items", ["items"]),
+    ("ALTER TABLE p EXCHANGE PARTITION p1 WITH TABLE `shop`.`p_stage`", ["p", "p_stage"]),
+    ("CREATE VIEW v AS SELECT 1", None),
+])
+def test_ddl_tables(fake_server, query, tables):
+    from mariaio.mymaria import ddl_tables
+    assert ddl_tables(query) == tables
+
+
+def test_exec_invalidates_qualified_names(fake_server):
+    from mariaio import MyMaria
+    config_file, conf = fake_server
+    db = MyMaria(config_file=config_file, conf=conf)
+    db.exec("CREATE TABLE items (id INTEGER)")
+    assert db.table_info("items")["columns"] == ["id"]
+    db.exec("ALTER TABLE `main`.`items` ADD COLUMN name TEXT")
+    assert db.table_info("items")["columns"] == ["id", "name"]
+    db.close()
@@ -0,0 +1,32 @@
+import pandas as pd  # type: ignore
+import pytest
+
+import fake_mariadb
+
+
+@pytest.fixture
+def statements(monkeypatch):
+    """SQL sent through the sqlite stand-in's cursors"""
+    sent: list = []
+    execute = fake_mariadb.Cursor.execute
+
+    def record(self, query, params=()):
+        sent.append(query)
+        return execute(self, query, params)
+
+    monkeypatch.setattr(fake_mariadb.Cursor, "execute", record)
+    return sent
+
+
+@pytest.mark.parametrize("options, expected", [
+    ({"fast_load": True}, ["unique_checks", "foreign_key_checks"]),
+    ({"no_binlog": True}, ["sql_log_bin"]),
+    ({"fast_load": True, "no_binlog": True}, ["unique_checks", "foreign_key_checks", "sql_log_bin"]),
+])
+def test_session_settings(fake_server, statements, options, expected):
+    from mariaio import MyMaria  # after fake_server provides the connector
+    db = MyMaria(config_file=fake_server[0], conf=fake_server[1])
+    db.load_data_to_mariadb(pd.DataFrame({"id": [1, 2]}), "items", create_table=True, **options)
+
+    assert [query.split()[2] for query in statements if query.endswith("= 0")] == expected
+    db.close()
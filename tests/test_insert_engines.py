@@ -0,0 +1,15 @@
+import pandas as pd  # type: ignore
+import pytest
+
+
+@pytest.mark.parametrize("insert_engine", ["to_sql", "executemany"])
+def test_frame_inserted_chunksize_rows_at_a_time(fake_server, insert_engine):
+    from mariaio import MyMaria  # after fake_server provides the connector
+    events: list = []
+    db = MyMaria(config_file=fake_server[0], conf=fake_server[1], metrics=events.append)
+    df = pd.DataFrame({"id": range(7), "v": list("abcdefg")})
+    assert db.load_data_to_mariadb(df, "items", create_table=True, chunksize=3, insert_engine=insert_engine) == 7
+
+    assert [event["rows"] for event in events if event["event"] == "insert"] == [3, 3, 1]
+    assert db.query_df("SELECT id FROM items ORDER BY id")["id"].tolist() == list(range(7))
+    db.close()
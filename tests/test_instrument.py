@@ -0,0 +1,41 @@
+import json
+import threading
+
+from mariaio.instrument import NULL_TIMER, JsonLinesSink, MetricsSink, SummaryReporter, Timer, as_sinks
+
+
+def test_timer_sends_event_to_sinks(tmp_path):
+    summary = SummaryReporter()
+    lines = JsonLinesSink(str(tmp_path / "m.jsonl"))
+    with Timer([summary, lines, MetricsSink()], "insert", {"table": "t"}) as fields:
+        fields["rows"] = 10
+    lines.close()
+    event = json.loads((tmp_path / "m.jsonl").read_text())
+    assert (event["event"], event["table"], event["rows"]) == ("insert", "t", 10)
+    assert event["seconds"] >= 0 and "rows_per_sec" in event
+    assert summary.totals["insert"]["rows"] == 10
+
+
+def test_null_timer_fields_not_shared():
+    seen = []
+
+    def work(n):
+        for _ in range(200):
+            with NULL_TIMER as fields:
+                fields["rows"] = n
+                seen.append(fields["rows"] == n and len(fields) == 1)
+
+    threads = [threading.Thread(target=work, args=(n,)) for n in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert all(seen)
+    with NULL_TIMER as fields:
+        assert fields == {}
+
+
+def test_as_sinks():
+    sink = SummaryReporter()
+    assert as_sinks(None) is None and as_sinks([]) is None
+    assert as_sinks(sink) == [sink] and as_sinks((sink,)) == [sink]
@@ -0,0 +1,12 @@
+def test_first_file_types_leave_room_for_later_files(fake_server, tmp_path):
+    from mariaio import MyMaria  # after fake_server provides the connector
+    (tmp_path / "a.csv").write_text("id,sym,px\n" + "".join(f"{i},SPY,1.5\n" for i in range(50)))
+    (tmp_path / "b.csv").write_text("id,sym,px\n" + "".join(f"{1000 + i},GOOGL_LONG_NAME,1234.125\n"
+                                                           for i in range(50)))
+    db = MyMaria(config_file=fake_server[0], conf=fake_server[1])
+    results = db.load_files(str(tmp_path / "*.csv"), "quotes", create_table=True)
+
+    assert [result["rows"] for result in results] == [50, 50]
+    types = {row["column"]: row["type"] for row in db.type_report}
+    assert types == {"id": "INTEGER", "sym": "VARCHAR(255)", "px": "DECIMAL(14, 4)"}
+    db.close()
@@ -0,0 +1,14 @@
+import pandas as pd  # type: ignore
+
+
+def test_batched_merge_keeps_null_keys(fake_server):
+    from mariaio import MyMaria  # after fake_server provides the connector
+    db = MyMaria(config_file=fake_server[0], conf=fake_server[1])
+    df = pd.DataFrame({"k": [3, None, 1, 5, None, 2, 4], "v": list("abcdefg")})
+    rows = db.load_data_to_mariadb(df, "items", temp_table="items_tmp", create_table=True,
+                                   merge_batch=3, merge_key="k")
+
+    assert rows == 7
+    merged = db.query_df("SELECT v FROM items ORDER BY v")
+    assert merged["v"].tolist() == list("abcdefg")
+    db.close()
@@ -0,0 +1,24 @@
+import datetime
+
+import pandas as pd  # type: ignore
+import pytest
+
+pytest.importorskip("mariadb")  # mymaria imports the connector, no server is needed here
+from mariaio.mymaria import MyMaria  # noqa: E402
+
+
+def test_column_values_bind_datetimes_as_datetime():
+    series = pd.Series(pd.to_datetime(["2025-02-27 09:30:00.250", None]))
+    assert MyMaria._column_values(series) == [datetime.datetime(2025, 2, 27, 9, 30, 0, 250000), None]
+
+
+def test_column_values_missing_values_are_none():
+    assert MyMaria._column_values(pd.Series([1.5, None])) == [1.5, None]
+    assert MyMaria._column_values(pd.Series([1, None], dtype="Int64")) == [1, None]
+    assert MyMaria._column_values(pd.Series(["a", None])) == ["a", None]
+
+
+def test_column_values_arrow_dates():
+    pytest.importorskip("pyarrow")
+    series = pd.Series([datetime.date(2025, 2, 27), None], dtype="date32[pyarrow]")
+    assert MyMaria._column_values(series) == [datetime.date(2025, 2, 27), None]
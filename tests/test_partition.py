@@ -0,0 +1,92 @@
+import pandas as pd  # type: ignore
+import pytest
+
+from mariaio.partition import Partitioning
+
+
+@pytest.fixture
+def day_partitioned(fake_server, monkeypatch):
+    """MyMaria on the stand-in with 'quotes' partitioned by day, partition DDL recorded but not run"""
+    from mariaio import MyMaria  # after fake_server provides the connector
+    statements: list = []
+
+    def partition_info(self, table_name):
+        parts = Partitioning("day", "d")
+        parts.existing = {"p20250227", "p20250228", "pmax"}
+        return parts if table_name == "quotes" else None
+
+    def exec(self, query):
+        statements.append(query)
+        if "PARTITION" not in query:
+            original_exec(self, query)
+
+    original_exec = MyMaria.exec
+    monkeypatch.setattr(MyMaria, "partition_info", partition_info)
+    monkeypatch.setattr(MyMaria, "exec", exec)
+    db = MyMaria(config_file=fake_server[0], conf=fake_server[1])
+    db.create_table_from_df(pd.DataFrame({"d": pd.to_datetime(["2025-02-27"]), "v": [1]}), "quotes")
+    yield db, statements
+    db.close()
+
+
+def test_staged_truncate_waits_for_the_merge(day_partitioned):
+    db, statements = day_partitioned
+    df = pd.DataFrame({"d": pd.to_datetime(["2025-02-27", "2025-02-28", "2025-02-27"]), "v": [1, 2, 3]})
+    assert db.load_data_to_mariadb(df, "quotes", temp_table="quotes_tmp", reload_partition="truncate") == 3
+
+    truncate = statements.index("ALTER TABLE quotes TRUNCATE PARTITION p20250227, p20250228")
+    assert statements[truncate + 1].startswith("INSERT IGNORE INTO quotes")
+
+
+def test_failed_staged_load_keeps_the_partitions(day_partitioned):
+    db, statements = day_partitioned
+
+    def refused(db, chunk, table, columns, dtype):
+        raise ValueError("refused")
+
+    df = pd.DataFrame({"d": pd.to_datetime(["2025-02-27"]), "v": [1]})
+    assert db.load_data_to_mariadb(df, "quotes", temp_table="quotes_tmp", reload_partition="truncate",
+                                   insert_engine=refused) is None
+    assert not [query for query in statements if "TRUNCATE" in query]
+
+
+def test_parse_and_names():
+    day, month = Partitioning.parse("day:d"), Partitioning.parse("month:d")
+    start = pd.Timestamp("2025-02-27")
+    assert (day.name(start), month.name(month.buckets(pd.Series([start]))[0])) == ("p20250227", "p202502")
+    assert month.definition(pd.Timestamp("2025-12-01")) == "PARTITION p202512 VALUES LESS THAN ('2026-01-01')"
+    assert repr(Partitioning.parse("hash:symbol:4")) == "Partitioning('hash:symbol:4')"
+    assert Partitioning.parse("hash:symbol:4").table_options() == {
+        "mysql_partition_by": "KEY(`symbol`)", "mysql_partitions": "4"}
+    for spec in ("week:d", "hash:symbol:x", "d"):
+        with pytest.raises(ValueError):
+            Partitioning.parse(spec)
+
+
+def test_buckets_of_strings_and_aware_times():
+    values = pd.Series(pd.to_datetime(["2025-02-27 23:30", None]).tz_localize("UTC"))
+    assert Partitioning("day", "d").buckets(values).tolist()[0] == pd.Timestamp("2025-02-27")
+    assert Partitioning("month", "d").buckets(pd.Series(["2025-02-27"])).tolist() == [pd.Timestamp("2025-02-01")]
+
+
+def test_from_server():
+    rows = [("RANGE COLUMNS", "`d`", "p202501"), ("RANGE COLUMNS", "`d`", "p202502"), ("RANGE COLUMNS", "`d`", "pmax")]
+    found = Partitioning.from_server(rows)
+    assert (found.kind, found.column, found.existing) == ("month", "d", {"p202501", "p202502", "pmax"})
+    assert Partitioning.from_server([("KEY", "symbol", f"p{i}") for i in range(4)]).partitions == 4
+    assert Partitioning.from_server([("RANGE COLUMNS", "d", "p2025"), ("RANGE COLUMNS", "d", "pmax")]) is None
+    assert Partitioning.from_server([("RANGE", "d", "p20250101")]) is None
+    assert Partitioning.from_server([]) is None
+
+
+def test_missing_ranges_and_reorganize():
+    parts = Partitioning("day", "d")
+    parts.existing = {"p20250226", "p20250228", "pmax"}
+    starts = pd.to_datetime(["2025-03-01", "2025-02-27", "2025-02-28", "2025-03-01"])
+    assert parts.missing(starts) == ([pd.Timestamp("2025-03-01")], [pd.Timestamp("2025-02-27")])
+    assert parts.reorganize("quotes", [pd.Timestamp("2025-03-01")]) == (
+        "ALTER TABLE quotes REORGANIZE PARTITION pmax INTO (\n"
+        "  PARTITION p20250301 VALUES LESS THAN ('2025-03-02'),\n"
+        "  PARTITION pmax VALUES LESS THAN (MAXVALUE)\n)")
+    parts.existing = {"pmax"}  # only the catch-all: every start is new
+    assert parts.missing(starts) == (sorted(set(starts)), [])
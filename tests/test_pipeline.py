@@ -0,0 +1,56 @@
+import threading
+
+import pandas as pd  # type: ignore
+import pytest
+
+from mariaio.pipeline import ChunkPipeline
+
+
+def chunks(n: int):
+    for i in range(n):
+        yield pd.DataFrame({"i": [i]})
+
+
+def stage_threads() -> list:
+    return [t for t in threading.enumerate() if t.name in ("mariaio-read", "mariaio-transform")]
+
+
+def test_chunks_in_order_with_stats():
+    pipe = ChunkPipeline(chunks(5), transform=lambda df: df.assign(j=df["i"] * 2), queue_depth=1)
+    out = [chunk["j"].iloc[0] for chunk in pipe]
+    assert out == [0, 2, 4, 6, 8]
+    assert {name: stats["chunks"] for name, stats in pipe.as_dict().items()} == {
+        "read": 5, "transform": 5, "insert": 5}
+    assert len(pipe.report().splitlines()) == 3
+    assert not stage_threads()
+
+
+@pytest.mark.parametrize("stage", ["read", "transform"])
+def test_stage_error_reaches_consumer(stage):
+    def reader():
+        yield pd.DataFrame({"i": [0]})
+        if stage == "read":
+            raise OSError("read failed")
+        yield pd.DataFrame({"i": [1]})
+
+    def transform(df):
+        if df["i"].iloc[0] == 1:
+            raise ValueError("transform failed")
+        return df
+
+    pipe = ChunkPipeline(reader(), transform=transform)
+    seen = []
+    with pytest.raises((OSError, ValueError), match=f"{stage} failed"):
+        for chunk in pipe:
+            seen.append(chunk)
+    assert len(seen) == 1
+    assert not stage_threads()
+
+
+def test_consumer_stopping_early_stops_the_stages():
+    pipe = ChunkPipeline(chunks(1000), queue_depth=2)
+    stages = iter(pipe)
+    assert next(stages)["i"].iloc[0] == 0
+    stages.close()  # the loader stopped, e.g. a refused chunk
+    assert not stage_threads()
+    assert pipe.stats["read"].chunks < 10  # bounded queues: the reader did not run ahead
@@ -0,0 +1,123 @@
+import gzip
+
+import pandas as pd  # type: ignore
+import pytest
+
+from mariaio.readers import CHUNK_META, ArrowReader, OffsetCsvReader, expand_paths
+
+
+def write(path, text: str) -> str:
+    path.write_bytes(text.encode("utf-8"))
+    return str(path)
+
+
+def read_all(filepath: str, chunksize: int, **kwargs) -> list:
+    with OffsetCsvReader(filepath, chunksize, **kwargs) as reader:
+        return list(reader)
+
+
+def test_chunks_and_meta(tmp_path):
+    text = "id,name\n" + "".join(f"{i},n{i}\n" for i in range(7))
+    filepath = write(tmp_path / "a.csv", text)
+    chunks = read_all(filepath, 3)
+    assert [len(chunk) for chunk in chunks] == [3, 3, 1]
+    assert pd.concat(chunks)["id"].tolist() == list(range(7))
+    assert [chunk.attrs[CHUNK_META][0] for chunk in chunks] == [0, 1, 2]
+    assert chunks[-1].attrs[CHUNK_META] == (2, chunks[1].attrs[CHUNK_META][2], len(text), 1)
+    assert chunks[0].attrs[CHUNK_META][1:3] == (len("id,name\n"), len("id,name\n0,n0\n1,n1\n2,n2\n"))
+
+
+def test_quoted_newlines(tmp_path):
+    text = 'id,note\n1,"two\nlines"\n2,"say ""hi""\nand\nbye"\n3,plain\n'
+    chunks = read_all(write(tmp_path / "q.csv", text), 1)
+    assert [len(chunk) for chunk in chunks] == [1, 1, 1]
+    assert pd.concat(chunks)["note"].tolist() == ["two\nlines", 'say "hi"\nand\nbye', "plain"]
+
+
+def test_quoted_newline_in_header(tmp_path):
+    chunks = read_all(write(tmp_path / "h.csv", 'id,"long\nname"\n1,a\n'), 10)
+    assert chunks[0].columns.tolist() == ["id", "long\nname"]
+
+
+def test_crlf(tmp_path):
+    text = 'id,note\r\n1,a\r\n2,"b\r\nc"\r\n3,d\r\n'
+    chunks = read_all(write(tmp_path / "crlf.csv", text), 2)
+    df = pd.concat(chunks)
+    assert df["id"].tolist() == [1, 2, 3]
+    assert df["note"].tolist() == ["a", "b\r\nc", "d"]
+    assert chunks[-1].attrs[CHUNK_META][2] == len(text)
+
+
+def test_missing_final_newline(tmp_path):
+    text = "id,name\n1,a\n2,b"
+    chunks = read_all(write(tmp_path / "nonl.csv", text), 1)
+    assert pd.concat(chunks)["name"].tolist() == ["a", "b"]
+    assert chunks[-1].attrs[CHUNK_META] == (1, len("id,name\n1,a\n"), len(text), 1)
+
+
+def test_blank_lines_skipped(tmp_path):
+    chunks = read_all(write(tmp_path / "blank.csv", "id\n1\n\n2\n\n"), 10)
+    assert chunks[0]["id"].tolist() == [1, 2]
+
+
+def test_header_only(tmp_path):
+    filepath = write(tmp_path / "empty.csv", "id,name\n")
+    assert read_all(filepath, 10) == []
+    with OffsetCsvReader(filepath, 10) as reader:
+        assert reader.empty_frame().columns.tolist() == ["id", "name"]
+
+
+def test_resume_from_offset(tmp_path):
+    text = 'id,note\n' + "".join(f'{i},"row\n{i}"\n' for i in range(10))
+    filepath = write(tmp_path / "r.csv", text)
+    first = read_all(filepath, 4)
+    index, _, offset, _ = first[0].attrs[CHUNK_META]
+    rest = read_all(filepath, 4, offset=offset, index=index + 1)
+    assert [chunk.attrs[CHUNK_META] for chunk in rest] == [chunk.attrs[CHUNK_META] for chunk in first[1:]]
+    assert pd.concat(rest)["id"].tolist() == list(range(4, 10))
+
+
+def test_resume_compressed(tmp_path):
+    text = "id\n" + "".join(f"{i}\n" for i in range(10))
+    filepath = tmp_path / "c.csv.gz"
+    filepath.write_bytes(gzip.compress(text.encode()))
+    first = read_all(str(filepath), 3)
+    _, _, offset, _ = first[1].attrs[CHUNK_META]
+    rest = read_all(str(filepath), 3, offset=offset, index=2)
+    assert pd.concat(rest)["id"].tolist() == list(range(6, 10))
+
+
+def test_resume_skips_loaded_chunks(tmp_path):
+    text = "id\n" + "".join(f"{i}\n" for i in range(20))
+    filepath = write(tmp_path / "s.csv", text)
+    first = read_all(filepath, 4)
+    # chunk 1 failed, chunks 2 and 4 were committed by other workers
+    _, _, offset, _ = first[0].attrs[CHUNK_META]
+    skip = [first[2].attrs[CHUNK_META][1:3], first[4].attrs[CHUNK_META][1:3]]
+    rest = read_all(filepath, 3, offset=offset, index=1, skip=skip)
+    assert [chunk["id"].tolist() for chunk in rest] == [[4, 5, 6], [7], [12, 13, 14], [15]]
+    assert [chunk.attrs[CHUNK_META][0] for chunk in rest] == [1, 2, 3, 4]
+
+
+def test_usecols_callable(tmp_path):
+    filepath = write(tmp_path / "u.csv", "a,b,c\n1,2,3\n")
+    chunks = read_all(filepath, 10, usecols=lambda col: col != "b")
+    assert chunks[0].columns.tolist() == ["a", "c"]
+
+
+def test_expand_paths(tmp_path):
+    for name in ("b.csv", "a.csv", "c.txt"):
+        write(tmp_path / name, "x\n")
+    pattern = str(tmp_path / "*.csv")
+    assert expand_paths([pattern, str(tmp_path / "a.csv")]) == [str(tmp_path / "a.csv"), str(tmp_path / "b.csv")]
+
+
+def test_arrow_csv_columns_and_dtypes(tmp_path):
+    pytest.importorskip("pyarrow")
+    filepath = write(tmp_path / "a.csv", 'id,"long\nname",skip\n1,a,x\n2,,y\n')
+    reader = ArrowReader.open(filepath, 10, columns={"id", "long\nname", "absent"},
+                              dtypes={"id": "Int8", "long\nname": "category", "absent": "Int32"})
+    chunk = next(reader)
+    assert chunk.columns.tolist() == ["id", "long\nname"]
+    assert str(chunk["id"].dtype) == "int8[pyarrow]"
+    assert chunk["long\nname"].tolist()[0] == "a" and pd.isna(chunk["long\nname"].tolist()[1])
@@ -0,0 +1,62 @@
+import json
+import sqlite3
+import time
+
+import pytest
+
+from mariaio.readers import CHUNK_META
+
+
+def failing(fail_at: int):
+    """insert engine refusing chunk fail_at, after the chunks in flight with it commit"""
+    def engine(db, chunk, table, columns, dtype):
+        if chunk.attrs[CHUNK_META][0] == fail_at:
+            time.sleep(0.2)
+            raise sqlite3.OperationalError("connection lost")
+        db._insert_chunk_to_sql(chunk, table, columns, dtype)
+    return engine
+
+
+def run_load(fake_server, tmp_path, csv: bytes, fail_at: int, workers: int = 1) -> dict:
+    """Load csv with chunk fail_at refused, then resume; the checkpoint and rows in between."""
+    from mariaio import InsertError, MyMaria
+    config_file, conf = fake_server
+    data = tmp_path / "items.csv"
+    data.write_bytes(csv)
+    checkpoint = tmp_path / "items.ckpt"
+
+    def load(**kwargs):
+        db = MyMaria(config_file=config_file, conf=conf)
+        db.load_data_to_mariadb(str(data), "items", create_table=True, chunksize=10,
+                                checkpoint=str(checkpoint), workers=workers, **kwargs)
+        return db
+
+    with pytest.raises(InsertError, match="connection lost"):
+        load(insert_engine=failing(fail_at))
+    saved = json.loads(checkpoint.read_text())
+    db = load(resume=True)
+    rows = db.query_df("SELECT COUNT(*), COUNT(DISTINCT id) FROM items")
+    db.close()
+    return {"saved": saved, "rows": rows.iloc[0].tolist(), "left": checkpoint.exists()}
+
+
+def test_resume_after_failed_chunk(fake_server, tmp_path):
+    lines = [b"id,name,note"] + [b'%d,item %d,"line one\r\nline two"' % (i, i) for i in range(45)]
+    # CRLF, quoted newlines, no final newline
+    result = run_load(fake_server, tmp_path, b"\r\n".join(lines), fail_at=2)
+
+    assert result["saved"]["chunk_index"] == 2
+    assert result["saved"]["rows"] == 20
+    assert result["rows"] == [45, 45]  # nothing lost, nothing loaded twice
+    assert not result["left"]
+
+
+def test_resume_after_parallel_failure(fake_server, tmp_path):
+    lines = [b"id,name"] + [b"%d,item %d" % (i, i) for i in range(195)]
+    result = run_load(fake_server, tmp_path, b"\n".join(lines) + b"\n", fail_at=12, workers=3)
+
+    saved = result["saved"]
+    assert (saved["chunk_index"], saved["rows"]) == (12, 120)  # every chunk before the failed one
+    assert saved["loaded"]  # chunks past it committed by the other workers
+    assert result["rows"] == [195, 195]
+    assert not result["left"]
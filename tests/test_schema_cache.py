@@ -0,0 +1,33 @@
+import threading
+
+
+def test_refresh_while_workers_fill_the_cache(fake_server):
+    from mariaio import MyMaria  # after fake_server provides the connector
+    db = MyMaria(config_file=fake_server[0], conf=fake_server[1])
+    worker = db.worker()
+    assert worker._schema_cache is db._schema_cache and worker._schema_lock is db._schema_lock
+    errors: list = []
+    stop = threading.Event()
+
+    def fill():
+        try:
+            for i in range(20000):
+                worker._schema_cache[f"t{i}"] = {}
+        except Exception as e:
+            errors.append(e)
+        finally:
+            stop.set()
+
+    thread = threading.Thread(target=fill)
+    thread.start()
+    try:
+        while not stop.is_set():
+            db.refresh_schema("`shop`.`t1`")
+    except RuntimeError as e:  # dictionary changed size during iteration
+        errors.append(e)
+    thread.join()
+    assert not errors
+    db.refresh_schema()
+    assert not db._schema_cache
+    worker.close()
+    db.close()
@@ -0,0 +1,62 @@
+import pandas as pd  # type: ignore
+
+from mariaio.sizing import AdaptiveChunkSizer, ChunkSizer
+
+
+def chunk(rows: int) -> pd.DataFrame:
+    return pd.DataFrame({"id": range(rows), "s": ["x" * 20] * rows})
+
+
+def feed(sizer: AdaptiveChunkSizer, rate: float):
+    """Time `samples` chunks of the current size at rate rows/sec."""
+    for _ in range(sizer.samples):
+        sizer.record_insert(sizer.size, sizer.size / rate)
+
+
+def test_grows_while_faster_then_settles_on_best():
+    sizer = AdaptiveChunkSizer(start_rows=1000)
+    feed(sizer, 10_000)
+    assert sizer.size == 2000
+    feed(sizer, 20_000)
+    assert sizer.size == 4000
+    feed(sizer, 20_500)  # under 5% better: back to the best size
+    assert (sizer.size, sizer.growing) == (2000, False)
+    sizer.record_insert(2000, 10.0)  # settled, later timings change nothing
+    assert sizer.size == 2000 and sizer.best == (2000, 20_000)
+
+
+def test_growth_stops_at_ceiling():
+    sizer = AdaptiveChunkSizer(start_rows=1000, max_rows=3000)
+    sizer.observe(chunk(10))
+    feed(sizer, 10_000)
+    assert sizer.size == 2000
+    feed(sizer, 20_000)
+    assert sizer.size == 3000  # asked for 4000
+    feed(sizer, 40_000)
+    assert (sizer.size, sizer.growing) == (3000, False)
+
+
+def test_memory_and_packet_ceilings():
+    rows = chunk(200)
+    row_bytes = rows.memory_usage(deep=True, index=False).sum() / len(rows)
+    sizer = AdaptiveChunkSizer(max_bytes=int(row_bytes * 500), start_rows=1000)
+    sizer.observe(rows)
+    assert sizer.size == sizer.ceiling == 500
+
+    encoded = len(rows.iloc[:100].to_csv(index=False, header=False).encode()) / 100
+    sizer = AdaptiveChunkSizer(max_packet=int(encoded * 2 * 300), start_rows=1000)
+    sizer.observe(rows)
+    assert sizer.size == 300
+    assert "max_allowed_packet" in sizer.report()
+
+
+def test_shrinks_no_lower_than_min_rows():
+    sizer = AdaptiveChunkSizer(max_bytes=10, start_rows=1000, min_rows=100)
+    sizer.observe(chunk(50))
+    assert sizer.size == sizer.ceiling == 100
+
+
+def test_fixed_sizer_bounded_by_chunksize():
+    sizer = ChunkSizer(500, max_bytes=1 << 30, probe_rows=50)
+    sizes = [len(part) for part in sizer.frame_chunks(chunk(700))]
+    assert sizes == [50, 500, 150]
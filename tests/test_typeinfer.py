@@ -0,0 +1,123 @@
+import pandas as pd  # type: ignore
+import sqlalchemy  # type: ignore
+from sqlalchemy.dialects import mysql  # type: ignore
+
+from mariaio.typeinfer import TypeInferencer, infer_sql_types, pandas_dtype
+
+
+def sql(sql_type) -> str:
+    if isinstance(sql_type, type):
+        sql_type = sql_type()
+    return str(sql_type.compile(dialect=mysql.dialect()))
+
+
+def types(df: pd.DataFrame, **kwargs) -> dict:
+    return {name: sql(sql_type) for name, sql_type in infer_sql_types(df, **kwargs).items()}
+
+
+def test_narrowest_types_of_whole_input():
+    df = pd.DataFrame({
+        "id": [1, 2, 200],
+        "delta": [-5, 0, 40000],
+        "price": [1.5, 2.25, 10.0],
+        "ratio": [0.1, 1 / 3, 2.0],
+        "flag": [True, False, True],
+        "s": ["a", "bb", "ccccccccc"],
+    })
+    assert types(df) == {
+        "id": "TINYINT UNSIGNED",
+        "delta": "MEDIUMINT",
+        "price": "DECIMAL(4, 2)",
+        "ratio": "DOUBLE",
+        "flag": "BOOL",
+        "s": "VARCHAR(16)",
+    }
+
+
+def test_integers_with_missing_values():
+    df = pd.DataFrame({"n": [1, None, 70000]})
+    assert types(df) == {"n": "MEDIUMINT UNSIGNED"}
+    assert types(pd.DataFrame({"n": [1, 2.0, 300]}, dtype=object)) == {"n": "SMALLINT UNSIGNED"}
+
+
+def test_whole_floats_stay_decimal():
+    df = pd.DataFrame({"price": [100.0, 101.0, 99.0]})
+    assert types(df) == {"price": "DECIMAL(3, 0)"}
+    assert types(df, sample=True) == {"price": "DECIMAL(14, 4)"}
+    inferencer = TypeInferencer(sample=True).update(pd.DataFrame({"n": [1, None, 7]}))
+    assert sql(inferencer.dtype()["n"]) == "DECIMAL(14, 4)"  # later rows may have decimal places
+
+
+def test_dates_and_datetimes():
+    df = pd.DataFrame({
+        "d": pd.to_datetime(["2025-02-27", "2025-02-28"]),
+        "t": pd.to_datetime(["2025-02-27 09:30", "2025-02-28 16:00"]),
+        "f": pd.to_datetime(["2025-02-27 09:30:00.250", "2025-02-28 16:00:00.000"]),
+    })
+    assert types(df) == {"d": "DATE", "t": "DATETIME", "f": "DATETIME(6)"}
+
+
+def test_chunks_accumulate():
+    inferencer = TypeInferencer()
+    inferencer.update(pd.DataFrame({"id": [1, 2], "s": ["a", "b"]}))
+    inferencer.update(pd.DataFrame({"id": [3, 70000], "s": ["c", "x" * 40]}))
+    assert {name: sql(t) for name, t in inferencer.dtype().items()} == {
+        "id": "MEDIUMINT UNSIGNED", "s": "VARCHAR(64)"}
+
+
+def test_int_and_float_chunks_make_decimals():
+    inferencer = TypeInferencer().update(pd.DataFrame({"x": [1, 2]})).update(pd.DataFrame({"x": [2.5]}))
+    assert sql(inferencer.dtype()["x"]) == "DECIMAL(2, 1)"
+
+
+def test_mixed_chunks_are_strings():
+    inferencer = TypeInferencer().update(pd.DataFrame({"m": [1, 2]})).update(pd.DataFrame({"m": ["a"]}))
+    assert sql(inferencer.dtype()["m"]) == "VARCHAR(255)"
+    assert inferencer.report()[0]["note"].endswith("mixed types")
+
+
+def test_enum_candidates():
+    df = pd.DataFrame({"side": ["call", "put"] * 10})
+    assert types(df) == {"side": "VARCHAR(8)"}
+    assert types(df, use_enum=True) == {"side": "ENUM('call','put')"}
+
+
+def test_sample_leaves_headroom():
+    # the first 100 rows of a file whose ids, prices and strings grow later
+    df = pd.DataFrame({
+        "id": range(100),
+        "price": [1.5] * 100,
+        "s": ["abcdefgh"] * 100,
+        "side": ["call", "put"] * 50,
+    })
+    assert types(df, sample=True, use_enum=True) == {
+        "id": "INTEGER",
+        "price": "DECIMAL(14, 4)",
+        "s": "VARCHAR(255)",
+        "side": "VARCHAR(255)",
+    }
+    assert sql(infer_sql_types(pd.DataFrame({"id": [3_000_000_000]}), sample=True)["id"]) == "BIGINT"
+
+
+def test_sample_values_still_fit():
+    rows = pd.DataFrame({"id": range(300), "price": [1.5] * 299 + [123.25], "s": ["x"] * 299 + ["y" * 40]})
+    inferencer = TypeInferencer(sample=True).update(rows.iloc[:100])
+    report = {row["column"]: row for row in inferencer.report()}
+    assert report["id"]["type"] == "INTEGER"
+    assert report["price"]["type"] == "DECIMAL(14, 4)"
+    assert report["s"]["type"] == "VARCHAR(255)"
+    assert "widened" in report["id"]["note"]
+
+
+def test_no_values_seen():
+    assert types(pd.DataFrame({"e": [None, None]})) == {"e": "VARCHAR(255)"}
+
+
+def test_pandas_dtype():
+    assert pandas_dtype(mysql.SMALLINT(unsigned=True)) == "UInt16"
+    assert pandas_dtype(mysql.BIGINT()) == "Int64"
+    assert pandas_dtype(mysql.TINYINT(display_width=1)) is None
+    assert pandas_dtype(sqlalchemy.Boolean) == "boolean"
+    assert pandas_dtype(mysql.DECIMAL(10, 2)) == "float64"
+    assert pandas_dtype(mysql.ENUM("a", "b")) == "category"
+    assert pandas_dtype(sqlalchemy.Date) is None
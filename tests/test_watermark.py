@@ -0,0 +1,51 @@
+import datetime
+import decimal
+
+import numpy as np
+import pandas as pd  # type: ignore
+import pytest
+
+from mariaio.readers import CHUNK_META
+from mariaio.watermark import Watermark
+
+
+def test_keeps_newer_rows_and_meta():
+    chunk = pd.DataFrame({"n": [5.0, np.nan, 7.0, 9.0]})
+    chunk.attrs[CHUNK_META] = (0, 0, 10, 4)
+    mark = Watermark("n", decimal.Decimal("6"))
+    kept = mark.filter(chunk)
+    assert kept["n"].tolist() == [7.0, 9.0]  # NaN is not newer
+    assert kept.attrs[CHUNK_META] == (0, 0, 10, 4)
+    assert (mark.rows, mark.skipped, mark.done) == (4, 2, False)
+
+
+def test_arrow_dtypes():
+    pa = pytest.importorskip("pyarrow")
+    ints = pd.Series([1, None, 3], dtype=pd.ArrowDtype(pa.int64()))
+    assert Watermark("n", 2).newer(ints).tolist() == [False, False, True]
+    dates = pd.Series([datetime.date(2025, 1, 1), None, datetime.date(2025, 3, 1)],
+                      dtype=pd.ArrowDtype(pa.date32()))
+    assert Watermark("d", datetime.date(2025, 2, 1)).newer(dates).tolist() == [False, False, True]
+    times = pd.Series(["2025-01-01 10:00", None], dtype=pd.ArrowDtype(pa.string()))
+    assert Watermark("t", datetime.datetime(2024, 12, 31)).newer(times).tolist() == [True, False]
+
+
+def test_tz_aware_values_naive_mark():
+    times = pd.Series(pd.to_datetime(["2025-01-01 10:00", "2025-01-02 10:00"]).tz_localize("UTC"))
+    assert Watermark("t", datetime.datetime(2025, 1, 2)).newer(times).tolist() == [False, True]
+
+
+def test_sorted_input_stops_early():
+    desc = Watermark("n", 5, order="desc")
+    assert len(desc.filter(pd.DataFrame({"n": [9, 8]}))) == 2 and not desc.done
+    assert len(desc.filter(pd.DataFrame({"n": [7, 4]}))) == 1 and desc.done
+
+    asc = Watermark("n", 5, order="asc")
+    assert len(asc.filter(pd.DataFrame({"n": [4, 6]}))) == 1 and asc.passing
+    assert len(asc.filter(pd.DataFrame({"n": [1, 2]}))) == 2  # not compared once passing
+
+
+def test_empty_table_and_missing_column():
+    assert len(Watermark("n", None).filter(pd.DataFrame({"x": [1]}))) == 1
+    with pytest.raises(ValueError, match="watermark column 'n'"):
+        Watermark("n", 1).filter(pd.DataFrame({"x": [1]}))